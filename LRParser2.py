@@ -9,6 +9,10 @@ def read_action_table():
             symbol = row[0]  # simbol (id, +, etc.)
             values = row[1:]  # restul valorilor din rand
             action_table[symbol] = values
+            if any('|' in v for v in values):
+                # tema3 --glr pastreaza toate actiunile (d4|r2); LRParser2 nu stie sa aleaga
+                raise ValueError(f"action_table.csv are celule cu conflict pe randul '{symbol}' "
+                                 "(exportate de tema3 --glr); folositi glr.py sau regenerati tabela fara --glr")
     return action_table
 
 def read_prod():
@@ -22,42 +26,58 @@ def read_prod():
     return prod
 
 action_table = read_action_table()
-print("Action Table:")
-for key, values in action_table.items():
-    print(f"{key}: {','.join(values)}")
-
 prod = read_prod()
-print("\nProductions:")
-for key, values in prod.items():
-    print(f"{key}: {','.join(values)}")
 
-def parse_input(input_string):
+def print_tables():
+    print("Action Table:")
+    for key, values in action_table.items():
+        print(f"{key}: {','.join(values)}")
+
+    print("\nProductions:")
+    for key, values in prod.items():
+        print(f"{key}: {','.join(values)}")
+
+def parse_input(input_string, verbose=True, trace=None, profile=None):
+    return parse_tokens(input_string.split(), verbose=verbose, trace=trace, profile=profile)
+
+def parse_tokens(tokens, verbose=True, trace=None, profile=None):
+    # tokens: orice iterabil de terminale (lista, generator, scanner peste mmap)
+    # nu pastram lista de tokeni, consumam cate unul => memorie proportionala doar cu adancimea stivei
+    # trace: optional, obiect cu shift() si reduce(numar_productie) (vezi reduction_trace.ReductionTrace)
+    # profile: optional, obiect cu cell(stare, token), goto(stare, lhs), production(nr) (vezi table_profile.TableProfile)
     state_stack = [0]  # initializam stiva de stari cu 0
     token_stack = ['$'] #initializam stiva de tokeni cu simbolul de start
-    input_tokens = input_string.split() + ['$']  # adaugam simbolul de sfarsit
-    pointer = 0  # pointer pentru input_tokens
+    input_tokens = iter(tokens)
+    current_token = next(input_tokens, '$') # tokenul curent ('$' la sfarsit)
 
     while True:
         current_state = state_stack[-1] # starea curenta
-        current_token = input_tokens[pointer] # tokenul curent
+        if profile is not None:
+            profile.cell(current_state, current_token)
 
         try:
             action = action_table.get(current_token, [])[current_state] # actiunea din tabel
         except IndexError: # daca starea nu exista in tabel
-            print("Input rejected: Invalid state or token.") # invalidam inputul
+            if verbose:
+                print("Input rejected: Invalid state or token.") # invalidam inputul
             return False
 
         if action.startswith('d'):  # actiune de deplasare
             next_state = int(action[1:]) # extragem starea urmatoare
             state_stack.append(next_state) # adaugam starea urmatoare in stiva
             token_stack.append(current_token) #adaugam simbolul curent
-            pointer += 1 # consumam tokenul curent
-            print(f"Shift: Move to state {next_state}, consume '{current_token}'") 
+            if trace is not None:
+                trace.shift()
+            if verbose:
+                print(f"Shift: Move to state {next_state}, consume '{current_token}'")
+            if current_token != '$':
+                current_token = next(input_tokens, '$') # consumam tokenul curent
         elif action.startswith('r'):  # actiune de reductie
             prod_number = action[1:] # extragem numarul productiei
             entry = prod.get(prod_number)   # obtinem productia corespunzatoare
             if not entry: # daca productia nu exista
-                print(f"Input rejected: Unknown production {prod_number}.") #invalidam inputul
+                if verbose:
+                    print(f"Input rejected: Unknown production {prod_number}.") #invalidam inputul
                 return False
 
             lhs = entry[0] # partea stanga a productiei
@@ -68,7 +88,8 @@ def parse_input(input_string):
             for i in range(rhs_length): # eliminam elementele din stiva conform lungimii partii drepte
                 state_stack.pop()
                 x = token_stack.pop()
-                print(x, rhs_tokens,i)
+                if verbose:
+                    print(x, rhs_tokens,i)
                 assert x== list(reversed(rhs_tokens))[i]
 
             
@@ -78,17 +99,26 @@ def parse_input(input_string):
                 goto_cell = action_table.get(lhs, [])[state_stack[-1]] # obtinem starea din tabela de salt
                 goto_state = int(goto_cell) # convertim la int
             except (IndexError, ValueError): # daca starea nu exista sau nu e valida
-                print("Input rejected: Invalid goto for reduction.") #invalidam inputul
+                if verbose:
+                    print("Input rejected: Invalid goto for reduction.") #invalidam inputul
                 return False
 
+            if profile is not None:
+                profile.goto(state_stack[-1], lhs)
+                profile.production(int(prod_number))
             state_stack.append(goto_state) # adaugam starea de salt in stiva
+            if trace is not None:
+                trace.reduce(int(prod_number))
             rhs_display = rhs if rhs else 'ε' # afisam ε daca partea dreapta e vida
-            print(f"Reduce: Using production {prod_number}: {lhs} -> {rhs_display}, goto state {goto_state}") 
+            if verbose:
+                print(f"Reduce: Using production {prod_number}: {lhs} -> {rhs_display}, goto state {goto_state}")
         elif action in ('acc', 'accept'):  # acceptam inputul
-            print("Input accepted.")
+            if verbose:
+                print("Input accepted.")
             return True
         else:
-            print("Input rejected.") # invalidam inputul
+            if verbose:
+                print("Input rejected.") # invalidam inputul
             return False
 
 
@@ -126,4 +156,6 @@ def runTests():
 # parse_input("id + id * id")
 
 #input de la tastatura:
-parse_input(input("Introduceti un sir de terminale: "))
\ No newline at end of file
+if __name__ == "__main__":
+    print_tables()
+    parse_input(input("Introduceti un sir de terminale: "))
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+batch.py - Validare / evaluare în masă (o expresie pe linie) pe mai multe procese
+
+Expresiile sunt citite leneș (fișier sau orice iterabil de str), grupate în
+bucăți de chunk_size și trimise unui ProcessPoolExecutor. Fiecare proces
+încarcă tabelele o singură dată (initializer), nu la fiecare expresie.
+
+Rezultatele (BatchResult: index, accepted, value, error_offset) vin fie în
+ordinea inputului (ordered=True), fie pe măsură ce se termină bucățile.
+
+Aceleași funcții sunt folosite și de alte module: run_one (o expresie, cu
+tabelele date) și perechea init_worker / process_chunk pentru un pool propriu.
+
+Usage:
+  python3 batch.py expresii.txt --workers 4
+  python3 batch.py expresii.txt --evaluate --unordered --chunk-size 5000
+  python3 batch.py expresii.txt --report 1,2,4,8     # throughput vs număr de procese
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+from lr_tables import load_tables
+from push_parser import PushParser, ACCEPTED
+
+BatchResult = namedtuple('BatchResult', 'index accepted value error_offset')
+
+# starea fiecărui proces worker (setată o singură dată de init_worker)
+_tables = None
+_evaluate = False
+
+
+def init_worker(action_path, prod_path, evaluate):
+    """Initializer pentru ProcessPoolExecutor: încarcă tabelele o dată per proces (pentru process_chunk)."""
+    global _tables, _evaluate
+    _tables = load_tables(action_path, prod_path)
+    _evaluate = evaluate
+
+
+def _discard(line):
+    pass
+
+
+def run_one(tables, line, evaluate=False, scheme=None, index=0):
+    """
+    Parsează (și cu evaluate=True evaluează) o expresie; întoarce BatchResult.
+    scheme: schema de traducere pentru evaluare (implicit cea aritmetică din tema4);
+    codul intermediar nu se păstrează.
+    """
+    if evaluate and scheme is None:
+        from tema4 import ARITHMETIC_SCHEME as scheme
+    parser = PushParser(tables, scheme if evaluate else None, sink=_discard)
+    parser.feed(line.split())
+    status = parser.finish()
+    if status == ACCEPTED:
+        return BatchResult(index, True, parser.result, None)
+    return BatchResult(index, False, None, parser.error[0])
+
+
+def process_chunk(start, lines):
+    """Rulează într-un proces pregătit cu init_worker; indexii rezultatelor încep de la start."""
+    return [run_one(_tables, line, _evaluate, index=start + i) for i, line in enumerate(lines)]
+
+
+def iter_chunks(source, chunk_size):
+    """(index_start, [linii]) pentru fiecare bucată; source = cale fișier sau iterabil de str."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8') as f:
+            yield from iter_chunks(f, chunk_size)
+        return
+    it = iter(source)
+    start = 0
+    while True:
+        lines = [line.rstrip('\n') for line in islice(it, chunk_size)]
+        if not lines:
+            return
+        yield start, lines
+        start += len(lines)
+
+
+def batch_parse(source, workers=None, chunk_size=1000, ordered=True, evaluate=False,
+                action_path='action_table.csv', prod_path='result.csv'):
+    """
+    Generator de BatchResult pentru fiecare expresie din source.
+
+    workers=0 rulează totul în procesul curent (fără pool).
+    Numărul de bucăți trimise simultan este limitat (2 * workers), deci inputul
+    nu este citit tot în memorie.
+    """
+    if workers == 0:
+        tables = load_tables(action_path, prod_path)
+        for start, lines in iter_chunks(source, chunk_size):
+            for i, line in enumerate(lines):
+                yield run_one(tables, line, evaluate, index=start + i)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    chunks = iter_chunks(source, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(action_path, prod_path, evaluate)) as pool:
+        if ordered:
+            pending = deque()
+            for start, lines in chunks:
+                pending.append(pool.submit(process_chunk, start, lines))
+                if len(pending) >= max_in_flight:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        else:
+            pending = set()
+            for start, lines in chunks:
+                pending.add(pool.submit(process_chunk, start, lines))
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        yield from fut.result()
+            for fut in pending:
+                yield from fut.result()
+
+
+def throughput_report(lines, worker_counts, chunk_size=1000, evaluate=False, **kwargs):
+    """Rulează același set de linii cu diferite numere de procese; întoarce [(workers, expr/s)]."""
+    report = []
+    for workers in worker_counts:
+        t0 = time.perf_counter()
+        count = sum(1 for _ in batch_parse(lines, workers=workers, chunk_size=chunk_size,
+                                           ordered=False, evaluate=evaluate, **kwargs))
+        elapsed = time.perf_counter() - t0
+        report.append((workers, count / elapsed if elapsed else float('inf')))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validare/evaluare în masă, o expresie pe linie.")
+    parser.add_argument("file", help="Fișier cu câte o expresie pe linie ('-' pentru stdin)")
+    parser.add_argument("--workers", type=int, default=None, help="Număr de procese (0 = fără pool)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--evaluate", action='store_true', help="Evaluează expresiile (tema4)")
+    parser.add_argument("--unordered", action='store_true', help="Rezultatele vin în ordinea terminării")
+    parser.add_argument("--report", help="Listă de numere de procese, ex: 1,2,4 (afișează expr/s)")
+    parser.add_argument("--action", default="action_table.csv")
+    parser.add_argument("--prod", default="result.csv")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.file == '-' else args.file
+    if args.report:
+        lines = [line for _, chunk in iter_chunks(source, args.chunk_size) for line in chunk]
+        counts = [int(x) for x in args.report.split(',')]
+        for workers, rate in throughput_report(lines, counts, args.chunk_size, args.evaluate,
+                                               action_path=args.action, prod_path=args.prod):
+            print(f"workers={workers}: {rate:,.0f} expr/s")
+        return
+
+    out = sys.stdout
+    for r in batch_parse(source, args.workers, args.chunk_size, not args.unordered, args.evaluate,
+                         args.action, args.prod):
+        value = '' if r.value is None else r.value
+        error = '' if r.error_offset is None else r.error_offset
+        out.write(f"{r.index},{int(r.accepted)},{value},{error}\n")
+
+
+if __name__ == "__main__":
+    main()
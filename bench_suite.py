@@ -0,0 +1,280 @@
+"""
+bench_suite.py - Benchmark pentru LRParser2.parse_input și tema4.parse_and_evaluate, cu baseline
+
+runTests() / run_all_tests() verifică doar corectitudinea pe patru șiruri mici.
+Aici fiecare caz (API x formă a inputului x dimensiune) este rulat de mai
+multe ori, fără afișare (verbose=False), și se raportează:
+  - tokeni/s și reduceri/s (mediana rulărilor)
+  - latența per parsare: p50 / p90 / p99
+  - memoria alocată: vârful tracemalloc într-o rulare separată (B/token)
+
+Forme de input (structura arborelui / tipul reducerilor):
+  sum       id + id + ...                (listă stângă, E -> E + T)
+  product   id * id * ...                (T -> T * F)
+  random    propoziții din sentence_gen  (amestec, inclusiv paranteze)
+  nested    ( ( ... id + id ... ) )      (16 niveluri de paranteze; sub 33 de tokeni
+                                         doar (n - 1) // 2 niveluri, fără sumă înăuntru)
+  deep      id * ( id * ( ... ) )        (adâncimea stivei crește cu n)
+
+Pentru parse_and_evaluate fiecare 'id' este scris ca lexemul 1, cu
+lexemes=True (aceeași gramatică, valori mici, fără numere mari în produse lungi).
+
+Cu --grammar se adaugă runtime-ul pe tabele lr_tables (glr.GLRParser, care
+pe tabele fără conflicte este o buclă LR) pentru o altă gramatică, cu
+propoziții generate de sentence_gen.
+
+Rezultatele pot fi salvate ca baseline (JSON) și comparate ulterior: scriptul
+iese cu cod 1 dacă mediana latenței unui caz crește peste --threshold și cu
+cod 2 dacă niciun caz nu apare în baseline (nimic de comparat).
+Rulează offline, doar cu biblioteca standard.
+
+Usage:
+  python3 bench_suite.py --save-baseline
+  python3 bench_suite.py                                  # compară cu bench_baseline.json
+  python3 bench_suite.py --sizes 10,1000,100000,10000000 --apis parse_input --shapes sum
+  python3 bench_suite.py --grammar gramatica.txt --apis lr_tables
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import LRParser2
+import tema4
+from latency import percentile
+from reduction_trace import ReductionTrace
+
+DEFAULT_SIZES = (10, 100, 1000, 10_000, 100_000)
+SHAPES = ('sum', 'product', 'random', 'nested', 'deep')
+APIS = ('parse_input', 'parse_and_evaluate')
+NESTING = 16
+TIME_BUDGET = 0.5   # secunde per caz (orientativ; minim 3 rulări)
+
+
+def make_expression(shape, size):
+    """Expresie validă de aproximativ `size` tokeni, cu forma dată."""
+    if shape == 'sum':
+        return ' '.join(['id'] + ['+ id'] * ((size - 1) // 2))
+    if shape == 'product':
+        return ' '.join(['id'] + ['* id'] * ((size - 1) // 2))
+    if shape == 'random':
+        from sentence_gen import SentenceGenerator
+        return ' '.join(SentenceGenerator().sentence(0, 0, size))
+    if shape == 'nested':
+        # inputurile mici nu au loc pentru NESTING niveluri: atâtea câte încap în jurul unui id
+        depth = min(NESTING, max((size - 1) // 2, 0))
+        inner = ' '.join(['id'] + ['+ id'] * max((size - 2 * depth - 1) // 2, 0))
+        return '( ' * depth + inner + ' )' * depth
+    if shape == 'deep':
+        depth = max((size - 1) // 4, 0)
+        return 'id * ( ' * depth + 'id' + ' )' * depth
+    raise ValueError(f"Formă necunoscută: {shape}")
+
+
+def _runner(api, glr_parser=None):
+    if api == 'parse_input':
+        return lambda text: LRParser2.parse_input(text, verbose=False)
+    if api == 'parse_and_evaluate':
+        return lambda text: tema4.parse_and_evaluate(text, verbose=False, lexemes=True)[0]
+    if api == 'lr_tables':
+        return lambda text: glr_parser.parse(text.split(), forest=False).accepted
+    raise ValueError(f"API necunoscut: {api}")
+
+
+def count_reductions(text, glr_parser=None):
+    if glr_parser is not None:
+        # pe tabele fără conflicte: numărul de noduri interne ale arborelui
+        result = glr_parser.parse(text.split())
+        from glr import forest_size
+        nodes, _ = forest_size(result.forest)
+        return nodes - len(text.split())
+    trace = ReductionTrace()
+    LRParser2.parse_input(text, verbose=False, trace=trace)
+    return len(trace)
+
+
+def run_case(api, shape, size, text, reductions, repeats=None, allocations=True, glr_parser=None):
+    run = _runner(api, glr_parser)
+    tokens = len(text.split())
+    if not run(text):
+        raise AssertionError(f"{api}/{shape}/n={size}: input respins")
+
+    latencies = []
+    deadline = time.perf_counter() + TIME_BUDGET
+    gc.collect()
+    while len(latencies) < 3 or (repeats is None and time.perf_counter() < deadline and len(latencies) < 1000) \
+            or (repeats is not None and len(latencies) < repeats):
+        t0 = time.perf_counter()
+        run(text)
+        latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+    median = percentile(latencies, 0.5)
+
+    peak = None
+    if allocations:
+        gc.collect()
+        tracemalloc.start()
+        run(text)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        'case': f"{api}/{shape}/n={size}",
+        'api': api,
+        'shape': shape,
+        'size': size,
+        'tokens': tokens,
+        'runs': len(latencies),
+        'tokens_per_s': tokens / median,
+        'reductions_per_s': reductions / median,
+        'p50_s': median,
+        'p90_s': percentile(latencies, 0.9),
+        'p99_s': percentile(latencies, 0.99),
+        'peak_alloc_bytes': peak,
+    }
+
+
+def run_suite(sizes, shapes, apis, repeats=None, allocations=True, glr_parser=None, grammar_gen=None, out=sys.stdout):
+    results = []
+    header = (f"{'caz':<40} {'tokeni/s':>12} {'reduceri/s':>12} {'p50':>10} {'p90':>10} {'p99':>10} "
+              f"{'B/token':>9} {'rulări':>6}")
+    print(header, file=out)
+    print('-' * len(header), file=out)
+    for size in sizes:
+        for shape in shapes:
+            text = None
+            if any(api != 'lr_tables' for api in apis):
+                text = make_expression(shape, size)
+                reductions = count_reductions(text)
+            for api in apis:
+                if api == 'lr_tables':
+                    if shape != 'random':
+                        continue
+                    case_text = ' '.join(grammar_gen.sentence(0, 0, size))
+                    case = run_case(api, 'grammar', size, case_text, count_reductions(case_text, glr_parser),
+                                    repeats, allocations, glr_parser)
+                elif api == 'parse_and_evaluate':
+                    # constanta 1 în loc de 'id' (1, 2, 3, ...): altfel 'product' și 'deep'
+                    # ar calcula un factorial și ar măsura aritmetica numerelor mari
+                    case = run_case(api, shape, size, text.replace('id', '1'), reductions, repeats, allocations)
+                else:
+                    case = run_case(api, shape, size, text, reductions, repeats, allocations)
+                results.append(case)
+                per_token = f"{case['peak_alloc_bytes'] / case['tokens']:9.1f}" if case['peak_alloc_bytes'] is not None else f"{'-':>9}"
+                print(f"{case['case']:<40} {case['tokens_per_s']:12,.0f} {case['reductions_per_s']:12,.0f} "
+                      f"{_fmt_time(case['p50_s'])} {_fmt_time(case['p90_s'])} {_fmt_time(case['p99_s'])} "
+                      f"{per_token} {case['runs']:6d}", file=out)
+                out.flush()
+    return results
+
+
+def _fmt_time(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f}ms"
+    return f"{seconds:9.3f}s"
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'node': platform.node(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    (regresii, cazuri lipsă): regresii = lista (caz, raport) pentru cazurile a căror
+    mediană a crescut peste 1 + threshold; cazuri lipsă = cele care nu sunt în baseline.
+    """
+    previous = {c['case']: c for c in baseline.get('results', [])}
+    regressions = []
+    missing = []
+    for case in results:
+        old = previous.get(case['case'])
+        if old is None:
+            missing.append(case['case'])
+            continue
+        ratio = case['p50_s'] / old['p50_s']
+        if ratio > 1 + threshold:
+            regressions.append((case['case'], ratio))
+    return regressions, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LRParser2 / tema4 cu baseline și detectare de regresii.")
+    parser.add_argument("--sizes", default=','.join(map(str, DEFAULT_SIZES)), help="Dimensiuni (tokeni), ex: 10,1000,10000000")
+    parser.add_argument("--shapes", default=','.join(SHAPES), help=f"Forme: {','.join(SHAPES)}")
+    parser.add_argument("--apis", default=','.join(APIS), help="parse_input,parse_and_evaluate,lr_tables")
+    parser.add_argument("--repeats", type=int, help="Număr fix de rulări per caz (implicit: după buget de timp)")
+    parser.add_argument("--no-alloc", action='store_true', help="Fără măsurarea alocărilor (tracemalloc)")
+    parser.add_argument("--grammar", help="Gramatică pentru runtime-ul lr_tables (tema3, construită la pornire)")
+    parser.add_argument("--baseline", default="bench_baseline.json", help="Fișierul baseline")
+    parser.add_argument("--save-baseline", action='store_true', help="Salvează rezultatele ca baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Regresie permisă (0.25 = +25%% la p50)")
+    parser.add_argument("--json", help="Scrie raportul complet JSON în acest fișier")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+    shapes = args.shapes.split(',')
+    apis = args.apis.split(',')
+    glr_parser = grammar_gen = None
+    if 'lr_tables' in apis or args.grammar:
+        from glr import GLRParser, build_tables
+        from sentence_gen import SentenceGenerator
+        import tema3
+        text = tema3.example_grammar_text()
+        if args.grammar:
+            with open(args.grammar, encoding='utf-8') as fh:
+                text = fh.read()
+        glr_parser = GLRParser(build_tables(text))
+        grammar_gen = SentenceGenerator(text)
+        if 'lr_tables' not in apis:
+            apis.append('lr_tables')
+        if 'random' not in shapes:
+            shapes.append('random')
+
+    results = run_suite(sizes, shapes, apis, args.repeats, not args.no_alloc, glr_parser, grammar_gen)
+    report = {'environment': environment(), 'threshold': args.threshold, 'results': results}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Baseline salvat în {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"Nu există baseline ({args.baseline}); rulați cu --save-baseline")
+        return
+
+    with open(args.baseline, encoding='utf-8') as fh:
+        baseline = json.load(fh)
+    if baseline.get('environment') != report['environment']:
+        print("Atenție: baseline-ul a fost înregistrat în alt mediu:", baseline.get('environment'))
+    regressions, missing = compare(results, baseline, args.threshold)
+    if len(missing) == len(results):
+        print(f"Eroare: niciun caz nu apare în {args.baseline} (alte --sizes/--shapes/--apis?); "
+              f"rulați cu --save-baseline", file=sys.stderr)
+        sys.exit(2)
+    if missing:
+        print(f"Atenție: {len(missing)} cazuri fără baseline (necomparate): {', '.join(missing)}")
+    if regressions:
+        print(f"REGRESII (prag +{args.threshold:.0%} la p50):")
+        for case, ratio in regressions:
+            print(f"  {case}: {ratio:.2f}x mai lent")
+        sys.exit(1)
+    print(f"Nicio regresie peste +{args.threshold:.0%} față de {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+code_sink.py - Destinații (sink) pentru codul intermediar generat de tema4
+
+tema4.parse_and_evaluate / evaluate_tokens primesc sink=funcție: fiecare
+instrucțiune este trimisă imediat ce o reducere o generează, în loc să fie
+adunată în lista intermediate_code. Aici sunt câteva sink-uri gata făcute:
+
+  - FileSink: scrie liniile într-un fișier (sau stdout) prin buffer, cu flush
+    la fiecare `batch` linii -> traduceri uriașe în memorie constantă
+  - CallbackSink: numără instrucțiunile și le dă mai departe unei funcții
+  - CodeStream: generator de instrucțiuni; traducerea rulează într-un thread
+    separat și o coadă limitată face legătura (pipeline cu backpressure);
+    close() / with oprește traducerea dacă consumatorul renunță mai devreme
+
+Usage:
+  python3 code_sink.py expresie.txt -o cod.txt      # fișier mapat (mmap) -> fișier cod
+  python3 code_sink.py expresie.txt | consumator     # cod pe stdout, pe măsură ce e generat
+"""
+import argparse
+import os
+import queue
+import sys
+import threading
+from contextlib import closing
+
+import tema4
+from mmap_input import open_buffer, iter_tokens
+
+
+class FileSink:
+    """Sink care scrie câte o instrucțiune pe linie, grupând scrierile în loturi."""
+
+    def __init__(self, file, batch=4096):
+        self._own = isinstance(file, str)
+        self.file = open(file, 'w', encoding='utf-8') if self._own else file
+        self.batch = batch
+        self.count = 0
+        self._lines = []
+
+    def __call__(self, line):
+        self._lines.append(line)
+        if len(self._lines) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self.count += len(self._lines)
+            self.file.write('\n'.join(self._lines))
+            self.file.write('\n')
+            self._lines.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        if self._own:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CallbackSink:
+    """Numără instrucțiunile și apelează callback(line) pentru fiecare."""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.count = 0
+
+    def __call__(self, line):
+        self.count += 1
+        self.callback(line)
+
+
+_DONE = object()
+
+
+class _Cancelled(Exception):
+    """Ridicată în thread-ul traducerii când consumatorul a apelat close()."""
+
+
+class CodeStream:
+    """
+    Iterator peste codul intermediar al unei traduceri, produs pe măsură ce
+    parserul avansează. Traducerea rulează într-un thread; coada are cel mult
+    `maxsize` instrucțiuni, deci un consumator lent oprește temporar parserul.
+
+        stream = CodeStream(tokens)
+        for line in stream:
+            ...
+        stream.success, stream.result
+
+    Dacă consumatorul se oprește înainte de final, close() (sau ieșirea din
+    `with CodeStream(tokens) as stream:`) oprește thread-ul: scrierile în coadă
+    au timeout și verifică un eveniment de oprire, deci producătorul nu rămâne
+    blocat pe o coadă plină. După close(), iteratorul de tokeni este închis
+    (ex: iter_tokens peste un mmap), deci buffer-ul poate fi eliberat.
+    """
+
+    POLL = 0.05  # secunde între verificările evenimentului de oprire
+
+    def __init__(self, tokens, maxsize=1024, **kwargs):
+        self.success = None
+        self.result = None
+        self.error = None
+        self._queue = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(tokens, kwargs), daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=self.POLL)
+                return
+            except queue.Full:
+                pass
+        raise _Cancelled
+
+    def _run(self, tokens, kwargs):
+        try:
+            self.success, self.result, _ = tema4.evaluate_tokens(
+                tokens, verbose=False, sink=self._put, **kwargs)
+        except _Cancelled:
+            pass
+        except BaseException as e:  # transmis consumatorului
+            self.error = e
+        finally:
+            close = getattr(tokens, 'close', None)
+            if close is not None:
+                close()
+            try:
+                self._put(_DONE)
+            except _Cancelled:
+                pass
+
+    def __iter__(self):
+        try:
+            while True:
+                line = self._queue.get()
+                if line is _DONE:
+                    break
+                yield line
+        finally:
+            self.close()
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        """Oprește traducerea (dacă mai rulează) și așteaptă thread-ul."""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Traduce un fișier mare și scrie codul intermediar pe măsură ce e generat.")
+    parser.add_argument("file", help="Fișier cu expresia (tokeni separați prin spații)")
+    parser.add_argument("-o", "--output", help="Fișier pentru cod (implicit stdout)")
+    parser.add_argument("--optimize", action='store_true', help="Value numbering / CSE (memoria crește cu DAG-ul)")
+    args = parser.parse_args()
+
+    scheme = tema4.OPTIMIZING_SCHEME if args.optimize else None
+    try:
+        with FileSink(args.output or sys.stdout) as sink, open_buffer(args.file) as buf, \
+                closing(iter_tokens(buf)) as tokens:
+            success, result, _ = tema4.evaluate_tokens(tokens, verbose=False, scheme=scheme, sink=sink)
+    except BrokenPipeError:
+        # consumatorul din pipe s-a oprit (ex: | head); nu mai scriem nimic
+        sys.stdout = open(os.devnull, 'w')
+        sys.exit(1)
+    print(f"Accepted: {success}, result: {result}, instructions: {sink.count}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+codegen.py - Generare optimizată de cod cu trei adrese (value numbering, CSE, constant folding)
+
+tema4 adaugă câte o linie 'tN = a op b' la fiecare reducere '+' / '*', chiar dacă
+aceeași subexpresie a fost deja calculată sau toți operanzii sunt constante.
+
+ValueNumbering construiește DAG-ul expresiei pe măsură ce au loc reducerile:
+  - fiecare operand are un număr de valoare (vn); variabilele cu același nume și
+    constantele egale de același tip au același vn (2 și 2.0 rămân distincte)
+  - o operație (op, vn_stânga, vn_dreapta) deja văzută nu mai generează cod, se
+    refolosește temporarul existent (CSE); pentru '+' și '*' operanzii sunt
+    ordonați, deci 'a + b' și 'b + a' sunt aceeași subexpresie
+  - operațiile între constante sunt calculate la traducere (constant folding),
+    la fel identitățile x + 0, x * 1, x * 0
+
+Folosit de tema4.OPTIMIZING_SCHEME (parse_and_evaluate(..., optimize=True)).
+
+CompactCodeGen (parse_and_evaluate(..., compact=True)) generează codul pentru
+expresii foarte mari fără câte un str per instrucțiune:
+  - instrucțiunile sunt codificate într-un InstructionBuffer: opcode-ul într-un
+    array('B') și (dst, src1, src2) într-un array('i'), deci 13 bytes per
+    instrucțiune; textul 'tN = a op b' se produce doar la cerere
+  - temporarele sunt registre refolosite: fiecare temporar dintr-un arbore de
+    expresie este folosit o singură dată, deci devine liber imediat ce apare ca
+    operand; numărul de registre este limitat de adâncimea expresiei
+
+Usage:
+  python3 codegen.py --bench 2000     # instrucțiuni și timp, cu / fără optimizare
+  python3 codegen.py --compact 200000 # memorie și timp: listă de f-string vs InstructionBuffer
+"""
+import argparse
+import random
+import re
+import time
+import tracemalloc
+from array import array
+
+NUMBER_RE = re.compile(r'\d+(?:\.\d+)?$')
+
+
+class Operand:
+    """Un nod din DAG: valoarea calculată, cum apare în cod (ref) și numărul de valoare."""
+    __slots__ = ('value', 'ref', 'const', 'vn')
+
+    def __init__(self, value, ref, const, vn):
+        self.value = value
+        self.ref = ref
+        self.const = const
+        self.vn = vn
+
+    def __repr__(self):
+        return f"Operand({self.ref}={self.value})"
+
+
+def apply_op(op, a, b):
+    return a + b if op == '+' else a * b
+
+
+class ValueNumbering:
+    def __init__(self, emit, new_temp, fold_constants=True):
+        self.emit = emit            # emit(dst, op, a_ref, b_ref)
+        self.new_temp = new_temp
+        self.fold_constants = fold_constants
+        self.nodes = {}             # cheie -> Operand
+        self.cse_hits = 0
+        self.folded = 0
+
+    def _node(self, key, value, ref, const):
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = Operand(value, ref, const, len(self.nodes))
+        return node
+
+    def constant(self, value):
+        # tipul face parte din cheie: 2 == 2.0, dar în cod (și ca rezultat) diferă
+        return self._node(('const', type(value), value), value, str(value), True)
+
+    def leaf(self, lexeme, value):
+        """Operand pentru un 'id': literal numeric -> constantă, altfel variabilă."""
+        if lexeme is not None and NUMBER_RE.match(lexeme):
+            return self.constant(value)
+        name = lexeme if lexeme not in (None, 'id') else f"id{value}"
+        return self._node(('var', name), value, name, False)
+
+    def binop(self, op, a, b):
+        if self.fold_constants:
+            if a.const and b.const:
+                self.folded += 1
+                return self.constant(apply_op(op, a.value, b.value))
+            folded = self._identity(op, a, b)
+            if folded is not None:
+                self.folded += 1
+                return folded
+        va, vb = a.vn, b.vn
+        if vb < va:  # '+' și '*' sunt comutative
+            va, vb = vb, va
+        key = (op, va, vb)
+        node = self.nodes.get(key)
+        if node is not None:
+            self.cse_hits += 1
+            return node
+        dst = self.new_temp()
+        self.emit(dst, op, a.ref, b.ref)
+        node = self.nodes[key] = Operand(apply_op(op, a.value, b.value), dst, False, len(self.nodes))
+        return node
+
+    def _identity(self, op, a, b):
+        for x, y in ((a, b), (b, a)):
+            if x.const:
+                if op == '*' and x.value == 0:
+                    return self.constant(apply_op(op, x.value, y.value))
+                if (op == '+' and x.value == 0) or (op == '*' and x.value == 1):
+                    # x + 0.0 cu x întreg dă float: nu se simplifică
+                    if type(apply_op(op, x.value, y.value)) is type(y.value):
+                        return y
+        return None
+
+
+# ----------------------------------------------------------------------
+# Codificare compactă a instrucțiunilor + refolosirea temporarelor
+# ----------------------------------------------------------------------
+OP_ADD = 0
+OP_MUL = 1
+OPCODES = {'+': OP_ADD, '*': OP_MUL}
+OP_SYMBOLS = ('+', '*')
+
+# operand codificat ca int: (index << 2) | tip
+TEMP = 0
+VAR = 1
+CONST = 2
+
+
+class InstructionBuffer:
+    """
+    Cod cu trei adrese: opcode-ul în array('B'), (dst, src1, src2) în array('i'),
+    deci 13 bytes per instrucțiune (operanzii codificați încap în 32 de biți).
+    Se comportă ca o listă (read-only) de linii text: len(), [i], [i:j] (listă
+    de linii), iterare, comparare cu o listă.
+    Numele variabilelor și constantele sunt păstrate o singură dată (pool-uri).
+    """
+
+    def __init__(self):
+        self.opcodes = array('B')
+        self.args = array('i')
+        self.names = []
+        self.consts = []
+        self._name_index = {}
+        self._const_index = {}
+
+    def var(self, name):
+        i = self._name_index.get(name)
+        if i is None:
+            i = self._name_index[name] = len(self.names)
+            self.names.append(name)
+        return (i << 2) | VAR
+
+    def const(self, value):
+        key = (type(value), value)
+        i = self._const_index.get(key)
+        if i is None:
+            i = self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return (i << 2) | CONST
+
+    def append(self, opcode, dst, src1, src2):
+        self.opcodes.append(opcode)
+        self.args.extend((dst, src1, src2))
+
+    def operand_text(self, operand):
+        index, kind = operand >> 2, operand & 3
+        if kind == TEMP:
+            return f"t{index + 1}"
+        if kind == VAR:
+            return self.names[index]
+        return str(self.consts[index])
+
+    def render(self, i):
+        dst, a, b = self.args[3 * i:3 * i + 3]
+        return f"t{dst + 1} = {self.operand_text(a)} {OP_SYMBOLS[self.opcodes[i]]} {self.operand_text(b)}"
+
+    def registers(self):
+        """Câte registre temporare distincte apar ca destinație."""
+        return max(self.args[0::3], default=-1) + 1
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.render(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.render(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.render(i)
+
+    def __eq__(self, other):
+        if isinstance(other, (InstructionBuffer, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def nbytes(self):
+        return self.opcodes.itemsize * len(self.opcodes) + self.args.itemsize * len(self.args)
+
+
+class CompactCodeGen:
+    """Generator de cod pentru arbori de expresie cu registre temporare refolosite."""
+
+    def __init__(self, code=None):
+        self.code = code if code is not None else InstructionBuffer()
+        self.free = []        # registre libere (refolosite în ordine LIFO)
+        self.registers = 0    # câte registre distincte au fost necesare
+
+    def leaf(self, lexeme, value):
+        if lexeme is not None and NUMBER_RE.match(lexeme):
+            return Operand(value, self.code.const(value), True, None)
+        name = lexeme if lexeme not in (None, 'id') else f"id{value}"
+        return Operand(value, self.code.var(name), False, None)
+
+    def binop(self, op, a, b):
+        # operanzii temporari sunt la ultima folosire -> registrele lor devin libere
+        free = self.free
+        ra, rb = a.ref, b.ref
+        if ra & 3 == TEMP:
+            free.append(ra >> 2)
+        if rb & 3 == TEMP:
+            free.append(rb >> 2)
+        if free:
+            reg = free.pop()
+        else:
+            reg = self.registers
+            self.registers += 1
+        code = self.code
+        code.opcodes.append(OPCODES[op])
+        code.args.extend((reg, ra, rb))
+        return Operand(a.value + b.value if op == '+' else a.value * b.value, reg << 2 | TEMP, False, None)
+
+
+def chain_expression(n_ops, seed=0):
+    """Expresie mare cu paranteze până la o adâncime mică (pentru --compact)."""
+    rnd = random.Random(seed)
+    parts = ['a']
+    depth = 0
+    for _ in range(n_ops):
+        parts.append(rnd.choice('+*'))
+        if depth < 4 and rnd.random() < 0.2:
+            parts += ['(', 'b']
+            depth += 1
+        else:
+            parts.append(rnd.choice(('a', 'b', 'c', '1')))
+            if depth and rnd.random() < 0.3:
+                parts.append(')')
+                depth -= 1
+    parts += [')'] * depth
+    return ' '.join(parts)
+
+
+def bench_compact(n_ops, repeats=3):
+    """Timpul (cel mai bun din `repeats`, fără tracemalloc) și, separat, vârful de memorie."""
+    import tema4
+    expr = chain_expression(n_ops)
+    print(f"Expresie: {len(expr.split())} tokeni")
+    for compact in (False, True):
+        best = None
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            ok, value, code = tema4.parse_and_evaluate(expr, verbose=False, compact=compact, lexemes=True)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+            del code
+        tracemalloc.start()
+        ok, value, code = tema4.parse_and_evaluate(expr, verbose=False, compact=compact, lexemes=True)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        label = 'InstructionBuffer' if compact else 'listă f-string   '
+        print(f"  {label}: {len(code):8d} instrucțiuni, {best * 1000:8.1f} ms, "
+              f"peak {peak / 1024:10.0f} KB")
+        if compact:
+            print(f"  registre temporare: {code.registers()}, "
+                  f"cod: {code.nbytes() / 1024:.0f} KB ({code.nbytes() / max(len(code), 1):.0f} B/instrucțiune)")
+        del code
+
+
+def repetitive_expression(n_blocks, seed=0, names=('a', 'b', 'c', 'd')):
+    """Expresie mare construită din puține subexpresii repetate (plus câteva constante)."""
+    rnd = random.Random(seed)
+    blocks = []
+    for _ in range(8):
+        x, y = rnd.sample(names, 2)
+        blocks.append(f"( {x} + {y} ) * {rnd.choice(names)}")
+    blocks.append("2 * 3 + a")
+    blocks.append("( b + 0 ) * 1")
+    return ' + '.join(rnd.choice(blocks) for _ in range(n_blocks))
+
+
+def bench(n_blocks):
+    import tema4
+    expr = repetitive_expression(n_blocks)
+    print(f"Expresie: {len(expr.split())} tokeni")
+    results = {}
+    for optimize in (False, True):
+        t0 = time.perf_counter()
+        ok, value, code = tema4.parse_and_evaluate(expr, verbose=False, optimize=optimize, lexemes=True)
+        elapsed = time.perf_counter() - t0
+        results[optimize] = value
+        label = 'optimizat ' if optimize else 'original  '
+        print(f"  {label}: {len(code):8d} instrucțiuni, {elapsed * 1000:8.1f} ms, rezultat {value}")
+    assert results[False] == results[True], "optimizarea a schimbat rezultatul"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Value numbering / CSE / constant folding pentru tema4.")
+    parser.add_argument("--bench", type=int, default=2000, metavar="N", help="Număr de blocuri în expresia generată")
+    parser.add_argument("--compact", type=int, metavar="N", help="Compară listă f-string vs InstructionBuffer pe N operatori")
+    args = parser.parse_args()
+    if args.compact:
+        bench_compact(args.compact)
+    else:
+        bench(args.bench)
+
+
+if __name__ == "__main__":
+    main()
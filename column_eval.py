@@ -0,0 +1,175 @@
+"""
+column_eval.py - Evaluarea unei expresii peste coloane NumPy (o formulă, milioane de rânduri)
+
+Expresia este tradusă o singură dată (compiled_expr.compile_expression, care
+folosește tema4) într-un program postfix. ColumnPlan îl transformă într-o
+listă de operații pe coloane întregi:
+  - fiecare reducere '+' / '*' devine un apel np.add / np.multiply peste toată coloana
+  - rezultatele intermediare sunt scrise cu out= în buffere refolosite: un buffer
+    devine liber imediat ce a fost folosit ca operand (ca registrele din
+    codegen.CompactCodeGen), deci numărul de buffere depinde de adâncimea
+    expresiei, nu de numărul de operații
+  - bufferele sunt păstrate între bucăți (chunks) de aceeași lungime
+  - coloanele întregi (sau bool) mai înguste de 64 de biți și cele float mai
+    înguste de float64 sunt calculate în int64 / float64: evaluarea pe rânduri
+    (compiled_expr) lucrează cu int/float Python, deci un int8 care ar depăși
+    în tăcere ar da alt rezultat decât aceeași formulă evaluată rând cu rând
+
+Intrarea este un dicționar nume -> array, sau un iterator de astfel de
+dicționare pentru date care nu încap în memorie (evaluate_chunks).
+
+Usage:
+  python3 column_eval.py --bench 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from compiled_expr import compile_expression, LOAD, CONST
+
+UFUNCS = {'+': np.add, '*': np.multiply}
+
+# operanzi în planul compilat
+COLUMN = 0
+SCALAR = 1
+BUFFER = 2
+
+
+def _widen(dtype):
+    """Tipul în care se calculează o coloană: cel puțin int64 / float64."""
+    if dtype.kind in 'biu' and dtype.itemsize < 8:
+        return np.dtype(np.int64)
+    if dtype.kind == 'f' and dtype.itemsize < 8:
+        return np.dtype(np.float64)
+    return dtype
+
+
+class ColumnPlan:
+    def __init__(self, expression):
+        compiled = compile_expression(expression)
+        self.variables = compiled.variables
+        self.steps = []          # (ufunc, operand_a, operand_b, buffer_out)
+        self.num_buffers = 0
+        self._buffers = []
+        free = []
+        stack = []
+        for op, arg in compiled.program:
+            if op == LOAD:
+                stack.append((COLUMN, arg))
+            elif op == CONST:
+                stack.append((SCALAR, arg))
+            else:
+                b = stack.pop()
+                a = stack.pop()
+                for x in (a, b):
+                    if x[0] == BUFFER:
+                        free.append(x[1])
+                if free:
+                    out = free.pop()
+                else:
+                    out = self.num_buffers
+                    self.num_buffers += 1
+                self.steps.append((UFUNCS[op], a, b, out))
+                stack.append((BUFFER, out))
+        self.result = stack.pop() if stack else (SCALAR, None)
+
+    def _dtype(self, columns):
+        scalars = [arg for _, a, b, _ in self.steps for kind, arg in (a, b) if kind == SCALAR]
+        if self.result[0] == SCALAR:
+            scalars.append(self.result[1])
+        if not columns and not scalars:
+            return np.float64
+        return np.result_type(*(_widen(c.dtype) for c in columns), *scalars)
+
+    def evaluate(self, columns, copy=True):
+        """
+        columns: dicționar nume -> array 1-D (toate de aceeași lungime).
+        Cu copy=False rezultatul poate fi un buffer intern, valid doar până la
+        următorul apel.
+        """
+        try:
+            cols = [np.asarray(columns[name]) for name in self.variables]
+        except KeyError as e:
+            raise KeyError(f"Lipsește coloana {e.args[0]!r}") from None
+        for name, col in zip(self.variables, cols):
+            if col.ndim != 1:
+                raise ValueError(f"Coloana {name!r} trebuie să fie 1-D, are forma {col.shape}")
+        n = len(cols[0]) if cols else 1
+        if any(len(col) != n for col in cols):
+            lengths = ', '.join(f"{name}={len(col)}" for name, col in zip(self.variables, cols))
+            raise ValueError(f"Coloanele au lungimi diferite: {lengths}")
+        dtype = self._dtype(cols)
+        buffers = self._buffers
+        if len(buffers) != self.num_buffers or (buffers and (len(buffers[0]) != n or buffers[0].dtype != dtype)):
+            buffers = self._buffers = [np.empty(n, dtype=dtype) for _ in range(self.num_buffers)]
+
+        def value(operand):
+            kind, arg = operand
+            if kind == COLUMN:
+                return cols[arg]
+            if kind == SCALAR:
+                return arg
+            return buffers[arg]
+
+        for ufunc, a, b, out in self.steps:
+            ufunc(value(a), value(b), out=buffers[out], dtype=dtype)
+
+        kind, arg = self.result
+        if kind == BUFFER:
+            return buffers[arg].copy() if copy else buffers[arg]
+        if kind == COLUMN:
+            return cols[arg].astype(dtype, copy=copy)
+        return np.full(n, arg, dtype=dtype)
+
+    def evaluate_chunks(self, chunks, copy=True):
+        """Generator: un array rezultat pentru fiecare dicționar de coloane din chunks."""
+        for columns in chunks:
+            yield self.evaluate(columns, copy=copy)
+
+
+def evaluate_columns(expression, columns):
+    return ColumnPlan(expression).evaluate(columns)
+
+
+def bench(rows):
+    expr = "( x + y ) * z + x * ( y + 2 ) * z + ( x * x + y * y ) * 3"
+    rng = np.random.default_rng(0)
+    columns = {name: rng.integers(0, 100, rows) for name in ('x', 'y', 'z')}
+    plan = ColumnPlan(expr)
+
+    sample = min(rows, 100_000)
+    f = compile_expression(expr)
+    x, y, z = (columns[n][:sample].tolist() for n in ('x', 'y', 'z'))
+    t0 = time.perf_counter()
+    per_row = [f({'x': a, 'y': b, 'z': c}) for a, b, c in zip(x, y, z)]
+    t_row = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = plan.evaluate(columns, copy=False)
+    t_col = time.perf_counter() - t0
+    assert result[:sample].tolist() == per_row, "rezultate diferite față de evaluarea pe rânduri"
+
+    chunk = max(rows // 10, 1)
+    t0 = time.perf_counter()
+    total = 0
+    for part in plan.evaluate_chunks(({n: c[i:i + chunk] for n, c in columns.items()}
+                                      for i in range(0, rows, chunk)), copy=False):
+        total += len(part)
+    t_chunks = time.perf_counter() - t0
+
+    print(f"'{expr}': {len(plan.steps)} operații, {plan.num_buffers} buffere")
+    print(f"  pe rânduri (funcție compilată): {sample / t_row:14,.0f} rânduri/s")
+    print(f"  coloane NumPy:                  {rows / t_col:14,.0f} rânduri/s")
+    print(f"  coloane NumPy, bucăți de {chunk}: {total / t_chunks:14,.0f} rânduri/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluare vectorizată (NumPy) a unei expresii pe coloane.")
+    parser.add_argument("--bench", type=int, default=1_000_000, metavar="N", help="Număr de rânduri")
+    args = parser.parse_args()
+    bench(args.bench)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+compiled_expr.py - Expresii parsate o singură dată și compilate în cod Python
+
+tema4.parse_and_evaluate re-lexează, re-parsează și re-execută acțiunile
+semantice la fiecare apel. Aici expresia este parsată o dată cu tema4
+(PROGRAM_SCHEME): reducerile LR apar exact în ordine postfixată, deci acțiunile
+semantice construiesc un program postfix (load / const / + / *). Programul
+este transformat în sursă Python și compilat într-un code object:
+
+    f = compile_expression("( x + y ) * x")
+    f.variables          # ('x', 'y')
+    f({'x': 2, 'y': 3})  # 10
+
+Identificatorii anonimi 'id' devin variabilele id1, id2, ... (în ordinea apariției).
+Pentru expresii imense (pe care compilatorul Python nu le poate procesa) se
+folosește un evaluator cu stivă peste programul postfix (closure).
+
+compile_expression are un cache LRU indexat după secvența normalizată de
+tokeni, deci o formă de expresie deja văzută nu mai este parsată deloc.
+
+Usage:
+  python3 compiled_expr.py "( x + y ) * x" x=2 y=3
+  python3 compiled_expr.py --bench 100000
+"""
+import argparse
+import time
+from collections import deque
+from functools import lru_cache
+
+import tema4
+from codegen import NUMBER_RE
+from translation import TranslationScheme
+
+LOAD = 'load'
+CONST = 'const'
+CACHE_SIZE = 1024
+
+
+# ============================================================================
+# Schema de traducere: construiește programul postfix
+# ============================================================================
+
+PROGRAM_SCHEME = TranslationScheme()
+PROGRAM_SCHEME.copy("S -> E")
+PROGRAM_SCHEME.copy("E -> T")
+PROGRAM_SCHEME.copy("T -> F")
+PROGRAM_SCHEME.copy("F -> id")
+PROGRAM_SCHEME.copy("F -> ( E )", index=1)
+
+
+@PROGRAM_SCHEME.on_start
+def start_program(ctx):
+    ctx.program = []
+    ctx.slots = {}      # nume variabilă -> index parametru
+    ctx.anonymous = 0   # câte 'id' fără nume au apărut
+
+
+@PROGRAM_SCHEME.on_leaf
+def leaf_instruction(ctx, lexeme, value):
+    if lexeme is not None and NUMBER_RE.match(lexeme):
+        ctx.program.append((CONST, value))
+        return None
+    if lexeme is None or lexeme == 'id':
+        ctx.anonymous += 1
+        lexeme = f"id{ctx.anonymous}"
+    slot = ctx.slots.setdefault(lexeme, len(ctx.slots))
+    ctx.program.append((LOAD, slot))
+    return None
+
+
+@PROGRAM_SCHEME.on_result
+def program_result(ctx, attribute):
+    # rezultatul traducerii este programul + numele variabilelor în ordinea slot-urilor
+    return ctx.program, tuple(ctx.slots)
+
+
+@PROGRAM_SCHEME.action("E -> E + T")
+def add_instruction(ctx, v):
+    ctx.program.append(('+', None))
+
+
+@PROGRAM_SCHEME.action("T -> T * F")
+def mul_instruction(ctx, v):
+    ctx.program.append(('*', None))
+
+
+# ============================================================================
+# Program postfix -> sursă Python / closure
+# ============================================================================
+
+def postfix_to_source(program):
+    """
+    Construiește sursa infixată (cu paranteze complete) din programul postfix.
+    Fragmentele sunt deque-uri, iar la fiecare operație cel mic este lipit de
+    cel mare, deci costul total este O(n log n), nu O(n^2).
+    """
+    stack = []
+    for op, arg in program:
+        if op == LOAD:
+            stack.append(deque((f"_v{arg}",)))
+        elif op == CONST:
+            stack.append(deque((repr(arg),)))
+        else:
+            right = stack.pop()
+            left = stack.pop()
+            if len(left) >= len(right):
+                left.appendleft('(')
+                left.append(f" {op} ")
+                left.extend(right)
+                left.append(')')
+                stack.append(left)
+            else:
+                right.appendleft(f" {op} ")
+                right.extendleft(reversed(left))
+                right.appendleft('(')
+                right.append(')')
+                stack.append(right)
+    return ''.join(stack.pop()) if stack else 'None'
+
+
+def postfix_closure(program):
+    """Evaluator cu stivă peste programul postfix (pentru expresii prea mari pentru compile())."""
+    ops = tuple(program)
+
+    def run(*args):
+        stack = []
+        push, pop = stack.append, stack.pop
+        for op, arg in ops:
+            if op == LOAD:
+                push(args[arg])
+            elif op == CONST:
+                push(arg)
+            elif op == '+':
+                b = pop()
+                push(pop() + b)
+            else:
+                b = pop()
+                push(pop() * b)
+        return stack[-1]
+    return run
+
+
+class CompiledExpression:
+    __slots__ = ('program', 'source', 'variables', 'code', '_fn')
+
+    def __init__(self, program, variables):
+        self.program = tuple(program)
+        self.variables = variables
+        params = ', '.join(f"_v{i}" for i in range(len(variables)))
+        self.source = postfix_to_source(program)
+        try:
+            self.code = compile(f"lambda {params}: {self.source}", '<expresie>', 'eval')
+            self._fn = eval(self.code)
+        except (RecursionError, MemoryError, SyntaxError):
+            # expresie prea adâncă pentru compilatorul Python
+            self.code = None
+            self._fn = postfix_closure(self.program)
+
+    def __call__(self, bindings=None, **kwargs):
+        if bindings is None:
+            bindings = kwargs
+        try:
+            return self._fn(*[bindings[name] for name in self.variables])
+        except KeyError as e:
+            raise KeyError(f"Lipsește valoarea pentru variabila {e.args[0]!r}") from None
+
+    def __repr__(self):
+        return f"CompiledExpression(variables={self.variables})"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_normalized(key):
+    ok, result, _ = tema4.evaluate_tokens(key, verbose=False, scheme=PROGRAM_SCHEME, lexemes=True)
+    if not ok:
+        raise ValueError(f"Expresie invalidă: {' '.join(key)}")
+    program, variables = result
+    return CompiledExpression(program, variables)
+
+
+def compile_expression(expression):
+    """
+    Parsează expresia (str sau secvență de tokeni) o singură dată și întoarce un
+    CompiledExpression apelabil cu un dicționar de valori. Rezultatele sunt
+    păstrate într-un cache LRU după secvența normalizată de tokeni.
+    Ridică ValueError pentru expresii invalide.
+    """
+    key = tuple(expression.split()) if isinstance(expression, str) else tuple(expression)
+    return _compile_normalized(key)
+
+
+def evaluate(expression, bindings=None, **kwargs):
+    return compile_expression(expression)(bindings, **kwargs)
+
+
+def cache_info():
+    return _compile_normalized.cache_info()
+
+
+def cache_clear():
+    _compile_normalized.cache_clear()
+
+
+def bench(count):
+    expr = "( x + y ) * z + x * ( y + 2 ) * z"
+    rows = [{'x': i, 'y': i + 1, 'z': i % 7} for i in range(count)]
+
+    t0 = time.perf_counter()
+    for b in rows:
+        tema4.parse_and_evaluate(expr, verbose=False, lexemes=True)
+    t_parse = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for b in rows:
+        compile_expression(expr)(b)
+    t_cached = time.perf_counter() - t0
+
+    f = compile_expression(expr)
+    t0 = time.perf_counter()
+    for b in rows:
+        f(b)
+    t_direct = time.perf_counter() - t0
+
+    print(f"{count} evaluări pentru '{expr}'")
+    print(f"  tema4.parse_and_evaluate: {count / t_parse:12,.0f} eval/s")
+    print(f"  compile_expression (LRU): {count / t_cached:12,.0f} eval/s")
+    print(f"  funcție compilată direct: {count / t_direct:12,.0f} eval/s")
+    print(f"  {cache_info()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compilează o expresie și o evaluează cu valori date.")
+    parser.add_argument("expression", nargs='?', help="Expresia, ex: \"( x + y ) * x\"")
+    parser.add_argument("bindings", nargs='*', help="Valori, ex: x=2 y=3")
+    parser.add_argument("--bench", type=int, metavar="N", help="Compară cu tema4 pe N evaluări")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.bench)
+        return
+    if not args.expression:
+        parser.error("trebuie dată o expresie sau --bench N")
+    bindings = {}
+    for item in args.bindings:
+        name, _, value = item.partition('=')
+        bindings[name] = float(value) if '.' in value else int(value)
+    f = compile_expression(args.expression)
+    print(f"Variabile: {', '.join(f.variables)}")
+    print(f"Sursă: {f.source}")
+    print(f"Rezultat: {f(bindings)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+corpus_check.py - Validarea unui director de fișiere cu expresii, cu cache de rezultate per fișier
+
+Fiecare fișier din corpus conține o expresie (tokenii pot fi pe mai multe
+linii, ca la parse_input). La fiecare rulare:
+
+  - se calculează hash-ul tabelelor (SHA-256 peste action_table.csv și
+    result.csv); dacă diferă de cel din cache (tema3 a regenerat tabelele),
+    tot cache-ul este invalidat
+  - se calculează hash-ul conținutului fiecărui fișier; rezultatul este
+    refolosit dacă același conținut a fost deja validat cu aceleași tabele
+    (fișierele redenumite sau duplicate nu se parsează din nou)
+  - doar fișierele noi / modificate sunt parsate, pe mai multe procese
+    (batch.init_worker încarcă tabelele o dată per proces); cu --workers 0
+    totul rulează în procesul curent, cu tabelele încărcate local
+  - cache-ul este rescris atomic și păstrează doar conținutul încă prezent
+
+Raportul (JSON) conține hash-ul tabelelor, contoarele și, pentru fiecare
+fișier, accepted / error_offset (indexul tokenului respins) și dacă a venit
+din cache. Codul de ieșire este 1 dacă vreun fișier este respins.
+
+Rezultatul este cel al lui parse_input (acceptat / respins); parsarea se face
+cu aceleași tabele prin lr_tables, ca în batch.py.
+
+Usage:
+  python3 corpus_check.py corpus/ --report raport.json
+  python3 corpus_check.py corpus/ --pattern '*.expr' --workers 4 --cache corpus.cache.json
+  python3 corpus_check.py corpus/ --no-cache
+"""
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import batch
+from lr_tables import load_tables, tables_hash
+
+CACHE_NAME = '.corpus_cache.json'
+CACHE_VERSION = 1
+
+
+def iter_corpus(root, pattern='*', exclude=()):
+    """Căile relative (sortate) ale fișierelor din root care se potrivesc cu pattern."""
+    paths = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for name in filenames:
+            path = os.path.join(directory, name)
+            if fnmatch.fnmatch(name, pattern) and os.path.abspath(path) not in exclude:
+                paths.append(os.path.relpath(path, root))
+    paths.sort()
+    return paths
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cache(path, table_digest):
+    """Rezultatele din cache (hash conținut -> [accepted, error_offset]) valide pentru aceste tabele."""
+    try:
+        with open(path, encoding='utf-8') as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != CACHE_VERSION or data.get('tables') != table_digest:
+        return {}
+    return data.get('results', {})
+
+
+def save_cache(path, table_digest, results):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump({'version': CACHE_VERSION, 'tables': table_digest, 'results': results}, fh)
+    os.replace(tmp, path)
+
+
+def _read(path):
+    with open(path, encoding='utf-8', errors='replace') as fh:
+        return fh.read()
+
+
+def _check_files(paths):
+    """În worker (pregătit cu batch.init_worker): (accepted, error_offset) pentru fiecare fișier."""
+    return [(r.accepted, r.error_offset) for r in batch.process_chunk(0, [_read(p) for p in paths])]
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def validate_corpus(root, pattern='*', workers=None, cache_path=None, use_cache=True,
+                    action_path='action_table.csv', prod_path='result.csv', chunk_size=64):
+    """Validează corpusul; întoarce raportul (dicționar serializabil JSON)."""
+    t0 = time.perf_counter()
+    table_digest = tables_hash(action_path, prod_path)
+    cache_path = cache_path or os.path.join(root, CACHE_NAME)
+    cached = load_cache(cache_path, table_digest) if use_cache else {}
+
+    files = iter_corpus(root, pattern, exclude={os.path.abspath(cache_path)})
+    digests = [file_hash(os.path.join(root, rel)) for rel in files]
+
+    # conținut nou: parsat o singură dată, chiar dacă apare în mai multe fișiere
+    todo = {}
+    for rel, digest in zip(files, digests):
+        if digest not in cached and digest not in todo:
+            todo[digest] = os.path.join(root, rel)
+    t_hash = time.perf_counter() - t0
+
+    fresh = {}
+    if todo:
+        keys = list(todo)
+        if workers == 0:
+            tables = load_tables(action_path, prod_path)
+            parsed = []
+            for key in keys:
+                r = batch.run_one(tables, _read(todo[key]))
+                parsed.append((r.accepted, r.error_offset))
+        else:
+            chunks = _chunks([todo[k] for k in keys], chunk_size)
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=batch.init_worker,
+                                     initargs=(action_path, prod_path, False)) as pool:
+                parsed = [r for out in pool.map(_check_files, chunks) for r in out]
+        fresh = {k: list(r) for k, r in zip(keys, parsed)}
+
+    results = []
+    accepted = 0
+    current = {}
+    for rel, digest in zip(files, digests):
+        entry = cached.get(digest)
+        from_cache = entry is not None
+        if entry is None:
+            entry = fresh[digest]
+        current[digest] = entry
+        accepted += bool(entry[0])
+        results.append({'path': rel, 'sha256': digest, 'accepted': bool(entry[0]),
+                        'error_offset': entry[1], 'cached': from_cache})
+
+    if use_cache:
+        save_cache(cache_path, table_digest, current)
+    return {
+        'root': os.path.abspath(root),
+        'tables_sha256': table_digest,
+        'files': len(files),
+        'parsed': len(todo),
+        'cached': sum(1 for r in results if r['cached']),
+        'accepted': accepted,
+        'rejected': len(files) - accepted,
+        'hash_s': round(t_hash, 4),
+        'elapsed_s': round(time.perf_counter() - t0, 4),
+        'results': results,
+    }
+
+
+def make_corpus(root, count, seed=0, invalid=0.05):
+    """Corpus de test: count fișiere generate cu sentence_gen (o fracțiune invalidă)."""
+    from sentence_gen import SentenceGenerator
+
+    os.makedirs(root, exist_ok=True)
+    gen = SentenceGenerator()
+    for i, (tokens, _) in enumerate(gen.sentences(count, (5, 200), seed=seed, invalid=invalid)):
+        with open(os.path.join(root, f"expr_{i:06d}.txt"), 'w', encoding='utf-8') as fh:
+            fh.write(' '.join(tokens) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validează un director de expresii, re-parsând doar fișierele modificate.")
+    parser.add_argument("root", help="Directorul corpusului")
+    parser.add_argument("--pattern", default="*", help="Filtru pentru numele fișierelor (ex: '*.txt')")
+    parser.add_argument("--workers", type=int, default=None, help="Număr de procese (0 = fără pool)")
+    parser.add_argument("--cache", help=f"Fișierul cache (implicit ROOT/{CACHE_NAME})")
+    parser.add_argument("--no-cache", action='store_true', help="Ignoră și nu scrie cache-ul")
+    parser.add_argument("--report", help="Scrie raportul JSON în acest fișier (implicit: doar sumarul)")
+    parser.add_argument("--action", default="action_table.csv")
+    parser.add_argument("--prod", default="result.csv")
+    parser.add_argument("--make", type=int, metavar="N", help="Generează întâi N fișiere de test în ROOT")
+    args = parser.parse_args()
+
+    if args.make:
+        make_corpus(args.root, args.make)
+    report = validate_corpus(args.root, args.pattern, args.workers, args.cache, not args.no_cache,
+                             args.action, args.prod)
+    if args.report == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.report:
+        with open(args.report, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+    print(f"{report['files']:,d} fișiere: {report['parsed']:,d} parsate, {report['cached']:,d} din cache, "
+          f"{report['accepted']:,d} acceptate, {report['rejected']:,d} respinse "
+          f"({report['elapsed_s']:.2f} s, din care hash {report['hash_s']:.2f} s)", file=sys.stderr)
+    sys.exit(1 if report['rejected'] else 0)
+
+
+if __name__ == "__main__":
+    main()
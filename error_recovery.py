@@ -0,0 +1,217 @@
+"""
+error_recovery.py - Raportarea tuturor erorilor de sintaxă într-o singură trecere
+
+LRParser2.parse_input și tema4.parse_and_evaluate se opresc la prima celulă
+goală ("Input rejected"), fără poziție. recover_parse continuă după fiecare
+eroare și întoarce lista completă, fiecare cu offset-ul tokenului și mulțimea
+terminalelor așteptate (celulele nevide din rândul ACTION al stării curente).
+
+Revenirea (panic mode) are două variante:
+  - producții de eroare: dacă gramatica din tema3 folosește terminalul rezervat
+    'error' (ex: F -> ( error )), se scot stări de pe stivă până la una care
+    deplasează 'error', se deplasează, apoi se aruncă tokeni până la unul
+    acceptat în noua stare (ca în yacc)
+  - tokeni de sincronizare (implicit ')' și '$'): se aruncă tokeni până la un
+    token de sincronizare, apoi se scot stări până la una care are acțiune pe el
+    sau care are GOTO pe un neterminal A după care tokenul poate urma (tokenii
+    aruncați sunt luați ca un A complet, ca în panic mode-ul clasic)
+  - un token de sincronizare pe care nu-l acceptă niciun context deschis (ex:
+    ')' fără '(') este raportat separat și aruncat; tot inputul dinaintea lui
+    este luat ca fraza pe care ar fi închis-o (E din F -> ( E )), apoi parsarea
+    continuă normal, deci și erorile de după el sunt raportate
+
+O eroare nu este raportată de două ori doar dacă nu s-a consumat niciun token
+de la raportul anterior (revenirea s-a oprit chiar pe tokenul greșit).
+
+Fiecare token este citit o singură dată (trecere liniară, orice iterabil).
+
+Usage:
+  python3 error_recovery.py "id * * + id ) id"
+  python3 error_recovery.py --file expresie.txt --sync ") $ +"
+  python3 error_recovery.py --file expresie.txt --json
+"""
+import argparse
+import json
+from collections import namedtuple
+from itertools import chain
+
+from lr_tables import SHIFT, REDUCE, ENDMARK, ERROR, load_tables
+
+ParseError = namedtuple('ParseError', 'offset token expected')
+
+DEFAULT_SYNC = (')', ENDMARK)
+
+
+def expected_terminals(tables, state):
+    """Terminalele cu acțiune în starea dată (rândul ACTION al stării)."""
+    return tuple(sorted(t for t, row in tables.action.items()
+                        if t != ERROR and state < len(row) and row[state] is not None))
+
+
+def recover_parse(tokens, tables=None, sync=DEFAULT_SYNC, max_errors=None):
+    """
+    Parsează tokenii continuând după erori.
+    Întoarce (accepted, errors): accepted este True doar dacă inputul a fost
+    acceptat fără nicio eroare; errors este lista de ParseError, în ordine.
+    """
+    if tables is None:
+        tables = load_tables()
+    sync = set(sync) | {ENDMARK}
+    action_cell, goto_state, productions = tables.action_cell, tables.goto_state, tables.productions
+    has_error_rules = ERROR in tables.action
+
+    errors = []
+    states = [0]
+    it = chain(tokens, (ENDMARK,))
+    token = next(it)
+    offset = 0
+    last_reported = None   # offset-ul ultimei erori raportate
+
+    def advance():
+        nonlocal token, offset
+        if token != ENDMARK:
+            token = next(it, ENDMARK)
+            offset += 1
+
+    while True:
+        cell = action_cell(states[-1], token)
+        if cell is not None:
+            kind, arg = cell
+            if kind == SHIFT:
+                states.append(arg)
+                advance()
+                continue
+            if kind == REDUCE:
+                lhs, rhs = productions[arg]
+                if rhs:
+                    del states[-len(rhs):]
+                nxt = goto_state(states[-1], lhs)
+                if nxt is not None:
+                    states.append(nxt)
+                    continue
+                cell = None  # GOTO lipsă: tratat ca eroare pe tokenul curent
+            else:
+                return not errors, errors
+
+        # ---- eroare ----
+        if offset == last_reported:
+            # niciun token consumat de la eroarea raportată (revenirea s-a oprit chiar
+            # pe tokenul greșit): tokenul este aruncat fără un al doilea raport și
+            # parsarea continuă normal cu următorul
+            if token == ENDMARK:
+                return False, errors
+            advance()
+            continue
+        errors.append(ParseError(offset, token, expected_terminals(tables, states[-1])))
+        last_reported = offset
+        if max_errors is not None and len(errors) >= max_errors:
+            return False, errors
+
+        if has_error_rules:
+            while states and not _shifts_error(tables, states[-1]):
+                states.pop()
+            if states:
+                states.append(action_cell(states[-1], ERROR)[1])
+                while action_cell(states[-1], token) is None:
+                    if token == ENDMARK:
+                        return False, errors
+                    advance()
+                continue
+            states = [0]    # nicio stare nu acceptă 'error': continuăm cu sincronizarea
+
+        while True:
+            while token not in sync:
+                advance()
+            resumed = _resume_states(tables, states, token)
+            if resumed is not None:
+                states = resumed
+                break
+            if token == ENDMARK:
+                return False, errors
+            # niciun context deschis nu acceptă tokenul: eroare separată, apoi tokenul
+            # este aruncat și inputul de dinainte devine fraza pe care ar fi închis-o
+            closed = _closed_phrase(tables, states[0], token)
+            if offset != last_reported:
+                errors.append(ParseError(offset, token, expected_terminals(
+                    tables, closed if closed is not None else states[-1])))
+                last_reported = offset
+                if max_errors is not None and len(errors) >= max_errors:
+                    return False, errors
+            advance()
+            if closed is not None:
+                states = [states[0], closed]
+                break
+
+
+def _resume_states(tables, states, token):
+    """
+    Stiva cu care parsarea poate continua pe token, sau None:
+    cea mai de sus stare cu acțiune pe token, altfel cea mai de sus stare s cu
+    GOTO(s, A) care are acțiune pe token (se adaugă GOTO(s, A)).
+    """
+    for depth in range(len(states), 0, -1):
+        if tables.action_cell(states[depth - 1], token) is not None:
+            return states[:depth]
+    for depth in range(len(states), 0, -1):
+        for lhs in tables.nonterminals:
+            nxt = tables.goto_state(states[depth - 1], lhs)
+            if nxt is not None and tables.action_cell(nxt, token) is not None:
+                return states[:depth] + [nxt]
+    return None
+
+
+def _closed_phrase(tables, bottom, token):
+    """GOTO(bottom, A) pentru primul neterminal A urmat de token într-o producție (ex: E în F -> ( E ))."""
+    for num in sorted(tables.productions):
+        rhs = tables.productions[num][1]
+        for symbol, following in zip(rhs, rhs[1:]):
+            if following == token and symbol in tables.goto:
+                nxt = tables.goto_state(bottom, symbol)
+                if nxt is not None:
+                    return nxt
+    return None
+
+
+def _shifts_error(tables, state):
+    cell = tables.action_cell(state, ERROR)
+    return cell is not None and cell[0] == SHIFT
+
+
+def format_error(err):
+    shown = 'sfârșitul inputului' if err.token == ENDMARK else repr(err.token)
+    return f"token {err.offset}: neașteptat {shown}, se aștepta unul din: {' '.join(err.expected)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raportează toate erorile de sintaxă dintr-o singură trecere.")
+    parser.add_argument("expression", nargs='?', help="Expresie (tokeni separați prin spații)")
+    parser.add_argument("--file", help="Fișier cu expresia (citit prin mmap)")
+    parser.add_argument("--sync", default=' '.join(DEFAULT_SYNC), help="Tokeni de sincronizare (separați prin spații)")
+    parser.add_argument("--action", default="action_table.csv", help="Tabela ACTION/GOTO (tema3)")
+    parser.add_argument("--prod", default="result.csv", help="Fișierul de producții (tema3)")
+    parser.add_argument("--max-errors", type=int, help="Oprește după N erori")
+    parser.add_argument("--json", action='store_true', help="Raport JSON")
+    args = parser.parse_args()
+
+    tables = load_tables(args.action, args.prod)
+    sync = args.sync.split()
+    if args.file:
+        from contextlib import closing
+        from mmap_input import open_buffer, iter_tokens
+        with open_buffer(args.file) as buf, closing(iter_tokens(buf)) as tokens:
+            accepted, errors = recover_parse(tokens, tables, sync, args.max_errors)
+    elif args.expression is not None:
+        accepted, errors = recover_parse(args.expression.split(), tables, sync, args.max_errors)
+    else:
+        parser.error("trebuie dată o expresie sau --file")
+
+    if args.json:
+        print(json.dumps({'accepted': accepted, 'errors': [e._asdict() for e in errors]}, ensure_ascii=False))
+    else:
+        for err in errors:
+            print(format_error(err))
+        print(f"Accepted: {accepted}, erori: {len(errors)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+glr.py - Parser GLR (Tomita) cu stivă graf (GSS) și pădure de parsare partajată (SPPF)
+
+Când build_parsing_table din tema3 găsește conflicte, păstrează doar prima
+acțiune, deci gramaticile ambigue sau non-LR(1) nu sunt parsate corect.
+Cu `tema3.py --glr` celulele cu conflict păstrează toate acțiunile ('d4|r2'),
+iar GLRParser le explorează pe toate:
+
+  - cât timp nu se ajunge într-o celulă cu conflict, parserul este o buclă LR
+    obișnuită (stivă liniară), deci pe tabele fără conflicte viteza este cea a
+    unui parser LR
+  - la prima celulă cu conflict stiva devine un GSS: pentru fiecare token,
+    nodurile din frontieră sunt unificate după stare, reducerile se aplică pe
+    toate drumurile de lungime |RHS|, iar deplasările avansează frontiera
+  - pădurea de parsare (SPPF) are câte un nod per (simbol, început, sfârșit);
+    fiecare nod are una sau mai multe alternative (families) = ambiguitate.
+    Numărul de arbori poate fi exponențial, dar pădurea rămâne polinomială.
+
+Producțiile vide sunt tratate ca în varianta Farshi simplificată (fără
+gramatici cu recursivitate stângă ascunsă).
+
+Usage:
+  python3 tema3.py -f gramatica.txt --glr      # scrie glr_action_table.csv / glr_result.csv
+  python3 glr.py "id + id * id"
+  python3 glr.py "id + id * id" --action amb.csv --prod amb_prod.csv
+  python3 glr.py --bench
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import tempfile
+import time
+from collections import deque, namedtuple
+from itertools import chain
+
+from lr_tables import SHIFT, REDUCE, ACCEPT, ENDMARK, load_tables
+
+CONFLICT = 'conflict'
+
+GLRResult = namedtuple('GLRResult', 'accepted forest error_offset stats')
+
+
+class ForestNode:
+    """Nod SPPF: simbol pe intervalul [start, end); families = alternativele (tuple de copii), None la terminale."""
+    __slots__ = ('symbol', 'start', 'end', 'families')
+
+    def __init__(self, symbol, start, end, families):
+        self.symbol = symbol
+        self.start = start
+        self.end = end
+        self.families = families
+
+    @property
+    def is_ambiguous(self):
+        return self.families is not None and len(self.families) > 1
+
+    def __repr__(self):
+        return f"ForestNode({self.symbol}, {self.start}, {self.end}, alternative={len(self.families or ())})"
+
+
+class GSSNode:
+    __slots__ = ('state', 'edges')   # edges: listă de (nod_părinte, ForestNode)
+
+    def __init__(self, state, edges):
+        self.state = state
+        self.edges = edges
+
+
+class GLRParser:
+    def __init__(self, tables=None):
+        self.tables = tables if tables is not None else load_tables()
+        rows = {}
+        for token, row in self.tables.action.items():
+            cells = list(row)
+            for state in range(len(cells)):
+                actions = self.tables.conflicts.get((state, token))
+                if actions:
+                    cells[state] = (CONFLICT, actions)
+            rows[token] = tuple(cells)
+        self.rows = rows
+        self.goto = self.tables.goto
+        self.productions = self.tables.productions
+
+    def actions(self, state, token):
+        row = self.rows.get(token)
+        cell = row[state] if row is not None and state < len(row) else None
+        if cell is None:
+            return ()
+        return cell[1] if cell[0] == CONFLICT else (cell,)
+
+    def goto_state(self, state, lhs):
+        row = self.goto.get(lhs)
+        return row[state] if row is not None and state < len(row) else None
+
+    def parse(self, tokens, forest=True):
+        """
+        Parsează tokenii; întoarce GLRResult(accepted, forest, error_offset, stats).
+        Cu forest=False parserul doar recunoaște inputul (fără SPPF).
+        """
+        stats = {'glr_from': None, 'gss_nodes': 0}
+        rows, goto, productions = self.rows, self.goto, self.productions
+        states = [0]
+        nodes = [None]
+        pos = 0
+        it = chain(tokens, (ENDMARK,))
+        token = next(it)
+        while True:
+            row = rows.get(token)
+            state = states[-1]
+            cell = row[state] if row is not None and state < len(row) else None
+            if cell is None:
+                return GLRResult(False, None, pos, stats)
+            kind, arg = cell
+            if kind == SHIFT:
+                states.append(arg)
+                nodes.append(ForestNode(token, pos, pos + 1, None) if forest else None)
+                pos += 1
+                token = next(it)
+            elif kind == REDUCE:
+                lhs, rhs = productions[arg]
+                n = len(rhs)
+                node = None
+                if forest:
+                    kids = tuple(nodes[-n:]) if n else ()
+                    node = ForestNode(lhs, kids[0].start if kids else pos, pos, [kids])
+                if n:
+                    del states[-n:]
+                    del nodes[-n:]
+                g = goto.get(lhs)
+                top = states[-1]
+                nxt = g[top] if g is not None and top < len(g) else None
+                if nxt is None:
+                    return GLRResult(False, None, pos, stats)
+                states.append(nxt)
+                nodes.append(node)
+            elif kind == ACCEPT:
+                return GLRResult(True, nodes[-1], None, stats)
+            else:
+                stats['glr_from'] = pos
+                return self._parse_gss(states, nodes, pos, token, it, forest, stats)
+
+    def _parse_gss(self, states, nodes, pos, token, it, forest, stats):
+        # stiva liniară devine un lanț în GSS
+        top = GSSNode(0, [])
+        shared = {}   # (simbol, început) -> ForestNode care se termină la pos
+        alternatives = set()   # (simbol, început, copii) deja adăugate la nivelul curent
+        for state, fnode in zip(states[1:], nodes[1:]):
+            top = GSSNode(state, [(top, fnode)])
+            if fnode is not None and fnode.families is not None and fnode.end == pos:
+                shared[(fnode.symbol, fnode.start)] = fnode
+                alternatives.update((fnode.symbol, fnode.start, kids) for kids in fnode.families)
+        frontier = {top.state: top}
+        stats['gss_nodes'] = len(states)
+        actions, goto_state, productions = self.actions, self.goto_state, self.productions
+
+        while True:
+            # ---- reduceri (până la punct fix) ----
+            work = deque((node, None) for node in frontier.values())
+            while work:
+                gnode, via = work.popleft()
+                for kind, arg in actions(gnode.state, token):
+                    if kind != REDUCE:
+                        continue
+                    lhs, rhs = productions[arg]
+                    if rhs:
+                        paths = _paths(gnode, len(rhs), via)
+                    elif via is None:
+                        paths = ((gnode, ()),)
+                    else:
+                        continue    # reducerea vidă a fost deja făcută pentru acest nod
+                    for base, kids in paths:
+                        nxt = goto_state(base.state, lhs)
+                        if nxt is None:
+                            continue
+                        fnode = None
+                        if forest:
+                            start = kids[0].start if kids else pos
+                            fnode = shared.get((lhs, start))
+                            if fnode is None:
+                                fnode = shared[(lhs, start)] = ForestNode(lhs, start, pos, [kids])
+                                alternatives.add((lhs, start, kids))
+                            elif (lhs, start, kids) not in alternatives:
+                                alternatives.add((lhs, start, kids))
+                                fnode.families.append(kids)
+                        target = frontier.get(nxt)
+                        if target is None:
+                            target = frontier[nxt] = GSSNode(nxt, [(base, fnode)])
+                            stats['gss_nodes'] += 1
+                            work.append((target, None))
+                        elif not any(parent is base for parent, _ in target.edges):
+                            edge = (base, fnode)
+                            target.edges.append(edge)
+                            work.append((target, edge))
+
+            # ---- deplasări / accept ----
+            leaf = ForestNode(token, pos, pos + 1, None) if forest else None
+            following = {}
+            for gnode in frontier.values():
+                for kind, arg in actions(gnode.state, token):
+                    if kind == SHIFT:
+                        target = following.get(arg)
+                        if target is None:
+                            following[arg] = GSSNode(arg, [(gnode, leaf)])
+                            stats['gss_nodes'] += 1
+                        else:
+                            target.edges.append((gnode, leaf))
+                    elif kind == ACCEPT:
+                        return GLRResult(True, gnode.edges[0][1], None, stats)
+            if not following:
+                return GLRResult(False, None, pos, stats)
+            frontier = following
+            shared = {}
+            alternatives = set()
+            pos += 1
+            token = next(it)
+
+
+def _paths(gnode, length, via):
+    """Drumurile de `length` muchii din gnode: (nod_bază, copii în ordine stânga-dreapta)."""
+    first = (via,) if via is not None else gnode.edges
+    stack = [(parent, 1, (f,)) for parent, f in first]
+    paths = []
+    while stack:
+        node, depth, kids = stack.pop()
+        if depth == length:
+            paths.append((node, kids))
+        else:
+            stack.extend((parent, depth + 1, (f,) + kids) for parent, f in node.edges)
+    return paths
+
+
+# ============================================================================
+# Pădurea de parsare
+# ============================================================================
+
+def _postorder(root):
+    """Nodurile distincte ale pădurii, copiii înaintea părinților (iterativ)."""
+    seen = set()
+    order = []
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        stack.append((node, True))
+        for kids in node.families or ():
+            stack.extend((k, False) for k in kids if id(k) not in seen)
+    return order
+
+
+def count_trees(root):
+    """Numărul de arbori de derivare reprezentați de pădure."""
+    counts = {}
+    for node in _postorder(root):
+        if node.families is None:
+            counts[id(node)] = 1
+            continue
+        total = 0
+        for kids in node.families:
+            product = 1
+            for k in kids:
+                product *= counts[id(k)]
+            total += product
+        counts[id(node)] = total
+    return counts[id(root)] if root is not None else 0
+
+
+def forest_size(root):
+    """(noduri, alternative) în pădure."""
+    nodes = _postorder(root) if root is not None else []
+    return len(nodes), sum(len(n.families) for n in nodes if n.families is not None)
+
+
+def pretty(root):
+    """Primul arbore din pădure, indentat; nodurile ambigue sunt marcate cu '*'."""
+    lines = []
+    stack = [(root, 0)] if root is not None else []
+    while stack:
+        node, depth = stack.pop()
+        mark = '*' if node.is_ambiguous else ''
+        lines.append(f"{'  ' * depth}{node.symbol}{mark} [{node.start},{node.end})")
+        if node.families:
+            stack.extend((k, depth + 1) for k in reversed(node.families[0]))
+    return lines
+
+
+def export_tables(grammar_text, action_path, prod_path):
+    """Rulează tema3 pe gramatică (cu --glr) și scrie action_table.csv / result.csv."""
+    import tema3
+
+    G = tema3.parse_grammar(grammar_text)
+    states, transitions, G_aug, S_prime, FIRST = tema3.canonical_LR1_collection(G)
+    action, goto, conflicts = tema3.build_parsing_table(states, transitions, G_aug, S_prime, FIRST)
+    prods_list = [(A, list(rhs)) for A, plist in G_aug.items() for rhs in plist]
+    terminals, nonterms = tema3.compute_terminals_and_nonterminals(G_aug)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tema3.export_action_and_prod_tables(action, goto, terminals, nonterms, len(states), prods_list,
+                                            S_prime, action_path, prod_path, conflicts=conflicts)
+
+
+def build_tables(grammar_text):
+    """Construiește tabelele pentru gramatică (tema3 --glr) și le încarcă, fără fișiere păstrate."""
+    with tempfile.TemporaryDirectory() as tmp:
+        action_path = os.path.join(tmp, 'action_table.csv')
+        prod_path = os.path.join(tmp, 'result.csv')
+        export_tables(grammar_text, action_path, prod_path)
+        return load_tables(action_path, prod_path)
+
+
+AMBIGUOUS_GRAMMAR = """
+S -> E
+E -> E + E | E * E | ( E ) | id
+""".strip()
+
+
+def bench():
+    import LRParser2
+    from incremental import sample_tokens
+
+    tokens = sample_tokens(400_000)
+    glr = GLRParser()
+    print(f"Gramatică fără conflicte, {len(tokens):,d} tokeni:")
+    t0 = time.perf_counter()
+    LRParser2.parse_tokens(tokens, verbose=False)
+    t_lr = time.perf_counter() - t0
+    print(f"  LRParser2:               {len(tokens) / t_lr:12,.0f} tokeni/s")
+    for label, forest in (("GLR (doar recunoaștere)", False), ("GLR (cu SPPF)          ", True)):
+        t0 = time.perf_counter()
+        result = glr.parse(tokens, forest=forest)
+        elapsed = time.perf_counter() - t0
+        assert result.accepted and result.stats['glr_from'] is None
+        print(f"  {label}: {len(tokens) / elapsed:12,.0f} tokeni/s ({elapsed / t_lr:.2f}x timpul LRParser2)")
+
+    amb = GLRParser(build_tables(AMBIGUOUS_GRAMMAR))
+    print(f"Gramatică ambiguă ({len(amb.tables.conflicts)} celule cu conflict): E -> E + E | E * E | ( E ) | id")
+    del result     # pădurea mare de mai sus nu trebuie eliberată în timpul măsurătorilor
+    gc.collect()
+    print(f"  {'operanzi':>8} {'timp (ms)':>10} {'noduri GSS':>10} {'noduri SPPF':>11} {'alternative':>11}  arbori")
+    for operands in (4, 8, 16, 32, 64, 128):
+        expr = ' '.join(('id', '+' if i % 2 else '*')[j] for i in range(operands) for j in (0, 1))[:-2]
+        t0 = time.perf_counter()
+        result = amb.parse(expr.split())
+        elapsed = time.perf_counter() - t0
+        nodes, families = forest_size(result.forest)
+        print(f"  {operands:8d} {elapsed * 1e3:10.2f} {result.stats['gss_nodes']:10d} {nodes:11d} {families:11d}  "
+              f"{count_trees(result.forest):.3e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser GLR pentru tabele cu conflicte (tema3 --glr).")
+    parser.add_argument("expression", nargs='?', help="Expresie (tokeni separați prin spații)")
+    parser.add_argument("--action", help="Tabela ACTION/GOTO (implicit glr_action_table.csv dacă există, altfel action_table.csv)")
+    parser.add_argument("--prod", help="Fișierul de producții (implicit glr_result.csv / result.csv, ca --action)")
+    parser.add_argument("--bench", action='store_true', help="Overhead pe tabele fără conflicte și scalare pe o gramatică ambiguă")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench()
+        return
+    if args.expression is None:
+        parser.error("trebuie dată o expresie sau --bench")
+    from tema3 import GLR_ACTION_FILE, GLR_PROD_FILE
+
+    if args.action is None and args.prod is None and os.path.exists(GLR_ACTION_FILE):
+        args.action, args.prod = GLR_ACTION_FILE, GLR_PROD_FILE
+    result = GLRParser(load_tables(args.action or "action_table.csv", args.prod or "result.csv")).parse(args.expression.split())
+    if not result.accepted:
+        print(f"Input respins la tokenul {result.error_offset}")
+        return
+    nodes, families = forest_size(result.forest)
+    print(f"Accepted: {count_trees(result.forest)} arbori, {nodes} noduri SPPF, {families} alternative")
+    print('\n'.join(pretty(result.forest)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""
+grammar_registry.py - Registru de tabele LR pentru mai multe gramatici (încărcare leneșă, evicție LRU)
+
+LRParser2, tema4 și lr_tables.load_tables() folosesc implicit action_table.csv /
+result.csv din directorul curent, deci un proces servește o singură gramatică.
+GrammarRegistry asociază unui id de gramatică fie o pereche de fișiere exportate
+de tema3, fie textul gramaticii:
+
+  - tabelele se încarcă la prima utilizare (nu la înregistrare)
+  - textul gramaticii este construit cu tema3 (glr.export_tables) o singură dată:
+    cu cache_dir, fișierele rezultate sunt păstrate pe disc sub un hash al
+    textului și al lui tema3.py, deci procesele următoare doar le citesc
+  - cel mult max_resident tabele rămân în memorie; la depășire iese cea mai
+    puțin recent folosită (se reîncarcă leneș la următorul apel)
+  - stats(): pentru fiecare gramatică numărul de încărcări, latența ultimei
+    încărcări, hits, evicții și memoria ocupată (estimată) cât este rezidentă
+
+Parsarea alege gramatica la fiecare apel: registry.parse('dialect', "id - id").
+Tabelele cu conflicte (gramatici ambigue) sunt parsate cu glr.GLRParser, nu cu
+prima acțiune din fiecare celulă. Cu evaluate=True fiecare gramatică folosește
+propria TranslationScheme: cea dată la register(), altfel operator_scheme()
+derivată din producții (+ - * / ^ și paranteze); o gramatică fără semantică
+sau ambiguă (valoare neunică) ridică ValueError în loc să dea o valoare greșită.
+
+Usage:
+  python3 grammar_registry.py "id + id * id"
+  python3 grammar_registry.py --grammar minus=minus.txt --use minus "id - id"
+  python3 grammar_registry.py --bench 20000 --max-resident 2 --cache-dir .lr_cache
+"""
+import argparse
+import hashlib
+import operator
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import batch
+from lr_tables import load_tables
+from translation import TranslationScheme
+
+GrammarSource = namedtuple('GrammarSource', 'action_path prod_path grammar_text scheme')
+
+# operatorii binari recunoscuți de operator_scheme (A -> B op C)
+OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '^': operator.pow,
+}
+
+# dialecte folosite de --bench (pe lângă tabelele implicite, 'expr')
+DIALECTS = {
+    'minus': """
+S -> E
+E -> E + T | E - T | T
+T -> T * F | T / F | F
+F -> ( E ) | id
+""".strip(),
+    'power': """
+S -> E
+E -> E + T | T
+T -> T * P | P
+P -> F ^ P | F
+F -> ( E ) | id
+""".strip(),
+    'ambiguous': """
+S -> E
+E -> E + E | E * E | ( E ) | id
+""".strip(),
+}
+
+
+def table_bytes(tables):
+    """Estimare a memoriei ocupate de un lr_tables.Tables (obiectele partajate sunt numărate o dată)."""
+    seen = set()
+    total = 0
+    stack = [tables.productions, tables.action, tables.goto, tables.conflicts,
+             tables.terminals, tables.nonterminals]
+    while stack:
+        obj = stack.pop()
+        if obj is None or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, (tuple, list)):
+            stack.extend(obj)
+        elif hasattr(obj, 'items'):
+            for key, value in obj.items():
+                stack.append(key)
+                stack.append(value)
+    return total + sys.getsizeof(tables)
+
+
+def _binary_action(op):
+    fn = OPERATORS[op]
+
+    def action(ctx, v):
+        value = fn(v[0], v[2])
+        ctx.emit(f"{ctx.new_temp()} = {v[0]} {op} {v[2]}")
+        return value
+    return action
+
+
+def operator_scheme(productions):
+    """
+    TranslationScheme pentru o gramatică de expresii, din producțiile (lhs, rhs):
+    A -> B op C (op din OPERATORS) calculează și emite cod cu trei adrese ca tema4,
+    A -> ( B ) copiază B, producțiile de un simbol copiază valoarea.
+    Întoarce None dacă o producție cu mai multe simboluri nu are semantică.
+    """
+    scheme = TranslationScheme()
+    for lhs, rhs in productions:
+        text = f"{lhs} -> {' '.join(rhs)}"
+        if len(rhs) == 3 and rhs[1] in OPERATORS:
+            scheme.action(text)(_binary_action(rhs[1]))
+        elif len(rhs) == 3 and (rhs[0], rhs[2]) == ('(', ')'):
+            scheme.copy(text, index=1)
+        elif len(rhs) > 1:
+            return None
+    return scheme
+
+
+def _tool_fingerprint():
+    """Hash-ul lui tema3.py: tabelele din cache se reconstruiesc dacă se schimbă generatorul."""
+    import tema3
+
+    with open(tema3.__file__, 'rb') as fh:
+        return hashlib.sha256(fh.read()).hexdigest()[:16]
+
+
+class GrammarRegistry:
+    def __init__(self, max_resident=4, cache_dir=None):
+        if max_resident < 1:
+            raise ValueError("max_resident trebuie să fie cel puțin 1")
+        self.max_resident = max_resident
+        self.cache_dir = cache_dir
+        self._sources = {}
+        self._resident = OrderedDict()   # id -> (Tables, bytes, GLRParser sau None), ordinea LRU
+        self._schemes = {}               # id -> TranslationScheme derivată (operator_scheme)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def register(self, grammar_id, action_path=None, prod_path=None, grammar_text=None, scheme=None):
+        """
+        Înregistrează o gramatică: fișiere tema3 (action_path, prod_path) sau textul ei.
+        scheme: TranslationScheme pentru evaluate=True (implicit operator_scheme din producții).
+        """
+        if (grammar_text is None) == (action_path is None):
+            raise ValueError("Dați fie action_path (și prod_path), fie grammar_text")
+        if action_path is not None and prod_path is None:
+            prod_path = os.path.join(os.path.dirname(action_path), 'result.csv')
+        with self._lock:
+            self._sources[grammar_id] = GrammarSource(action_path, prod_path, grammar_text, scheme)
+            self._schemes.pop(grammar_id, None)
+            self._stats[grammar_id] = {'loads': 0, 'load_s': None, 'load_total_s': 0.0,
+                                       'hits': 0, 'evictions': 0}
+            # o reînregistrare invalidează tabelele vechi
+            self._resident.pop(grammar_id, None)
+
+    def __contains__(self, grammar_id):
+        return grammar_id in self._sources
+
+    def ids(self):
+        return list(self._sources)
+
+    def tables(self, grammar_id):
+        """Tabelele gramaticii (încărcate la prima cerere, apoi din memorie cât timp sunt rezidente)."""
+        return self._entry(grammar_id)[0]
+
+    def _entry(self, grammar_id):
+        with self._lock:
+            entry = self._resident.get(grammar_id)
+            if entry is not None:
+                self._resident.move_to_end(grammar_id)
+                self._stats[grammar_id]['hits'] += 1
+                return entry
+            source = self._sources.get(grammar_id)
+            if source is None:
+                raise KeyError(f"Gramatică neînregistrată: {grammar_id!r}")
+
+        # încărcarea (posibil o construcție tema3) se face fără lock
+        t0 = time.perf_counter()
+        tables = self._load(source)
+        glr_parser = None
+        if tables.conflicts:
+            from glr import GLRParser
+
+            glr_parser = GLRParser(tables)
+        elapsed = time.perf_counter() - t0
+        entry = (tables, table_bytes(tables), glr_parser)
+        with self._lock:
+            stats = self._stats[grammar_id]
+            stats['loads'] += 1
+            stats['load_s'] = elapsed
+            stats['load_total_s'] += elapsed
+            if self._sources.get(grammar_id) is source:
+                self._resident[grammar_id] = entry
+                self._resident.move_to_end(grammar_id)
+                self._evict()
+        return entry
+
+    def _load(self, source):
+        if source.grammar_text is None:
+            return load_tables(source.action_path, source.prod_path)
+        from glr import build_tables, export_tables
+
+        if self.cache_dir is None:
+            return build_tables(source.grammar_text)
+        key = hashlib.sha256(source.grammar_text.encode('utf-8')).hexdigest()[:16]
+        directory = os.path.join(self.cache_dir, f"{key}-{_tool_fingerprint()}")
+        action_path = os.path.join(directory, 'action_table.csv')
+        prod_path = os.path.join(directory, 'result.csv')
+        if not (os.path.exists(action_path) and os.path.exists(prod_path)):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # construit într-un director temporar și redenumit: alte procese nu văd fișiere parțiale
+            tmp = tempfile.mkdtemp(dir=self.cache_dir)
+            export_tables(source.grammar_text, os.path.join(tmp, 'action_table.csv'),
+                          os.path.join(tmp, 'result.csv'))
+            try:
+                os.rename(tmp, directory)
+            except OSError:
+                # alt proces a construit aceleași tabele între timp
+                for name in os.listdir(tmp):
+                    os.unlink(os.path.join(tmp, name))
+                os.rmdir(tmp)
+        return load_tables(action_path, prod_path)
+
+    def _evict(self):
+        while len(self._resident) > self.max_resident:
+            grammar_id, _ = self._resident.popitem(last=False)
+            self._stats[grammar_id]['evictions'] += 1
+
+    def evict(self, grammar_id):
+        with self._lock:
+            if self._resident.pop(grammar_id, None) is not None:
+                self._stats[grammar_id]['evictions'] += 1
+
+    def scheme(self, grammar_id):
+        """TranslationScheme folosită de evaluate=True, sau None dacă gramatica nu are semantică."""
+        with self._lock:
+            source = self._sources.get(grammar_id)
+            if source is None:
+                raise KeyError(f"Gramatică neînregistrată: {grammar_id!r}")
+            if source.scheme is not None:
+                return source.scheme
+            if grammar_id in self._schemes:
+                return self._schemes[grammar_id]
+
+        # tabelele (posibil o construcție tema3) se încarcă fără lock
+        scheme = operator_scheme(self.tables(grammar_id).productions.values())
+        with self._lock:
+            # o reînregistrare între timp a golit intrarea: schema calculată nu se păstrează
+            if self._sources.get(grammar_id) is source:
+                scheme = self._schemes.setdefault(grammar_id, scheme)
+        return scheme
+
+    def parse(self, grammar_id, expression, evaluate=False):
+        """
+        Parsează (și opțional evaluează) expresia cu gramatica aleasă; întoarce batch.BatchResult.
+        Ridică ValueError pentru evaluate=True pe o gramatică fără semantică sau cu conflicte.
+        """
+        tokens = expression.split() if isinstance(expression, str) else list(expression)
+        tables, _, glr_parser = self._entry(grammar_id)
+        if glr_parser is not None:
+            if evaluate:
+                raise ValueError(f"Gramatica {grammar_id!r} are conflicte (ambiguă): valoarea nu este unică")
+            result = glr_parser.parse(tokens, forest=False)
+            return batch.BatchResult(0, result.accepted, None, None if result.accepted else result.error_offset)
+        if not evaluate:
+            return batch.run_one(tables, ' '.join(tokens))
+        scheme = self.scheme(grammar_id)
+        if scheme is None:
+            raise ValueError(f"Gramatica {grammar_id!r} nu are semantică pentru evaluare (register(..., scheme=...))")
+        return batch.run_one(tables, ' '.join(tokens), True, scheme)
+
+    def resident_bytes(self):
+        with self._lock:
+            return sum(entry[1] for entry in self._resident.values())
+
+    def stats(self):
+        with self._lock:
+            report = {}
+            for grammar_id, stats in self._stats.items():
+                entry = self._resident.get(grammar_id)
+                report[grammar_id] = dict(stats, resident=entry is not None,
+                                          resident_bytes=entry[1] if entry is not None else 0)
+            return report
+
+
+def default_registry(max_resident=4, cache_dir=None):
+    """Registru cu tabelele implicite ('expr') și dialectele din DIALECTS."""
+    registry = GrammarRegistry(max_resident, cache_dir)
+    import tema4
+
+    registry.register('expr', 'action_table.csv', 'result.csv', scheme=tema4.ARITHMETIC_SCHEME)
+    for grammar_id, text in DIALECTS.items():
+        registry.register(grammar_id, grammar_text=text)
+    return registry
+
+
+def print_stats(registry):
+    print(f"{'gramatică':<12} {'rezidentă':>9} {'bytes':>10} {'încărcări':>9} {'ultima (ms)':>11} "
+          f"{'total (ms)':>10} {'hits':>8} {'evicții':>8}")
+    for grammar_id, s in registry.stats().items():
+        last = f"{s['load_s'] * 1e3:11.2f}" if s['load_s'] is not None else f"{'-':>11}"
+        print(f"{grammar_id:<12} {('da' if s['resident'] else 'nu'):>9} {s['resident_bytes']:10,d} {s['loads']:9d} "
+              f"{last} {s['load_total_s'] * 1e3:10.2f} {s['hits']:8d} {s['evictions']:8d}")
+    print(f"total rezident: {registry.resident_bytes():,d} bytes")
+
+
+def bench(registry, requests, seed=0):
+    """Cereri amestecate pe toate gramaticile (distribuție Zipf), cu selecția gramaticii per apel."""
+    from sentence_gen import SentenceGenerator
+
+    rnd = random.Random(seed)
+    ids = registry.ids()
+    generators = {}
+    for grammar_id in ids:
+        source = registry._sources[grammar_id]
+        generators[grammar_id] = SentenceGenerator(source.grammar_text)
+    weights = [1 / (rank + 1) for rank in range(len(ids))]
+    workload = []
+    for i in range(requests):
+        grammar_id = rnd.choices(ids, weights)[0]
+        workload.append((grammar_id, ' '.join(generators[grammar_id].sentence(seed, i, rnd.randint(3, 30)))))
+
+    rejected = 0
+    t0 = time.perf_counter()
+    for grammar_id, expression in workload:
+        if not registry.parse(grammar_id, expression).accepted:
+            rejected += 1
+    elapsed = time.perf_counter() - t0
+    print(f"{requests:,d} cereri pe {len(ids)} gramatici (max {registry.max_resident} rezidente): "
+          f"{elapsed:.2f} s, {requests / elapsed:,.0f} cereri/s, {rejected} respinse")
+    print_stats(registry)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parsare cu gramatică aleasă per apel, din registrul de tabele.")
+    parser.add_argument("expression", nargs='?', help="Expresia de parsat")
+    parser.add_argument("--use", default="expr", help="Id-ul gramaticii folosite pentru expresie")
+    parser.add_argument("--grammar", action='append', default=[], metavar="ID=FIȘIER",
+                        help="Înregistrează o gramatică din text (tema3); se poate repeta")
+    parser.add_argument("--tables", action='append', default=[], metavar="ID=ACTION,PROD",
+                        help="Înregistrează tabele exportate; se poate repeta")
+    parser.add_argument("--max-resident", type=int, default=4, help="Tabele păstrate în memorie")
+    parser.add_argument("--cache-dir", help="Director pentru tabelele construite din gramatici")
+    parser.add_argument("--evaluate", action='store_true', help="Calculează și valoarea (schema de traducere a gramaticii)")
+    parser.add_argument("--bench", type=int, metavar="N", help="N cereri amestecate pe toate gramaticile")
+    args = parser.parse_args()
+
+    registry = default_registry(args.max_resident, args.cache_dir)
+    for spec in args.grammar:
+        grammar_id, _, path = spec.partition('=')
+        with open(path, encoding='utf-8') as fh:
+            registry.register(grammar_id, grammar_text=fh.read())
+    for spec in args.tables:
+        grammar_id, _, paths = spec.partition('=')
+        action_path, _, prod_path = paths.partition(',')
+        registry.register(grammar_id, action_path, prod_path or None)
+
+    if args.bench:
+        bench(registry, args.bench)
+        return
+    if args.expression is None:
+        parser.error("lipsește expresia (sau --bench N)")
+    try:
+        result = registry.parse(args.use, args.expression, args.evaluate)
+    except ValueError as e:
+        print(f"Eroare: {e}", file=sys.stderr)
+        sys.exit(2)
+    if result.accepted:
+        print(f"Acceptat ({args.use})" + (f": {result.value}" if args.evaluate else ""))
+    else:
+        print(f"Respins ({args.use}) la tokenul {result.error_offset}")
+    print_stats(registry)
+
+
+if __name__ == "__main__":
+    main()
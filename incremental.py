@@ -0,0 +1,253 @@
+"""
+incremental.py - Re-parsare incrementală după editări mici în input-uri mari
+
+La fiecare modificare, integrarea cu editorul rula parse_input pe tot bufferul.
+IncrementalParser păstrează de la parsarea anterioară:
+  - lista de tokeni
+  - stiva LR dinaintea fiecărui token (checkpoint). Stiva este o listă
+    înlănțuită persistentă de noduri (stare, părinte), deci checkpoint-urile
+    împart între ele nodurile comune și fiecare costă o singură referință.
+
+După o editare tokens[start:start+old_len] = new_tokens:
+  - prefixul nemodificat nu se mai parsează: se pornește din checkpoint[start]
+    (reducerile făcute cu tokenul `start` ca lookahead sunt refăcute)
+  - după regiunea editată, la fiecare token se compară stiva nouă cu
+    checkpoint-ul vechi al aceluiași token (stare cu stare, până la un nod
+    comun). Când coincid, parserul fiind determinist, restul parsării este
+    identic cu cel vechi: se oprește și se refolosesc rezultatul și
+    checkpoint-urile vechi (ca la Wagner-Graham / tree-sitter, dar la
+    nivel de stivă, nu de subarbori)
+
+Cazul cel mai rău (ex: o paranteză deschisă care schimbă tot restul) rămâne liniar.
+
+Usage:
+  python3 incremental.py --bench 1000000
+"""
+import argparse
+import random
+import time
+from itertools import cycle, islice
+
+from lr_tables import SHIFT, REDUCE, ACCEPT, ENDMARK, load_tables
+
+ACCEPTED = 'accepted'
+REJECTED = 'rejected'
+CONVERGED = 'converged'
+
+
+def same_stack(a, b):
+    """Stivele (stare, părinte) au aceeași secvență de stări? Se oprește la primul nod comun."""
+    while a is not b:
+        if a is None or b is None or a[0] != b[0]:
+            return False
+        a, b = a[1], b[1]
+    return True
+
+
+class IncrementalParser:
+    def __init__(self, tables=None):
+        self.tables = tables if tables is not None else load_tables()
+        self.tokens = []
+        # checkpoints[i] = stiva înainte de tokenul i (i == len(tokens) pentru '$'),
+        # sau None dacă nu se cunoaște (după o eroare, până la regiunea nemodificată)
+        self.checkpoints = [None]
+        # rezultatul parsării continuate dintr-un checkpoint: (de_la_index, accepted, error_offset),
+        # sortat; se aplică intrarea cu cel mai mare de_la_index <= i
+        self.tails = [(0, False, 0)]
+        self.reparsed = 0       # câți tokeni au fost parcurși la ultima operație
+
+    @property
+    def accepted(self):
+        return self.tails[0][1]
+
+    @property
+    def error_offset(self):
+        return self.tails[0][2]
+
+    def parse(self, tokens):
+        """Parsare completă; întoarce True dacă inputul este acceptat."""
+        self.tokens = list(tokens)
+        status, pos, cps = self._run((0, None), 0)
+        cps.extend([None] * (len(self.tokens) + 1 - len(cps)))
+        self.checkpoints = cps
+        self.tails = [self._result(0, status, pos)]
+        return self.accepted
+
+    def edit(self, start, old_len, new_tokens):
+        """Înlocuiește tokens[start:start+old_len] cu new_tokens și re-parsează incremental."""
+        if not 0 <= start <= start + old_len <= len(self.tokens):
+            raise IndexError(f"Editare în afara inputului: {start}+{old_len} > {len(self.tokens)}")
+        new_tokens = list(new_tokens)
+        delta = len(new_tokens) - old_len
+        end_old = start + old_len           # primul token vechi de după editare
+        end_new = start + len(new_tokens)
+        cps = self.checkpoints
+        error = self.error_offset
+        self.tokens[start:end_old] = new_tokens
+
+        if error is not None and start > error:
+            # parsarea se oprește înaintea editării: rezultatul nu se schimbă, dar
+            # checkpoint-urile dintre eroare și editare nu mai au sufixul corect
+            cps[error + 1:end_old] = [None] * (end_new - error - 1)
+            self.tails = self.tails[:1] + self._shift_tails(end_old, delta)
+            self.reparsed = 0
+            return self.accepted
+
+        status, pos, new_cps = self._run(cps[start], start,
+                                         old_cps=cps, delta=delta, converge_from=end_new)
+        if status == CONVERGED:
+            old_pos = pos - delta
+            cps[start:old_pos] = new_cps
+            self.tails = self._shift_tails(old_pos, delta)
+            self.tails[0] = (0,) + self.tails[0][1:]
+        else:
+            # checkpoint-urile vechi de după regiunea editată rămân utilizabile pentru
+            # convergența editărilor următoare (sufixul lor de tokeni nu s-a schimbat)
+            keep_from = max(end_old, pos + 1 - delta)
+            kept = self._shift_tails(keep_from, delta) if keep_from < len(cps) else []
+            gap = keep_from + delta - (start + len(new_cps))
+            cps[start:keep_from] = new_cps + [None] * gap
+            self.tails = [self._result(0, status, pos)] + kept
+        return self.accepted
+
+    def _shift_tails(self, from_index, delta):
+        """Rezultatele checkpoint-urilor vechi >= from_index, în coordonatele noi."""
+        tails = self.tails
+        k = len(tails) - 1
+        while tails[k][0] > from_index:
+            k -= 1
+        _, accepted, offset = tails[k]
+        head = (from_index + delta, accepted, offset if offset is None else offset + delta)
+        return [head] + [(i + delta, acc, off if off is None else off + delta) for i, acc, off in tails[k + 1:]]
+
+    @staticmethod
+    def _result(index, status, pos):
+        accepted = status == ACCEPTED
+        return (index, accepted, None if accepted else pos)
+
+    def _run(self, stack, pos, old_cps=None, delta=0, converge_from=None):
+        """
+        Bucla LR pornind din `stack` la tokenul `pos`.
+        Întoarce (status, poziție, checkpoint-urile noi de la pos încolo).
+        """
+        action, goto, productions = self.tables.action, self.tables.goto, self.tables.productions
+        tokens = self.tokens
+        n = len(tokens)
+        cps = []
+        first = pos
+        check = old_cps is not None
+        while True:
+            if check and pos >= converge_from:
+                old_pos = pos - delta
+                if old_pos < len(old_cps) and same_stack(stack, old_cps[old_pos]):
+                    self.reparsed = pos - first
+                    return CONVERGED, pos, cps
+            cps.append(stack)
+            token = tokens[pos] if pos < n else ENDMARK
+            row = action.get(token)
+            while True:
+                state = stack[0]
+                cell = row[state] if row is not None and state < len(row) else None
+                if cell is None:
+                    self.reparsed = pos - first
+                    return REJECTED, pos, cps
+                kind, arg = cell
+                if kind == SHIFT:
+                    stack = (arg, stack)
+                    pos += 1
+                    break
+                if kind == REDUCE:
+                    lhs, rhs = productions[arg]
+                    for _ in rhs:
+                        stack = stack[1]
+                    g = goto.get(lhs)
+                    state = stack[0]
+                    nxt = g[state] if g is not None and state < len(g) else None
+                    if nxt is None:
+                        self.reparsed = pos - first
+                        return REJECTED, pos, cps
+                    stack = (nxt, stack)
+                elif kind == ACCEPT:
+                    self.reparsed = pos - first
+                    return ACCEPTED, pos, cps
+
+
+def sample_tokens(size_bytes):
+    """Tokeni pentru aproximativ size_bytes de text 'id + id * ( id + id ) * id + ...'."""
+    pattern = ['id', '+', 'id', '*', '(', 'id', '+', 'id', ')', '*', 'id', '+']
+    per_pattern = len(' '.join(pattern)) + 1
+    tokens = list(islice(cycle(pattern), size_bytes // per_pattern * len(pattern)))
+    tokens.append('id')
+    return tokens
+
+
+def bench(size_bytes, edits=200, seed=0):
+    import LRParser2
+
+    rnd = random.Random(seed)
+    tables = load_tables()
+    tokens = sample_tokens(size_bytes)
+    parser = IncrementalParser(tables)
+
+    t0 = time.perf_counter()
+    parser.parse(tokens)
+    t_full = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    LRParser2.parse_tokens(tokens, verbose=False)
+    t_lr2 = time.perf_counter() - t0
+    print(f"{len(tokens):,d} tokeni (~{size_bytes / 2**20:.1f} MB)")
+    print(f"  parsare completă (IncrementalParser): {t_full * 1e3:9.1f} ms")
+    print(f"  parsare completă (LRParser2):         {t_lr2 * 1e3:9.1f} ms")
+
+    operators = [i for i, t in enumerate(tokens) if t in '+*']
+    latencies = []
+    reparsed = 0
+    for k in range(edits):
+        i = rnd.choice(operators)
+        if k % 4 == 3:
+            new = ['+']                      # eroare de sintaxă temporară: 'id' -> '+'
+            i -= 1 if parser.tokens[i - 1] == 'id' else -1
+        else:
+            new = ['*' if parser.tokens[i] == '+' else '+']
+        old = parser.tokens[i]
+        t0 = time.perf_counter()
+        parser.edit(i, 1, new)
+        latencies.append(time.perf_counter() - t0)
+        reparsed += parser.reparsed
+        if new == ['+']:                     # anulăm editarea invalidă
+            t0 = time.perf_counter()
+            parser.edit(i, 1, [old])
+            latencies.append(time.perf_counter() - t0)
+            reparsed += parser.reparsed
+
+    check = IncrementalParser(tables)
+    assert check.parse(parser.tokens) == parser.accepted, "rezultat diferit față de parsarea completă"
+    latencies.sort()
+    mean = sum(latencies) / len(latencies)
+    print(f"  {len(latencies)} editări de un token: medie {mean * 1e3:.3f} ms, "
+          f"p50 {latencies[len(latencies) // 2] * 1e3:.3f} ms, max {latencies[-1] * 1e3:.3f} ms "
+          f"(~{reparsed / len(latencies):.1f} tokeni re-parsați / editare)")
+    print(f"  accelerare medie față de parsarea completă: {t_full / mean:,.0f}x")
+
+    # cazul cel mai rău: '(' la început schimbă stiva pentru tot restul inputului
+    t0 = time.perf_counter()
+    accepted = parser.edit(0, 0, ['('])
+    t_open = time.perf_counter() - t0
+    reparsed = parser.reparsed
+    t0 = time.perf_counter()
+    parser.edit(0, 1, [])
+    t_close = time.perf_counter() - t0
+    print(f"  '(' inserat la început: {t_open * 1e3:.1f} ms ({reparsed:,d} tokeni, accepted: {accepted}), "
+          f"anulare: {t_close * 1e3:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark re-parsare incrementală vs parsare completă.")
+    parser.add_argument("--bench", type=int, default=1_000_000, metavar="BYTES", help="Dimensiunea inputului în bytes")
+    parser.add_argument("--edits", type=int, default=200, help="Număr de editări")
+    args = parser.parse_args()
+    bench(args.bench, args.edits)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+latency.py - Percentile peste latențe măsurate (folosit de benchmark-uri)
+
+Aceeași definiție în bench_suite.py, result_cache.py și clientul de încărcare
+din parse_server.py: elementul de la poziția int(p * n) din lista sortată
+(nearest-rank, fără interpolare), limitat la ultimul element.
+Metrics din parse_server.py folosește o histogramă, nu o listă, deci are
+propria metodă percentile().
+"""
+
+
+def percentile(sorted_values, p):
+    """Percentila p (0..1) dintr-o listă deja sortată și nevidă."""
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
@@ -0,0 +1,131 @@
+"""
+lr_tables.py - Încărcarea tabelelor LR(1) exportate de tema3.py
+
+LRParser2.py și tema4.py lucrează direct pe celulele text din action_table.csv
+('d3', 'r7', 'acc', '4') și fac .startswith() / int() la fiecare pas.
+Aici celulele sunt decodate o singură dată:
+  - ACTION: tuple (SHIFT, stare) / (REDUCE, nr_producție) / (ACCEPT, None) / None
+  - GOTO: stare (int) sau None
+  - producții: nr -> (LHS, RHS ca tuplu)
+Celulele cu conflict exportate de tema3 --glr ('d4|r2') păstrează în ACTION
+prima acțiune (ca tema3 fără --glr); toate acțiunile sunt în Tables.conflicts.
+"""
+import csv
+import hashlib
+from types import MappingProxyType
+
+SHIFT = 'd'
+REDUCE = 'r'
+ACCEPT = 'acc'
+ENDMARK = '$'
+ERROR = 'error'  # terminalul rezervat din producțiile de eroare (tema3.ERROR)
+CONFLICT_SEP = '|'
+
+
+def decode_action_cell(cell):
+    """'d3' -> (SHIFT, 3), 'r7' -> (REDUCE, 7), 'acc' -> (ACCEPT, None), '' -> None"""
+    cell = cell.split(CONFLICT_SEP, 1)[0].strip()
+    if not cell:
+        return None
+    if cell in ('acc', 'accept'):
+        return (ACCEPT, None)
+    kind, arg = cell[0], cell[1:]
+    if kind in (SHIFT, REDUCE) and arg.isdigit():
+        return (kind, int(arg))
+    return None  # ex: 'r?' (reducere fără număr) -> eroare, ca în LRParser2
+
+
+def decode_action_cells(cell):
+    """Toate acțiunile unei celule: 'd4|r2' -> ((SHIFT, 4), (REDUCE, 2)); '' -> ()"""
+    actions = (decode_action_cell(part) for part in cell.split(CONFLICT_SEP))
+    return tuple(a for a in actions if a is not None)
+
+
+def is_goto_row(cells):
+    # rândurile de neterminale conțin doar numere de stare sau celule goale
+    return all(c.strip() == '' or c.strip().isdigit() for c in cells)
+
+
+class Tables:
+    """
+    Tabelele ACTION / GOTO decodate și lista de producții.
+
+    Construit din aceleași dicționare pe care le folosesc LRParser2/tema4
+    (simbol -> listă de celule, nr producție (str) -> [LHS, RHS]).
+
+    Obiectul este imutabil după construcție (rânduri tuple, dicționare read-only,
+    atributele nu pot fi reasignate), deci o singură instanță poate fi folosită
+    simultan din mai multe thread-uri (inclusiv pe CPython free-threaded).
+    Starea unei parsări (stive, contoare) stă separat, per apel.
+    """
+
+    def __init__(self, action_table, prod):
+        productions = {}
+        for num, entry in prod.items():
+            lhs = entry[0]
+            rhs = entry[1].split() if len(entry) > 1 else []
+            productions[int(num)] = (lhs, tuple(rhs))
+        lhs_symbols = {lhs for lhs, _ in productions.values()}
+
+        action = {}
+        goto = {}
+        conflicts = {}
+        for symbol, cells in action_table.items():
+            if symbol in lhs_symbols or (symbol != ENDMARK and is_goto_row(cells)):
+                goto[symbol] = tuple(int(c) if c.strip() else None for c in cells)
+            else:
+                action[symbol] = tuple(decode_action_cell(c) for c in cells)
+                for state, c in enumerate(cells):
+                    if CONFLICT_SEP in c:
+                        conflicts[(state, symbol)] = decode_action_cells(c)
+
+        init = object.__setattr__
+        init(self, 'productions', MappingProxyType(productions))
+        init(self, 'action', MappingProxyType(action))
+        init(self, 'goto', MappingProxyType(goto))
+        init(self, 'conflicts', MappingProxyType(conflicts))
+        init(self, 'num_states', max((len(cells) for cells in action_table.values()), default=0))
+        init(self, 'terminals', tuple(action))
+        init(self, 'nonterminals', tuple(goto))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Tables este imutabil")
+
+    def __delattr__(self, name):
+        raise AttributeError("Tables este imutabil")
+
+    def action_cell(self, state, token):
+        row = self.action.get(token)
+        if row is None or state >= len(row):
+            return None
+        return row[state]
+
+    def goto_state(self, state, lhs):
+        row = self.goto.get(lhs)
+        if row is None or state >= len(row):
+            return None
+        return row[state]
+
+
+def read_csv_table(path):
+    """Citește un CSV simbol-per-rând (action_table.csv sau result.csv) ca dicționar."""
+    table = {}
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        for row in csv.reader(file):
+            if row:
+                table[row[0]] = row[1:]
+    return table
+
+
+def load_tables(action_path='action_table.csv', prod_path='result.csv'):
+    return Tables(read_csv_table(action_path), read_csv_table(prod_path))
+
+
+def tables_hash(action_path='action_table.csv', prod_path='result.csv'):
+    """SHA-256 peste fișierele exportate de tema3 (se schimbă la orice regenerare a tabelelor)."""
+    digest = hashlib.sha256()
+    for path in (action_path, prod_path):
+        with open(path, 'rb') as fh:
+            digest.update(fh.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
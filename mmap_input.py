@@ -0,0 +1,164 @@
+"""
+mmap_input.py - Citirea expresiilor direct din fișiere mapate în memorie (mmap)
+
+LRParser2.parse_input și tema4.parse_and_evaluate primesc un str și apelează
+.split(), deci pentru un fișier de câțiva GB avem în memorie textul, lista de
+tokeni și obiectele str pentru fiecare token.
+
+Aici fișierul este mapat cu mmap și tokenii sunt căutați direct peste bytes
+(re.finditer pe buffer, fără copierea fișierului). Tokenii frecvenți (ex: 'id',
+'+') devin simboluri str partajate (cache de cel mult 256 de intrări); ceilalți
+(ex: nume și numere cu --lexemes) sunt decodați câte unul, pe măsură ce sunt
+consumați. Paginile mapate deja parcurse sunt eliberate din RSS
+(MADV_DONTNEED) la fiecare RELEASE_BYTES, iar codul intermediar este doar
+numărat (sink), deci memoria maximă (peak RSS) nu crește cu dimensiunea
+fișierului nici la validare, nici la evaluare.
+
+Usage:
+  python3 mmap_input.py expresii.txt
+  python3 mmap_input.py expresii.txt --evaluate
+  python3 mmap_input.py nume.txt --evaluate --lexemes
+  python3 mmap_input.py sample.txt --generate 1000000   # scrie un fișier de test
+"""
+import argparse
+import mmap
+import re
+import resource
+import sys
+from contextlib import closing, contextmanager
+
+# un token = o secvență de caractere fără spații (echivalent cu str.split())
+TOKEN_RE = re.compile(rb'\S+')
+
+# cache bytes -> simbol str, ca să nu creăm câte un str nou pentru fiecare token
+_SYMBOLS = {}
+_MAX_SYMBOLS = 256
+
+# după fiecare RELEASE_BYTES parcurși, paginile mapate de dinainte ies din RSS
+RELEASE_BYTES = 1 << 22
+
+
+def _symbol(raw):
+    sym = _SYMBOLS.get(raw)
+    if sym is None:
+        sym = raw.decode('utf-8', 'replace')
+        if len(_SYMBOLS) < _MAX_SYMBOLS:  # nu lăsăm cache-ul să crească la input invalid
+            _SYMBOLS[raw] = sym
+    return sym
+
+
+@contextmanager
+def open_buffer(path):
+    """Mapează fișierul read-only; un fișier gol dă un buffer gol (mmap nu acceptă lungime 0)."""
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b''
+            return
+        try:
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        except (AttributeError, OSError):
+            pass
+        try:
+            yield mm
+        finally:
+            # BufferError aici: un generator de tokeni (iter_tokens) încă ține buffer-ul;
+            # generatorul trebuie închis (.close()) înainte de ieșirea din with
+            mm.close()
+
+
+def _matches(buf):
+    """re.finditer peste buffer; pentru mmap, paginile deja parcurse sunt eliberate din RSS."""
+    release = isinstance(buf, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED')
+    released = 0
+    for m in TOKEN_RE.finditer(buf):
+        start = m.start()
+        if release and start - released >= RELEASE_BYTES:
+            # mapare read-only a unui fișier: paginile se recitesc din page cache dacă e nevoie
+            end = start - start % mmap.PAGESIZE
+            buf.madvise(mmap.MADV_DONTNEED, released, end - released)
+            released = end
+        yield m
+
+
+def iter_tokens(buf):
+    """Generator de simboluri (str) peste un buffer bytes / mmap / memoryview."""
+    for m in _matches(buf):
+        yield _symbol(m.group())
+
+
+def iter_token_offsets(buf):
+    """Ca iter_tokens, dar întoarce (simbol, offset_start, offset_end) pentru fiecare token."""
+    for m in _matches(buf):
+        yield _symbol(m.group()), m.start(), m.end()
+
+
+def parse_file(path, verbose=False):
+    """Validează sintactic conținutul fișierului (LRParser2.parse_tokens)."""
+    import LRParser2
+    with open_buffer(path) as buf, closing(iter_tokens(buf)) as tokens:
+        return LRParser2.parse_tokens(tokens, verbose=verbose)
+
+
+def evaluate_file(path, verbose=False, sink=None, lexemes=False):
+    """
+    Evaluează conținutul fișierului (tema4.evaluate_tokens).
+    sink: funcție line -> None pentru codul intermediar (fără sink codul este
+    păstrat în lista întoarsă, deci memoria crește cu inputul).
+    lexemes: nume și numere citite ca 'id' (vezi tema4.evaluate_tokens).
+    """
+    import tema4
+    with open_buffer(path) as buf, closing(iter_tokens(buf)) as tokens:
+        return tema4.evaluate_tokens(tokens, verbose=verbose, sink=sink, lexemes=lexemes)
+
+
+def write_sample(path, n_terms):
+    """Scrie o expresie 'id + id * id ...' cu n_terms operanzi (pentru teste de memorie)."""
+    ops = ('+', '*')
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write('id')
+        for i in range(1, n_terms):
+            f.write(f' {ops[i % 2]} id')
+            if i % 16 == 0:
+                f.write('\n')
+        f.write('\n')
+
+
+def peak_rss_kb():
+    # pe Linux ru_maxrss este în KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parsează/evaluează expresii dintr-un fișier mapat în memorie.")
+    parser.add_argument("file", help="Fișier cu expresia (tokeni separați prin spații)")
+    parser.add_argument("--evaluate", action='store_true', help="Evaluează cu tema4 în loc de validare LRParser2")
+    parser.add_argument("--lexemes", action='store_true', help="Cu --evaluate: nume și numere citite ca 'id'")
+    parser.add_argument("--verbose", action='store_true', help="Afișează pașii parsării")
+    parser.add_argument("--generate", type=int, metavar="N", help="Scrie în fișier o expresie cu N operanzi și iese")
+    args = parser.parse_args()
+
+    if args.generate:
+        write_sample(args.file, args.generate)
+        print(f"Am scris {args.generate} operanzi în {args.file}")
+        return
+
+    try:
+        if args.evaluate:
+            count = [0]
+
+            def sink(line):
+                count[0] += 1
+            success, result, _ = evaluate_file(args.file, verbose=args.verbose, sink=sink, lexemes=args.lexemes)
+            print(f"Accepted: {success}, result: {result}, instructions: {count[0]}")
+        else:
+            print(f"Accepted: {parse_file(args.file, verbose=args.verbose)}")
+    except FileNotFoundError:
+        print(f"Fișierul '{args.file}' nu a fost găsit.", file=sys.stderr)
+        sys.exit(2)
+    print(f"Peak RSS: {peak_rss_kb()} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+numpy_batch.py - Parsare LR "în lockstep" pentru loturi mari de expresii scurte (NumPy)
+
+Pentru mii de expresii scurte, costul fiecărui pas Python din
+LRParser2.parse_input domină. Aici toate parsările avansează simultan:
+  - tabela ACTION este codificată ca matrice de întregi A[stare, terminal]
+      0 = eroare, v > 0 = shift în starea v-1, v < 0 = reducere cu producția -v, ACC = accept
+  - GOTO este o matrice G[stare, neterminal] (-1 = lipsă)
+  - stivele de stări sunt rândurile unei matrice 2-D, cu câte un pointer (sp) per rând
+  - la fiecare pas: o singură căutare ACTION prin fancy indexing pentru toate rândurile
+    active, apoi rândurile shift / reduce sunt tratate cu măști, iar cele terminate
+    (accept / eroare) sunt scoase din setul activ.
+
+Rezultatele sunt identice cu LRParser2.parse_input (acceptat / respins), plus
+poziția tokenului la care a fost respinsă expresia.
+
+Usage:
+  python3 numpy_batch.py expresii.txt          # o expresie pe linie, afișează index,accepted
+  python3 numpy_batch.py --bench 20000         # expr/s față de LRParser2.parse_input
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from lr_tables import SHIFT, REDUCE, ACCEPT, ENDMARK, load_tables
+
+ACC = np.iinfo(np.int32).max
+
+
+class EncodedTables:
+    """Tabelele din lr_tables.Tables codificate ca matrice NumPy de întregi."""
+
+    def __init__(self, tables):
+        self.terminals = list(tables.terminals)
+        if ENDMARK not in self.terminals:
+            self.terminals.append(ENDMARK)
+        # ultima coloană = token necunoscut (toate celulele sunt eroare)
+        self.term_index = {t: i for i, t in enumerate(self.terminals)}
+        self.unknown = len(self.terminals)
+        self.nonterm_index = {n: i for i, n in enumerate(tables.nonterminals)}
+        n_states = tables.num_states
+
+        self.action = np.zeros((n_states, len(self.terminals) + 1), dtype=np.int32)
+        for t, row in tables.action.items():
+            col = self.term_index[t]
+            for s, cell in enumerate(row):
+                if cell is None:
+                    continue
+                kind, arg = cell
+                if kind == SHIFT:
+                    self.action[s, col] = arg + 1
+                elif kind == REDUCE and arg in tables.productions:
+                    self.action[s, col] = -arg
+                elif kind == ACCEPT:
+                    self.action[s, col] = ACC
+
+        self.goto = np.full((n_states, max(len(self.nonterm_index), 1)), -1, dtype=np.int32)
+        for n, row in tables.goto.items():
+            col = self.nonterm_index[n]
+            for s, dst in enumerate(row):
+                if dst is not None:
+                    self.goto[s, col] = dst
+
+        n_prods = max(tables.productions, default=0) + 1
+        self.prod_len = np.zeros(n_prods, dtype=np.int32)
+        self.prod_lhs = np.zeros(n_prods, dtype=np.int32)
+        for p, (lhs, rhs) in tables.productions.items():
+            self.prod_len[p] = len(rhs)
+            self.prod_lhs[p] = self.nonterm_index.get(lhs, 0)
+
+    def encode_inputs(self, expressions):
+        """Matrice de tokeni (rânduri completate cu '$') și lungimile inputurilor."""
+        split = [e.split() for e in expressions]
+        width = max((len(t) for t in split), default=0) + 1
+        end = self.term_index[ENDMARK]
+        tokens = np.full((len(split), width), end, dtype=np.int32)
+        index, unknown = self.term_index, self.unknown
+        for r, toks in enumerate(split):
+            tokens[r, :len(toks)] = [index.get(t, unknown) for t in toks]
+        return tokens
+
+
+def parse_batch(expressions, enc):
+    """
+    Parsează toate expresiile în lockstep.
+    Întoarce (accepted: array bool, error_pos: array int, -1 pentru acceptate).
+    """
+    tokens = enc.encode_inputs(expressions)
+    n, width = tokens.shape
+    A, G = enc.action, enc.goto
+    prod_len, prod_lhs = enc.prod_len, enc.prod_lhs
+
+    depth = width + 2
+    stack = np.zeros((n, depth), dtype=np.int32)   # stare 0 pe fundul fiecărei stive
+    sp = np.zeros(n, dtype=np.int64)
+    pos = np.zeros(n, dtype=np.int64)
+    accepted = np.zeros(n, dtype=bool)
+    error_pos = np.full(n, -1, dtype=np.int64)
+    active = np.arange(n)
+
+    while active.size:
+        a_sp = sp[active]
+        a_pos = pos[active]
+        act = A[stack[active, a_sp], tokens[active, a_pos]]
+
+        done = act == 0
+        error_pos[active[done]] = a_pos[done]
+        acc = act == ACC
+        accepted[active[acc]] = True
+
+        shift = (act > 0) & ~acc
+        if shift.any():
+            rows = active[shift]
+            new_sp = a_sp[shift] + 1
+            if new_sp.max() >= depth:  # gramatici cu producții vide pot adânci stiva
+                stack = np.pad(stack, ((0, 0), (0, depth)))
+                depth *= 2
+            stack[rows, new_sp] = act[shift] - 1
+            sp[rows] = new_sp
+            pos[rows] = a_pos[shift] + 1
+
+        reduce = act < 0
+        if reduce.any():
+            rows = active[reduce]
+            p = -act[reduce]
+            base_sp = a_sp[reduce] - prod_len[p]
+            target = G[stack[rows, base_sp], prod_lhs[p]]
+            bad = target < 0
+            if bad.any():
+                error_pos[rows[bad]] = a_pos[reduce][bad]
+                done[np.flatnonzero(reduce)[bad]] = True
+            ok = ~bad
+            new_sp = base_sp[ok] + 1
+            if new_sp.size and new_sp.max() >= depth:
+                stack = np.pad(stack, ((0, 0), (0, depth)))
+                depth *= 2
+            stack[rows[ok], new_sp] = target[ok]
+            sp[rows[ok]] = new_sp
+
+        finished = done | acc
+        if finished.any():
+            active = active[~finished]
+    return accepted, error_pos
+
+
+def random_expressions(count, seed=0, max_terms=8):
+    """Expresii scurte aleatoare (valide și invalide) pentru benchmark."""
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(count):
+        parts = ['id']
+        for _ in range(rnd.randint(0, max_terms)):
+            parts += [rnd.choice('+*'), 'id']
+        expr = ' '.join(parts)
+        if rnd.random() < 0.3:
+            expr = f"( {expr} ) * id"
+        if rnd.random() < 0.1:
+            expr += ' +'
+        out.append(expr)
+    return out
+
+
+def bench(count):
+    import LRParser2
+    enc = EncodedTables(load_tables())
+    exprs = random_expressions(count)
+
+    t0 = time.perf_counter()
+    scalar = [LRParser2.parse_input(e, verbose=False) for e in exprs]
+    t_scalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    accepted, _ = parse_batch(exprs, enc)
+    t_vec = time.perf_counter() - t0
+
+    assert accepted.tolist() == scalar, "rezultate diferite față de LRParser2.parse_input"
+    print(f"{count} expresii ({sum(scalar)} acceptate)")
+    print(f"  LRParser2.parse_input: {count / t_scalar:12,.0f} expr/s")
+    print(f"  numpy lockstep:        {count / t_vec:12,.0f} expr/s  (x{t_scalar / t_vec:.1f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parsare LR vectorizată (NumPy) pentru loturi de expresii.")
+    parser.add_argument("file", nargs='?', help="Fișier cu o expresie pe linie")
+    parser.add_argument("--bench", type=int, metavar="N", help="Compară cu LRParser2 pe N expresii aleatoare")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.bench)
+        return
+    if not args.file:
+        parser.error("trebuie dat un fișier sau --bench N")
+    with open(args.file, encoding='utf-8') as f:
+        exprs = [line.rstrip('\n') for line in f]
+    accepted, error_pos = parse_batch(exprs, EncodedTables(load_tables()))
+    out = sys.stdout
+    for i, (ok, err) in enumerate(zip(accepted.tolist(), error_pos.tolist())):
+        out.write(f"{i},{int(ok)},{'' if ok else err}\n")
+
+
+if __name__ == "__main__":
+    main()
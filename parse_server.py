@@ -0,0 +1,381 @@
+"""
+parse_server.py - Server asyncio de parsare / evaluare (socket Unix sau TCP), cu pipelining
+
+În loc de un proces Python nou (și o citire a tabelelor CSV) pentru fiecare
+expresie, serverul încarcă tabelele o singură dată și primește expresii pe
+conexiuni de lungă durată:
+
+  - framing 'line': câte o expresie pe linie, răspunsul este o linie JSON
+  - framing 'length': 4 bytes lungime (big-endian) + expresia UTF-8, la fel răspunsul
+  - pipelining: clientul poate trimite oricâte cereri fără să aștepte; răspunsurile
+    vin în ordinea cererilor. Cererile sosite împreună (același read) formează un
+    lot, trimis unui ProcessPoolExecutor (batch.process_chunk, tabelele sunt
+    încărcate o dată per proces; implicit os.cpu_count() procese). Cu --workers 0
+    loturile sunt parsate în thread-urile executorului implicit al buclei, deci
+    bucla asyncio nu parsează niciodată
+  - cererea '!stats' întoarce contoarele și histograma latențelor (JSON)
+
+Răspuns: {"accepted": true, "value": 7} sau {"accepted": false, "error_offset": 2}
+(value apare doar cu --evaluate). Dacă procesarea unui lot eșuează (ex: un worker
+mort), fiecare cerere din lot primește {"accepted": false, "error": "..."} și
+conexiunea rămâne deschisă.
+
+Clientul de încărcare (--load N) deschide --connections conexiuni, ține câte
+--pipeline cereri în zbor pe fiecare și raportează throughput și p50/p99.
+
+Usage:
+  python3 parse_server.py --unix /tmp/lr.sock --evaluate --workers 2
+  python3 parse_server.py --port 7878 --framing length
+  python3 parse_server.py --unix /tmp/lr.sock --load 100000 --connections 4 --pipeline 64
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import batch
+from latency import percentile
+from lr_tables import load_tables
+
+STATS_REQUEST = b'!stats'
+LENGTH = struct.Struct('>I')
+MAX_FRAME = 16 * 1024 * 1024
+
+
+# ============================================================================
+# Framing
+# ============================================================================
+
+class LineFramer:
+    def __init__(self):
+        self._buffer = b''
+
+    def feed(self, data):
+        """Adaugă bytes primiți; întoarce mesajele complete."""
+        lines = (self._buffer + data).split(b'\n')
+        self._buffer = lines.pop()
+        return [line.rstrip(b'\r') for line in lines]
+
+    @staticmethod
+    def encode(payload):
+        return payload + b'\n'
+
+
+class LengthFramer:
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        buf = self._buffer
+        buf += data
+        messages = []
+        pos = 0
+        while len(buf) - pos >= LENGTH.size:
+            (size,) = LENGTH.unpack_from(buf, pos)
+            if size > MAX_FRAME:
+                raise ValueError(f"Mesaj prea mare: {size} bytes")
+            if len(buf) - pos - LENGTH.size < size:
+                break
+            start = pos + LENGTH.size
+            messages.append(bytes(buf[start:start + size]))
+            pos = start + size
+        del buf[:pos]
+        return messages
+
+    @staticmethod
+    def encode(payload):
+        return LENGTH.pack(len(payload)) + payload
+
+
+FRAMERS = {'line': LineFramer, 'length': LengthFramer}
+
+
+# ============================================================================
+# Metrici
+# ============================================================================
+
+class Metrics:
+    """Contoare și histogramă de latențe cu bucket-uri puteri ale lui 2 (microsecunde)."""
+
+    BUCKETS = 32
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.connections = 0
+        self.requests = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.batches = 0
+        self.failed = 0         # cereri din loturi care au aruncat excepție
+        self.histogram = [0] * self.BUCKETS
+
+    def observe(self, latency, results):
+        micros = max(int(latency * 1e6), 1)
+        bucket = min(micros.bit_length() - 1, self.BUCKETS - 1)
+        self.histogram[bucket] += len(results)
+        self.batches += 1
+        self.requests += len(results)
+        ok = sum(1 for r in results if r.accepted)
+        self.accepted += ok
+        self.rejected += len(results) - ok
+
+    def percentile(self, p):
+        """Limita superioară (us) a bucket-ului care conține percentila p."""
+        target = p * self.requests
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return 2 ** (bucket + 1)
+        return 0
+
+    def snapshot(self):
+        uptime = time.monotonic() - self.started
+        return {
+            'uptime_s': round(uptime, 3),
+            'connections': self.connections,
+            'requests': self.requests,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'failed': self.failed,
+            'batches': self.batches,
+            'requests_per_s': round(self.requests / uptime, 1) if uptime else 0.0,
+            'p50_us': self.percentile(0.5),
+            'p99_us': self.percentile(0.99),
+            'histogram_us': {f"<{2 ** (b + 1)}": c for b, c in enumerate(self.histogram) if c},
+        }
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+class ParseServer:
+    def __init__(self, framing='line', workers=None, evaluate=False, max_batch=1000,
+                 action_path='action_table.csv', prod_path='result.csv'):
+        self.framer_class = FRAMERS[framing]
+        self.evaluate = evaluate
+        self.max_batch = max_batch
+        self.metrics = Metrics()
+        self.tables = load_tables(action_path, prod_path)
+        self.pool = None
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers:
+            # 'spawn': un worker creat prin fork în timpul unei conexiuni ar moșteni
+            # socket-ul ei, iar clientul nu ar mai primi EOF la închiderea conexiunii
+            self.pool = ProcessPoolExecutor(max_workers=workers, initializer=batch.init_worker,
+                                            initargs=(action_path, prod_path, evaluate),
+                                            mp_context=multiprocessing.get_context('spawn'))
+
+    def _parse(self, lines):
+        return [batch.run_one(self.tables, line, self.evaluate, index=i) for i, line in enumerate(lines)]
+
+    def _submit(self, lines):
+        loop = asyncio.get_running_loop()
+        if self.pool is not None:
+            return loop.run_in_executor(self.pool, batch.process_chunk, 0, lines)
+        # fără procese: în executorul implicit (thread-uri), nu în bucla asyncio
+        return loop.run_in_executor(None, self._parse, lines)
+
+    def _response(self, result):
+        if result.accepted:
+            body = {'accepted': True}
+            if self.evaluate:
+                body['value'] = result.value
+        else:
+            body = {'accepted': False, 'error_offset': result.error_offset}
+        return json.dumps(body).encode()
+
+    async def handle(self, reader, writer):
+        self.metrics.connections += 1
+        framer = self.framer_class()
+        pending = asyncio.Queue(maxsize=64)   # loturi în ordinea sosirii (backpressure pe citire)
+        responder = asyncio.create_task(self._respond(pending, writer, framer))
+        try:
+            while True:
+                data = await reader.read(1 << 16)
+                if not data:
+                    break
+                received = time.perf_counter()
+                lines = []
+                for message in framer.feed(data):
+                    if message == STATS_REQUEST:
+                        await self._flush(pending, lines, received)
+                        lines = []
+                        await pending.put(('stats', None, received, 0))
+                    else:
+                        lines.append(message.decode('utf-8', 'replace'))
+                        if len(lines) >= self.max_batch:
+                            await self._flush(pending, lines, received)
+                            lines = []
+                await self._flush(pending, lines, received)
+        except (ConnectionError, ValueError) as e:
+            print(f"conexiune închisă: {e}", file=sys.stderr)
+        finally:
+            await pending.put(None)
+            await responder
+            writer.close()
+            self.metrics.connections -= 1
+
+    async def _flush(self, pending, lines, received):
+        if lines:
+            await pending.put(('batch', self._submit(lines), received, len(lines)))
+
+    async def _respond(self, pending, writer, framer):
+        encode = framer.encode
+        try:
+            while True:
+                item = await pending.get()
+                if item is None:
+                    return
+                kind, future, received, count = item
+                if kind == 'stats':
+                    writer.write(encode(json.dumps(self.metrics.snapshot()).encode()))
+                else:
+                    try:
+                        results = await future
+                    except Exception as e:
+                        # un lot eșuat nu oprește conexiunea: câte un răspuns de eroare per cerere
+                        error = encode(json.dumps({'accepted': False, 'error': f"{type(e).__name__}: {e}"}).encode())
+                        writer.write(error * count)
+                        self.metrics.failed += count
+                    else:
+                        writer.write(b''.join(encode(self._response(r)) for r in results))
+                        self.metrics.observe(time.perf_counter() - received, results)
+                await writer.drain()
+        except ConnectionError:
+            # clientul a închis conexiunea; golim coada ca cititorul să nu rămână blocat
+            while (await pending.get()) is not None:
+                pass
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+async def serve(server, host=None, port=None, unix=None):
+    if unix:
+        if os.path.exists(unix):
+            os.unlink(unix)
+        listener = await asyncio.start_unix_server(server.handle, path=unix)
+    else:
+        listener = await asyncio.start_server(server.handle, host, port)
+    where = unix or f"{host}:{port}"
+    print(f"Ascult pe {where} (framing {server.framer_class.__name__}, workers {server.pool and server.pool._max_workers or 0})",
+          file=sys.stderr)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    async with listener:
+        await stop.wait()
+    if unix:
+        os.unlink(unix)
+
+
+# ============================================================================
+# Client de încărcare
+# ============================================================================
+
+async def _load_connection(connect, framer, expressions, pipeline, latencies):
+    reader, writer = await connect()
+    sent = deque()
+    window = asyncio.Semaphore(pipeline)
+
+    async def send_all():
+        for expr in expressions:
+            await window.acquire()
+            sent.append(time.perf_counter())
+            writer.write(framer.encode(expr.encode()))
+            await writer.drain()
+
+    sender = asyncio.create_task(send_all())
+    received = 0
+    while received < len(expressions):
+        data = await reader.read(1 << 16)
+        if not data:
+            raise ConnectionError("serverul a închis conexiunea")
+        for _ in framer.feed(data):
+            latencies.append(time.perf_counter() - sent.popleft())
+            window.release()
+            received += 1
+    await sender
+    writer.write(framer.encode(STATS_REQUEST))
+    await writer.drain()
+    stats = None
+    while stats is None:
+        data = await reader.read(1 << 16)
+        if not data:
+            raise ConnectionError("serverul a închis conexiunea înainte de statistici")
+        messages = framer.feed(data)
+        if messages:
+            stats = json.loads(messages[0])
+    writer.close()
+    return stats
+
+
+async def run_load(connect, framing, requests, connections, pipeline, seed=0):
+    from numpy_batch import random_expressions
+
+    expressions = random_expressions(requests, seed=seed)
+    per_connection = [expressions[i::connections] for i in range(connections)]
+    latencies = []
+    t0 = time.perf_counter()
+    stats = await asyncio.gather(*(_load_connection(connect, FRAMERS[framing](), exprs, pipeline, latencies)
+                                   for exprs in per_connection if exprs))
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    print(f"{len(latencies):,d} cereri, {connections} conexiuni, pipeline {pipeline}: "
+          f"{len(latencies) / elapsed:,.0f} req/s")
+    print(f"  latență client: p50 {percentile(latencies, 0.5) * 1e6:,.0f} us, "
+          f"p99 {percentile(latencies, 0.99) * 1e6:,.0f} us, max {latencies[-1] * 1e6:,.0f} us")
+    server = max(stats, key=lambda s: s['requests'])
+    print(f"  server: {server['requests']:,d} cereri în {server['batches']:,d} loturi, "
+          f"p50 < {server['p50_us']} us, p99 < {server['p99_us']} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server asyncio de parsare/evaluare cu pipelining.")
+    parser.add_argument("--unix", help="Cale socket Unix")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--framing", choices=sorted(FRAMERS), default="line")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Procese pentru loturi (implicit os.cpu_count(); 0 = thread-uri în procesul serverului)")
+    parser.add_argument("--evaluate", action='store_true', help="Întoarce și valoarea (tema4)")
+    parser.add_argument("--max-batch", type=int, default=1000, help="Cereri maxime per lot")
+    parser.add_argument("--action", default="action_table.csv")
+    parser.add_argument("--prod", default="result.csv")
+    parser.add_argument("--load", type=int, metavar="N", help="Mod client: trimite N cereri serverului")
+    parser.add_argument("--connections", type=int, default=4, help="Conexiuni (mod client)")
+    parser.add_argument("--pipeline", type=int, default=64, help="Cereri în zbor per conexiune (mod client)")
+    args = parser.parse_args()
+
+    if args.load:
+        if args.unix:
+            def connect():
+                return asyncio.open_unix_connection(args.unix)
+        else:
+            def connect():
+                return asyncio.open_connection(args.host, args.port)
+        asyncio.run(run_load(connect, args.framing, args.load, args.connections, args.pipeline))
+        return
+
+    server = ParseServer(args.framing, args.workers, args.evaluate, args.max_batch, args.action, args.prod)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+    finally:
+        server.close()
+    print(json.dumps(server.metrics.snapshot()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+parse_tree.py - Arbore de parsare compact (arena struct-of-arrays) pentru runtime-ul LR
+
+tema4 calculează valorile direct pe stiva de atribute și nu păstrează arborele,
+deci orice prelucrare structurală (afișare, rescriere, refolosire) înseamnă o
+nouă parsare. build_tree construiește arborele în timpul parsării LR, dar fără
+câte un obiect Python per nod. Nodurile stau în array-uri paralele:
+
+    kind[i]         producția (>= 1) sau -(index terminal + 1) pentru frunze
+    first_child[i]  poziția primului copil în array-ul `children`
+    child_count[i]  câți copii are nodul
+    token_offset[i] offset-ul primului token acoperit de nod
+
+Copiii unui nod sunt contigui în `children` (se adaugă la reducere, toți odată).
+Node este doar o vedere (__slots__: arbore + index) creată la cerere.
+
+Cu collapse_units=True (implicit) reducerile A -> B nu creează noduri noi, iar
+nodul lui B este folosit direct (AST mai mic; E -> T -> F -> id devine frunza id).
+
+Usage:
+  python3 parse_tree.py "( id + id ) * id"
+  python3 parse_tree.py --bench 1000000
+"""
+import argparse
+import time
+from array import array
+from itertools import chain, cycle, islice
+
+from lr_tables import SHIFT, REDUCE, ENDMARK, load_tables
+
+
+class ParseTree:
+    def __init__(self, tables):
+        self.tables = tables
+        self.terminals = list(tables.terminals)
+        self.kind = array('h')
+        self.first_child = array('I')
+        self.child_count = array('H')
+        self.token_offset = array('I')
+        self.children = array('I')
+        self.root = None
+
+    def _add(self, kind, first, count, offset):
+        self.kind.append(kind)
+        self.first_child.append(first)
+        self.child_count.append(count)
+        self.token_offset.append(offset)
+        return len(self.kind) - 1
+
+    def __len__(self):
+        return len(self.kind)
+
+    def node(self, index):
+        return Node(self, index)
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in
+                   (self.kind, self.first_child, self.child_count, self.token_offset, self.children))
+
+    def pretty(self):
+        """Liniile arborelui, indentate (iterativ, fără recursivitate)."""
+        lines = []
+        stack = [(self.root, 0)] if self.root is not None else []
+        while stack:
+            index, depth = stack.pop()
+            node = Node(self, index)
+            lines.append('  ' * depth + node.label())
+            kids = node.child_indices()
+            stack.extend((k, depth + 1) for k in reversed(kids))
+        return lines
+
+
+class Node:
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def kind(self):
+        return self.tree.kind[self.index]
+
+    @property
+    def is_leaf(self):
+        return self.kind < 0
+
+    @property
+    def symbol(self):
+        """Terminalul (pentru frunze) sau LHS-ul producției."""
+        k = self.kind
+        if k < 0:
+            return self.tree.terminals[-k - 1]
+        return self.tree.tables.productions[k][0]
+
+    @property
+    def production(self):
+        k = self.kind
+        return None if k < 0 else k
+
+    @property
+    def token_offset(self):
+        return self.tree.token_offset[self.index]
+
+    def child_indices(self):
+        t = self.tree
+        first = t.first_child[self.index]
+        return t.children[first:first + t.child_count[self.index]].tolist()
+
+    @property
+    def children(self):
+        return [Node(self.tree, k) for k in self.child_indices()]
+
+    def label(self):
+        if self.is_leaf:
+            return f"{self.symbol} @{self.token_offset}"
+        lhs, rhs = self.tree.tables.productions[self.kind]
+        return f"{lhs} -> {' '.join(rhs) or 'ε'}"
+
+    def __repr__(self):
+        return f"Node({self.index}: {self.label()})"
+
+
+def build_tree(tokens, tables=None, collapse_units=True):
+    """
+    Parsează tokenii (orice iterabil) și întoarce un ParseTree.
+    Ridică ValueError cu offset-ul tokenului la care inputul este respins, sau
+    cu numărul producției dacă tabela ACTION cere o reducere cu o producție
+    care lipsește din tabela de producții.
+    """
+    if tables is None:
+        tables = load_tables()
+    tree = ParseTree(tables)
+    term_index = {t: i for i, t in enumerate(tree.terminals)}
+    action, goto, productions = tables.action, tables.goto, tables.productions
+    add, children = tree._add, tree.children
+
+    states = [0]
+    nodes = [None]
+    offset = 0
+    it = chain(tokens, (ENDMARK,))
+    token = next(it)
+    while True:
+        row = action.get(token)
+        state = states[-1]
+        cell = row[state] if row is not None and state < len(row) else None
+        if cell is None:
+            raise ValueError(f"Input respins la tokenul {offset} ({token!r})")
+        kind, arg = cell
+        if kind == SHIFT:
+            states.append(arg)
+            nodes.append(add(-term_index[token] - 1, 0, 0, offset))
+            offset += 1
+            token = next(it)
+        elif kind == REDUCE:
+            entry = productions.get(arg)
+            if entry is None:
+                raise ValueError(f"Producția {arg} (reducere la tokenul {offset}, {token!r}) "
+                                 f"nu există în tabela de producții")
+            lhs, rhs = entry
+            n = len(rhs)
+            if n == 1 and collapse_units:
+                del states[-1]
+                node = nodes.pop()
+            elif n:
+                kids = nodes[-n:]
+                del states[-n:]
+                del nodes[-n:]
+                first = len(children)
+                children.extend(kids)
+                node = add(arg, first, n, tree.token_offset[kids[0]])
+            else:
+                node = add(arg, len(children), 0, offset)
+            g = goto.get(lhs)
+            top = states[-1]
+            nxt = g[top] if g is not None and top < len(g) else None
+            if nxt is None:
+                raise ValueError(f"Input respins la tokenul {offset} ({token!r})")
+            states.append(nxt)
+            nodes.append(node)
+        else:
+            tree.root = nodes[-1]
+            return tree
+
+
+def generated_tokens(count):
+    """~count tokeni: 'id + id * ( id + id ) * id + ...' (generat leneș)."""
+    pattern = ['id', '+', 'id', '*', '(', 'id', '+', 'id', ')', '*']
+    body = islice(cycle(pattern), max(count - 1, 0) // len(pattern) * len(pattern))
+    return chain(body, ['id'])
+
+
+def bench(count):
+    tables = load_tables()
+    for collapse in (True, False):
+        t0 = time.perf_counter()
+        tree = build_tree(generated_tokens(count), tables, collapse_units=collapse)
+        elapsed = time.perf_counter() - t0
+        label = 'AST (fără unit)' if collapse else 'arbore complet '
+        print(f"  {label}: {len(tree):10,d} noduri, {tree.nbytes() / 2**20:8.1f} MB "
+              f"({tree.nbytes() / max(len(tree), 1):.1f} B/nod), {elapsed:6.2f} s")
+        del tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construiește arborele de parsare compact.")
+    parser.add_argument("expression", nargs='?', help="Expresie de afișat ca arbore")
+    parser.add_argument("--full", action='store_true', help="Păstrează și reducerile unitare (A -> B)")
+    parser.add_argument("--bench", type=int, metavar="N", help="Construiește arbori pentru ~N tokeni")
+    args = parser.parse_args()
+
+    if args.bench:
+        print(f"~{args.bench:,d} tokeni")
+        bench(args.bench)
+        return
+    if not args.expression:
+        parser.error("trebuie dată o expresie sau --bench N")
+    tree = build_tree(args.expression.split(), collapse_units=not args.full)
+    print('\n'.join(tree.pretty()))
+
+
+if __name__ == "__main__":
+    main()
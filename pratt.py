@@ -0,0 +1,317 @@
+"""
+pratt.py - Evaluator cu precedența operatorilor pentru gramaticile de expresii (drum rapid peste tema4)
+
+Pentru gramatica E/T/F, parserul LR face pentru fiecare operand trei reduceri
+unitare (F -> id, T -> F, E -> T), fiecare cu o căutare ACTION și una GOTO.
+Dacă tema3.operator_precedence recunoaște gramatica din tabele ca gramatică de
+operatori binari pe niveluri, expresia este evaluată prin precedence climbing
+iterativ (o stivă de operanzi și una de operatori, fără recursie, deci și
+parantezele adânci funcționează): fiecare operand este un singur pas.
+
+Rezultatele sunt aceleași ca la tema4.parse_and_evaluate / evaluate_tokens:
+  - aceeași schemă de traducere (translation.TranslationScheme): acțiunile
+    producțiilor binare și ale grupărilor sunt apelate cu [stânga, op, dreapta]
+    / [deschidere, valoare, închidere], în aceeași ordine ca reducerile LR
+  - aceleași valori pentru 'id' (TranslationContext); nume / numere pentru 'id'
+    doar cu lexemes=True, ca în tema4
+Se folosește parserul LR (tema4) dacă:
+  - gramatica nu este de operatori, sau schema are acțiuni pe producțiile
+    unitare (ordinea lor nu s-ar păstra)
+  - verbose=True (pașii afișați sunt cei ai parserului LR) sau se dă un sink
+  - se dă profile (table_profile.TableProfile numără celulele tabelelor LR,
+    pe care drumul rapid nu le folosește)
+  - inputul este respins: parsarea se reia cu LR, deci codul parțial și
+    mesajele sunt exact cele din tema4
+
+Usage:
+  python3 pratt.py "id + id * id"
+  python3 pratt.py --check 20000
+  python3 pratt.py --bench
+"""
+import argparse
+import random
+import time
+import weakref
+
+import tema3
+import tema4
+from tema4 import ID_LEXEME_RE, TranslationContext
+from translation import NOOP, COPY, CALL, TranslationScheme
+
+
+def grammar_from_tables(tables):
+    """Gramatica (LHS -> liste RHS, în ordinea producțiilor) reconstruită din result.csv."""
+    G = {}
+    for num in sorted(tables.productions):
+        lhs, rhs = tables.productions[num]
+        G.setdefault(lhs, []).append(list(rhs))
+    return G
+
+
+class PrattEvaluator:
+    def __init__(self, tables, scheme):
+        spec = tema3.operator_precedence(grammar_from_tables(tables))
+        if spec is None:
+            raise ValueError("Gramatica din tabele nu este o gramatică de operatori")
+        compiled = scheme.compile(tables)
+        number = {entry: num for num, entry in tables.productions.items()}
+        levels = spec['levels']
+        for upper, lower in zip([spec['start']] + levels, levels):
+            if upper != lower and compiled[number[(upper, (lower,))]][3] != NOOP:
+                raise ValueError(f"Producția {upper} -> {lower} are o acțiune semantică")
+        primary = levels[-1]
+        for atom in spec['atoms']:
+            if compiled[number[(primary, (atom,))]][3] != NOOP:
+                raise ValueError(f"Producția {primary} -> {atom} are o acțiune semantică")
+
+        # op -> (precedență, asociativ la dreapta, tip acțiune, argument)
+        self.binary = {}
+        for level, lhs in enumerate(levels[:-1], start=1):
+            lower = levels[level]
+            for op, (prec, assoc) in spec['operators'].items():
+                if prec != level:
+                    continue
+                rhs = (lhs, op, lower) if assoc == 'left' else (lower, op, lhs)
+                _, _, _, kind, arg, _ = compiled[number[(lhs, rhs)]]
+                self.binary[op] = (prec, assoc == 'right', kind, arg)
+        # deschidere -> (închidere, tip acțiune, argument)
+        self.groups = {}
+        for open_, close in spec['groups']:
+            _, _, _, kind, arg, _ = compiled[number[(primary, (open_, spec['top'], close))]]
+            self.groups[open_] = (close, kind, arg)
+        self.closers = {close for close, _, _ in self.groups.values()}
+        self.atoms = frozenset(spec['atoms'])
+        # simbolurile gramaticii nu sunt niciodată lexeme pentru 'id'
+        self.symbols = frozenset(tables.action) | frozenset(tables.goto)
+        # doar hook-urile schemei (nu schema): cache-ul _evaluators o referă slab
+        self.start, self.leaf, self.result = scheme.start, scheme.leaf, scheme.result
+        self.spec = spec
+
+    def evaluate(self, tokens, lexemes=False):
+        """(True, rezultat, cod) sau None dacă inputul nu este acceptat (apelantul trece la LR)."""
+        binary, groups, closers, atoms, symbols = self.binary, self.groups, self.closers, self.atoms, self.symbols
+        leaf = self.leaf
+        ctx = TranslationContext(False, None)
+        if self.start is not None:
+            self.start(ctx)
+        get_id_value = ctx.get_id_value
+        values = []
+        ops = []           # operatori binari și paranteze deschise
+        operand = True     # se așteaptă un operand (atom sau deschidere)
+
+        def reduce():
+            op = ops.pop()
+            right = values.pop()
+            left = values[-1]
+            _, _, kind, arg = binary[op]
+            if kind == CALL:
+                values[-1] = arg(ctx, [left, op, right])
+            elif kind == COPY:
+                values[-1] = (left, op, right)[arg]
+
+        for token in tokens:
+            if operand:
+                lexeme = None
+                if lexemes and token not in symbols and ID_LEXEME_RE.match(token):
+                    lexeme, token = token, 'id'
+                if token in atoms:
+                    if token == 'id':
+                        value = get_id_value(token, lexeme)
+                        values.append(value if leaf is None else leaf(ctx, lexeme, value))
+                    else:
+                        values.append(token)
+                    operand = False
+                elif token in groups:
+                    ops.append(token)
+                else:
+                    return None
+            elif token in binary:
+                prec, right_assoc, _, _ = binary[token]
+                while ops and ops[-1] in binary:
+                    top = binary[ops[-1]][0]
+                    if top > prec or (top == prec and not right_assoc):
+                        reduce()
+                    else:
+                        break
+                ops.append(token)
+                operand = True
+            elif token in closers:
+                while ops and ops[-1] in binary:
+                    reduce()
+                if not ops or groups[ops[-1]][0] != token:
+                    return None
+                opener = ops.pop()
+                _, kind, arg = groups[opener]
+                if kind == CALL:
+                    values[-1] = arg(ctx, [opener, values[-1], token])
+                elif kind == COPY:
+                    values[-1] = (opener, values[-1], token)[arg]
+            else:
+                return None
+
+        if operand:
+            return None
+        while ops:
+            if ops[-1] not in binary:
+                return None
+            reduce()
+        result = values[-1]
+        if self.result is not None:
+            result = self.result(ctx, result)
+        return True, result, ctx.intermediate_code
+
+
+# Tables -> schemă -> PrattEvaluator / None; referințe slabe pe ambele niveluri,
+# deci tabelele evictate (grammar_registry) și schemele temporare nu rămân în cache
+_evaluators = weakref.WeakKeyDictionary()
+
+
+def evaluator_for(tables, scheme):
+    """PrattEvaluator pentru (tabele, schemă), sau None dacă trebuie folosit LR (rezultat memorat)."""
+    by_scheme = _evaluators.get(tables)
+    if by_scheme is None:
+        by_scheme = _evaluators[tables] = weakref.WeakKeyDictionary()
+    if scheme not in by_scheme:
+        try:
+            by_scheme[scheme] = PrattEvaluator(tables, scheme)
+        except ValueError:
+            by_scheme[scheme] = None
+    return by_scheme[scheme]
+
+
+def evaluate_tokens(tokens, verbose=True, tables=None, scheme=None, sink=None, profile=None, lexemes=False):
+    """Aceeași interfață și aceleași rezultate ca tema4.evaluate_tokens."""
+    if tables is None:
+        tables = tema4.TABLES
+    if scheme is None:
+        scheme = tema4.ARITHMETIC_SCHEME
+    if not verbose and sink is None and profile is None:
+        evaluator = evaluator_for(tables, scheme)
+        if evaluator is not None:
+            tokens = tokens if isinstance(tokens, (list, tuple)) else list(tokens)
+            result = evaluator.evaluate(tokens, lexemes)
+            if result is not None:
+                return result
+    return tema4.evaluate_tokens(tokens, verbose=verbose, tables=tables, scheme=scheme, sink=sink,
+                                 profile=profile, lexemes=lexemes)
+
+
+def parse_and_evaluate(input_string, verbose=True, optimize=False, compact=False, sink=None, profile=None,
+                       lexemes=False):
+    """Aceeași interfață și aceleași rezultate ca tema4.parse_and_evaluate."""
+    if optimize and compact:
+        raise ValueError("optimize și compact nu pot fi folosite împreună")
+    scheme = tema4.OPTIMIZING_SCHEME if optimize else tema4.COMPACT_SCHEME if compact else None
+    return evaluate_tokens(input_string.split(), verbose=verbose, scheme=scheme, sink=sink, profile=profile,
+                           lexemes=lexemes)
+
+
+# ============================================================================
+# Test diferențial și benchmark
+# ============================================================================
+
+def _with_lexemes(tokens, rnd):
+    """Înlocuiește o parte din 'id' cu nume de variabile și constante (acceptate cu lexemes=True)."""
+    return [rnd.choice(('x', 'y', 'total_1', '3', '2.5')) if t == 'id' and rnd.random() < 0.3 else t
+            for t in tokens]
+
+
+def differential_check(count, seed=0):
+    """Compară pratt cu tema4 pe propoziții valide și mutate; întoarce numărul de diferențe."""
+    from sentence_gen import SentenceGenerator
+
+    rnd = random.Random(seed)
+    gen = SentenceGenerator()
+    # fără lexemes, numele din text trebuie respinse la fel de ambele parsere
+    modes = [{}, {'lexemes': True}, {'optimize': True, 'lexemes': True}, {'compact': True, 'lexemes': True}]
+    differences = 0
+    fast = 0
+    for tokens, _ in gen.sentences(count, (1, 60), seed=seed, invalid=0.3, mutations=2):
+        text = ' '.join(_with_lexemes(tokens, rnd))
+        for mode in modes:
+            expected = tema4.parse_and_evaluate(text, verbose=False, **mode)
+            got = parse_and_evaluate(text, verbose=False, **mode)
+            if (expected[0], expected[1], list(expected[2])) != (got[0], got[1], list(got[2])):
+                differences += 1
+                if differences <= 5:
+                    print(f"DIFERENȚĂ {mode}: {text!r}\n  tema4: {expected}\n  pratt: {got}")
+        fast += evaluator_for(tema4.TABLES, tema4.ARITHMETIC_SCHEME).evaluate(text.split(), True) is not None
+    print(f"gramatica E/T/F: {count:,d} expresii x {len(modes)} scheme, {differences} diferențe "
+          f"({fast:,d} acceptate pe drumul rapid)")
+
+    # alte gramatici de operatori (precedențe, asociativitate la dreapta), cu schema implicită
+    from glr import build_tables
+    from grammar_registry import DIALECTS
+
+    for name, text in DIALECTS.items():
+        tables = build_tables(text)
+        scheme = TranslationScheme()
+        if evaluator_for(tables, scheme) is None:
+            print(f"{name}: nu este gramatică de operatori (LR)")
+            continue
+        dialect = SentenceGenerator(text)
+        diff = 0
+        for tokens, _ in dialect.sentences(count // 4, (1, 40), seed=seed, invalid=0.3):
+            expected = tema4.evaluate_tokens(tokens, verbose=False, tables=tables, scheme=scheme)
+            got = evaluate_tokens(tokens, verbose=False, tables=tables, scheme=scheme)
+            diff += (expected[0], expected[1], list(expected[2])) != (got[0], got[1], list(got[2]))
+        differences += diff
+        print(f"{name}: {count // 4:,d} expresii, {diff} diferențe")
+    return differences
+
+
+def bench(seed=0):
+    from sentence_gen import SentenceGenerator
+
+    gen = SentenceGenerator()
+    cases = [
+        ('expresii scurte (3-60 tokeni)', [' '.join(t) for t, _ in gen.sentences(20_000, (3, 60), seed=seed)]),
+        # constanta 1 în loc de 'id' (lexemes=True): altfel produsele lungi ar calcula numere uriașe
+        ('o expresie de ~1M tokeni', [' '.join(gen.sentence(seed, 0, 1_000_000)).replace('id', '1')]),
+    ]
+    for name, lines in cases:
+        tokens = sum(len(line.split()) for line in lines)
+        print(f"{name}: {len(lines):,d} expresii, {tokens:,d} tokeni")
+        for label, fn in (('tema4 (LR)', tema4.parse_and_evaluate), ('pratt', parse_and_evaluate)):
+            t0 = time.perf_counter()
+            for line in lines:
+                fn(line, verbose=False, lexemes=True)
+            elapsed = time.perf_counter() - t0
+            if label == 'tema4 (LR)':
+                base = elapsed
+            print(f"  {label:<11} {elapsed:7.3f} s  {tokens / elapsed:12,.0f} tokeni/s  ({base / elapsed:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluator cu precedența operatorilor, cu fallback pe tema4 (LR).")
+    parser.add_argument("expression", nargs='?', help="Expresia de evaluat")
+    parser.add_argument("--optimize", action='store_true', help="Cod generat prin value numbering")
+    parser.add_argument("--lexemes", action='store_true', help="Acceptă nume de variabile și numere pentru 'id'")
+    parser.add_argument("--check", type=int, metavar="N", help="Test diferențial pratt vs tema4 pe N expresii")
+    parser.add_argument("--bench", action='store_true', help="Throughput pratt vs tema4")
+    args = parser.parse_args()
+
+    if args.check:
+        raise SystemExit(1 if differential_check(args.check) else 0)
+    if args.bench:
+        bench()
+        return
+    if args.expression is None:
+        parser.error("lipsește expresia (sau --check / --bench)")
+    evaluator = evaluator_for(tema4.TABLES, tema4.ARITHMETIC_SCHEME)
+    if evaluator is not None:
+        ops = ', '.join(f"{op} ({prec}, {'dreapta' if right else 'stânga'})"
+                        for op, (prec, right, _, _) in evaluator.binary.items())
+        print(f"Operatori: {ops}")
+    success, result, code = parse_and_evaluate(args.expression, verbose=False, optimize=args.optimize,
+                                               lexemes=args.lexemes)
+    if success:
+        print(f"Rezultat: {result}")
+        for line in code:
+            print(f"  {line}")
+    else:
+        print("Input respins")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+push_parser.py - Parser LR incremental (push / pull) cu suspendare și reluare
+
+LRParser2.parse_input și tema4.parse_and_evaluate cer tot inputul de la început.
+PushParser primește tokenii pe bucăți:
+
+    p = PushParser()
+    p.feed("id + i")       # bucăți de text (un token poate fi tăiat între bucăți)
+    p.feed("d * id")
+    p.feed(['+', 'id'])    # sau liste / iteratoare de tokeni
+    p.finish()             # trimite '$' -> p.status == 'accepted' / 'rejected'
+
+Bucățile bytes sunt decodate incremental (UTF-8), deci un caracter multibyte
+poate fi și el tăiat între bucăți. Restul de token rămas din text este trimis
+înaintea unei bucăți care este deja o listă de tokeni.
+
+Se poate consuma și un iterator (consume) sau un iterator async (consume_async).
+Parserul nu păstrează tokenii deja citiți: memoria este dată de adâncimea stivei.
+
+Cu o schemă de traducere (translation.TranslationScheme, ex:
+tema4.ARITHMETIC_SCHEME) parserul și evaluează: reducerile sunt executate din
+lista compilată scheme.compile(tables), cu aceeași dispecerizare NOOP / COPY /
+CALL / EMPTY ca tema4.evaluate_tokens, iar starea traducerii (contoare, cod)
+stă într-un translation.TranslationContext. Orice gramatică generată de tema3
+merge cu o schemă potrivită; o schemă strictă refuză tabelele pe care nu le acoperă.
+
+Starea se poate salva cu snapshot() (un dicționar simplu, serializabil JSON cât
+timp atributele sunt numere, ca la ARITHMETIC_SCHEME) și se poate relua cu
+PushParser.restore(snapshot) - util pentru stream-uri lungi (socket, pipe) care
+trebuie checkpoint-uite.
+
+Usage:
+  cat expresie.txt | python3 push_parser.py
+  cat expresie.txt | python3 push_parser.py --evaluate
+"""
+import argparse
+import codecs
+import json
+import sys
+
+from lr_tables import SHIFT, REDUCE, ACCEPT, ENDMARK, load_tables
+from translation import TranslationContext, NOOP, COPY, EMPTY
+
+RUNNING = 'running'
+ACCEPTED = 'accepted'
+REJECTED = 'rejected'
+
+
+class PushParser:
+    def __init__(self, tables=None, scheme=None, sink=None):
+        """
+        scheme: translation.TranslationScheme; None => doar validare sintactică.
+        sink: funcție line -> None pentru codul intermediar (altfel păstrat în self.code).
+        """
+        self.tables = tables if tables is not None else load_tables()
+        self.scheme = scheme
+        self.context = None
+        self._actions = None
+        if scheme is not None:
+            self._actions = scheme.compile(self.tables)   # ValueError dacă schema nu se potrivește
+            self.context = TranslationContext(False, sink)
+            if scheme.start is not None:
+                scheme.start(self.context)
+        self.state_stack = [0]
+        self.attribute_stack = [None]
+        self.offset = 0        # câți tokeni au fost consumați
+        self.status = RUNNING
+        self.result = None
+        self.error = None      # (offset, token) la respingere
+        self._pending = ''     # rest de token rămas la finalul unei bucăți de text
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+
+    @property
+    def code(self):
+        """Codul intermediar generat până acum (gol fără schemă sau cu sink)."""
+        return self.context.intermediate_code if self.context is not None else []
+
+    # ----------------- push API -----------------
+    def feed(self, chunk):
+        """Primește o bucată de text (str/bytes) sau un iterabil de tokeni. Întoarce statusul."""
+        if isinstance(chunk, (bytes, bytearray)):
+            # un caracter multibyte tăiat între bucăți rămâne în decoder
+            chunk = self._decoder.decode(chunk)
+        if isinstance(chunk, str):
+            text = self._pending + chunk
+            tokens = text.split()
+            # dacă bucata nu se termină cu spațiu, ultimul token poate continua în bucata următoare
+            if tokens and not text[-1].isspace():
+                self._pending = tokens.pop()
+            else:
+                self._pending = ''
+            chunk = tokens
+        elif self._pending:
+            # bucățile de tokeni nu continuă textul: restul lui este un token complet
+            token, self._pending = self._pending, ''
+            if self.status == RUNNING:
+                self._push_token(token)
+        for token in chunk:
+            if self.status != RUNNING:
+                break
+            self._push_token(token)
+        return self.status
+
+    def finish(self):
+        """Marchează sfârșitul inputului (trimite '$'). Întoarce statusul final."""
+        # ridică UnicodeDecodeError dacă inputul se termină în mijlocul unui caracter
+        self._pending += self._decoder.decode(b'', final=True)
+        if self._pending and self.status == RUNNING:
+            token, self._pending = self._pending, ''
+            self._push_token(token)
+        if self.status == RUNNING:
+            self._push_token(ENDMARK)
+        return self.status
+
+    # ----------------- pull API -----------------
+    def consume(self, iterable):
+        """Consumă un iterator (de bucăți de text sau de tokeni) și apoi finish()."""
+        for chunk in iterable:
+            if self.feed(chunk) != RUNNING:
+                break
+        return self.finish()
+
+    async def consume_async(self, aiterable):
+        """Ca consume(), pentru un iterator async (ex: citiri dintr-un asyncio.StreamReader)."""
+        async for chunk in aiterable:
+            if self.feed(chunk) != RUNNING:
+                break
+        return self.finish()
+
+    # ----------------- checkpoint -----------------
+    def snapshot(self):
+        return {
+            'state_stack': list(self.state_stack),
+            'attribute_stack': list(self.attribute_stack),
+            'offset': self.offset,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'pending': self._pending,
+            'pending_bytes': list(self._decoder.getstate()[0]),
+            'context': self._context_state(),
+        }
+
+    def _context_state(self):
+        ctx = self.context
+        if ctx is None:
+            return None
+        return {'id_counter': ctx.id_counter, 'temp_counter': ctx.temp_counter,
+                'names': dict(ctx.names), 'code': list(ctx.intermediate_code)}
+
+    @classmethod
+    def restore(cls, snapshot, tables=None, scheme=None, sink=None):
+        parser = cls(tables, scheme, sink)
+        parser.state_stack = list(snapshot['state_stack'])
+        parser.attribute_stack = list(snapshot['attribute_stack'])
+        parser.offset = snapshot['offset']
+        parser.status = snapshot['status']
+        parser.result = snapshot['result']
+        parser.error = tuple(snapshot['error']) if snapshot['error'] else None
+        parser._pending = snapshot['pending']
+        parser._decoder.setstate((bytes(snapshot.get('pending_bytes', ())), 0))
+        state = snapshot.get('context')
+        if parser.context is not None and state is not None:
+            ctx = parser.context
+            ctx.id_counter = state['id_counter']
+            ctx.temp_counter = state['temp_counter']
+            ctx.names = dict(state['names'])
+            ctx.intermediate_code[:] = state['code']
+        return parser
+
+    # ----------------- motorul LR -----------------
+    def _reject(self, token):
+        self.status = REJECTED
+        self.error = (self.offset, token)
+
+    def _push_token(self, token):
+        row = self.tables.action.get(token)
+        productions = self.tables.productions
+        goto = self.tables.goto
+        states = self.state_stack
+        attrs = self.attribute_stack
+        actions = self._actions
+        ctx = self.context
+        while True:
+            state = states[-1]
+            cell = row[state] if row is not None and state < len(row) else None
+            if cell is None:
+                self._reject(token)
+                return
+            kind, arg = cell
+            if kind == SHIFT:
+                states.append(arg)
+                if ctx is None:
+                    attrs.append(None)
+                elif token == 'id':
+                    value = ctx.get_id_value(token)
+                    leaf = self.scheme.leaf
+                    attrs.append(value if leaf is None else leaf(ctx, None, value))
+                else:
+                    attrs.append(token)
+                self.offset += 1
+                return
+            if kind == REDUCE:
+                entry = productions.get(arg)
+                if entry is None:
+                    self._reject(token)
+                    return
+                lhs, rhs = entry
+                n = len(rhs)
+                if actions is None:
+                    if n:
+                        del states[-n:]
+                        del attrs[-n:]
+                    attrs.append(None)
+                else:
+                    # aceeași dispecerizare ca tema4.evaluate_tokens, după lista compilată
+                    op, op_arg = actions[arg][3:5]
+                    if op == NOOP:
+                        states.pop()             # A -> X: valoarea lui X rămâne pe stivă
+                    elif op == EMPTY:
+                        attrs.append(None)
+                    else:
+                        values = attrs[-n:]
+                        del states[-n:]
+                        del attrs[-n:]
+                        attrs.append(values[op_arg] if op == COPY else op_arg(ctx, values))
+                goto_row = goto.get(lhs)
+                top = states[-1]
+                next_state = goto_row[top] if goto_row is not None and top < len(goto_row) else None
+                if next_state is None:
+                    self._reject(token)
+                    return
+                states.append(next_state)
+                continue
+            # ACCEPT
+            self.status = ACCEPTED
+            self.result = attrs[-1]
+            if ctx is not None and self.scheme.result is not None:
+                self.result = self.scheme.result(ctx, self.result)
+            return
+
+
+def iter_stdin_chunks(size=1 << 16):
+    while True:
+        chunk = sys.stdin.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser LR incremental peste stdin.")
+    parser.add_argument("--evaluate", action='store_true', help="Evaluează expresia (tema4.ARITHMETIC_SCHEME)")
+    parser.add_argument("--code", action='store_true', help="Afișează codul intermediar pe măsură ce e generat")
+    parser.add_argument("--action", default="action_table.csv")
+    parser.add_argument("--prod", default="result.csv")
+    args = parser.parse_args()
+
+    scheme = None
+    if args.evaluate:
+        from tema4 import ARITHMETIC_SCHEME as scheme
+    p = PushParser(load_tables(args.action, args.prod), scheme, sink=print if args.code else (lambda line: None))
+    status = p.consume(iter_stdin_chunks())
+    report = {'status': status, 'tokens': p.offset}
+    if args.evaluate:
+        report['result'] = p.result
+    if p.error:
+        report['error_offset'], report['error_token'] = p.error
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+reduction_trace.py - Secvența de reduceri a parserului LR în format binar compact
+
+LRParser2.parse_tokens(tokens, trace=t) apelează t.shift() la fiecare
+deplasare și t.reduce(n) la fiecare reducere. ReductionTrace păstrează
+numerele producțiilor într-un array('H') (uint16), adică derivarea dreaptă
+în ordine inversă, fără a mai parsa textul afișat ("Reduce: Using production 4").
+
+Cu with_shifts=True deplasările sunt intercalate în același stream ca valoarea
+0 (SHIFT; producțiile sunt numerotate de la 1). Tokenii sunt consumați în
+ordine, deci offset-ul unei deplasări este numărul de deplasări dinaintea ei
+și nu mai trebuie scris explicit (events() îl reconstruiește).
+
+Format fișier (little-endian):
+    magic 'LRRS' | versiune (1 B) | flags (1 B) | count (uint64) | count * uint16
+    flags: bit 0 = deplasări intercalate, bit 1 = input acceptat
+
+Usage:
+  python3 reduction_trace.py "id * id + id" -o out.lrrs [--shifts]
+  python3 reduction_trace.py --file expresie.txt -o out.lrrs
+  python3 reduction_trace.py --show out.lrrs
+  python3 reduction_trace.py --diff a.lrrs b.lrrs
+"""
+import argparse
+import struct
+import sys
+from array import array
+
+import LRParser2
+
+MAGIC = b'LRRS'
+VERSION = 1
+HEADER = struct.Struct('<4sBBQ')
+SHIFT = 0
+
+FLAG_SHIFTS = 1
+FLAG_ACCEPTED = 2
+
+
+class ReductionTrace:
+    __slots__ = ('codes', 'with_shifts', 'accepted')
+
+    def __init__(self, with_shifts=False, codes=None, accepted=None):
+        self.codes = codes if codes is not None else array('H')
+        self.with_shifts = with_shifts
+        self.accepted = accepted
+
+    def shift(self):
+        if self.with_shifts:
+            self.codes.append(SHIFT)
+
+    def reduce(self, prod_number):
+        self.codes.append(prod_number)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __eq__(self, other):
+        return (isinstance(other, ReductionTrace) and self.with_shifts == other.with_shifts
+                and self.codes == other.codes)
+
+    def reductions(self):
+        """Doar numerele producțiilor (fără deplasări), ca array('H')."""
+        if not self.with_shifts:
+            return self.codes
+        return array('H', (c for c in self.codes if c != SHIFT))
+
+    def events(self):
+        """Generator de ('shift', offset_token) / ('reduce', numar_productie)."""
+        offset = 0
+        for code in self.codes:
+            if code == SHIFT:
+                yield 'shift', offset
+                offset += 1
+            else:
+                yield 'reduce', code
+
+    def rightmost_derivation(self, prod=None):
+        """Producțiile (număr, lhs, rhs) în ordinea derivării drepte (reducerile inversate)."""
+        prod = prod if prod is not None else LRParser2.prod
+        for number in reversed(self.reductions()):
+            entry = prod[str(number)]
+            yield number, entry[0], entry[1] if len(entry) > 1 else ''
+
+    # ------------------------------------------------------------------
+    # fișier binar
+    # ------------------------------------------------------------------
+
+    def write(self, file):
+        """Scrie trace-ul într-un fișier binar (cale sau fișier deschis 'wb')."""
+        if isinstance(file, str):
+            with open(file, 'wb') as f:
+                return self.write(f)
+        flags = (FLAG_SHIFTS if self.with_shifts else 0) | (FLAG_ACCEPTED if self.accepted else 0)
+        file.write(HEADER.pack(MAGIC, VERSION, flags, len(self.codes)))
+        codes = self.codes
+        if sys.byteorder != 'little':
+            codes = array('H', codes)
+            codes.byteswap()
+        codes.tofile(file)
+
+    @classmethod
+    def read(cls, file):
+        """Citește un trace scris cu write() (cale sau fișier deschis 'rb')."""
+        if isinstance(file, str):
+            with open(file, 'rb') as f:
+                return cls.read(f)
+        header = file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError("Fișier trace trunchiat (antet incomplet)")
+        magic, version, flags, count = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Nu este un fișier trace LRRS v{VERSION}")
+        codes = array('H')
+        try:
+            codes.fromfile(file, count)
+        except EOFError:
+            raise ValueError(f"Fișier trace trunchiat: {len(codes)} din {count} coduri") from None
+        if sys.byteorder != 'little':
+            codes.byteswap()
+        return cls(bool(flags & FLAG_SHIFTS), codes, bool(flags & FLAG_ACCEPTED))
+
+
+def record(tokens, with_shifts=False):
+    """Parsează tokenii cu LRParser2 (fără afișare) și întoarce ReductionTrace-ul."""
+    trace = ReductionTrace(with_shifts)
+    trace.accepted = LRParser2.parse_tokens(tokens, verbose=False, trace=trace)
+    return trace
+
+
+def first_difference(a, b):
+    """Indexul primului cod diferit dintre două trace-uri (None dacă sunt identice)."""
+    for i, (x, y) in enumerate(zip(a.codes, b.codes)):
+        if x != y:
+            return i
+    if len(a.codes) != len(b.codes):
+        return min(len(a.codes), len(b.codes))
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Înregistrează / afișează / compară secvența de reduceri LR.")
+    parser.add_argument("expression", nargs='?', help="Expresie (tokeni separați prin spații)")
+    parser.add_argument("--file", help="Fișier cu expresia (citit prin mmap)")
+    parser.add_argument("-o", "--output", help="Fișier binar de ieșire")
+    parser.add_argument("--shifts", action='store_true', help="Intercalează deplasările în stream")
+    parser.add_argument("--show", metavar="TRACE", help="Afișează un fișier trace")
+    parser.add_argument("--diff", nargs=2, metavar="TRACE", help="Compară două fișiere trace")
+    args = parser.parse_args()
+
+    if args.show:
+        trace = ReductionTrace.read(args.show)
+        print(f"{len(trace)} coduri, accepted: {trace.accepted}, shifts: {trace.with_shifts}")
+        for kind, arg in trace.events():
+            print(f"{kind} {arg}")
+        return
+    if args.diff:
+        a, b = (ReductionTrace.read(p) for p in args.diff)
+        index = first_difference(a, b)
+        if index is None:
+            print("Identice")
+        else:
+            print(f"Diferă la codul {index}: "
+                  f"{a.codes[index] if index < len(a) else '<sfârșit>'} vs "
+                  f"{b.codes[index] if index < len(b) else '<sfârșit>'}")
+            sys.exit(1)
+        return
+
+    if args.file:
+        from contextlib import closing
+        from mmap_input import open_buffer, iter_tokens
+        with open_buffer(args.file) as buf, closing(iter_tokens(buf)) as tokens:
+            trace = record(tokens, args.shifts)
+    elif args.expression:
+        trace = record(args.expression.split(), args.shifts)
+    else:
+        parser.error("trebuie dată o expresie, --file, --show sau --diff")
+
+    if args.output:
+        trace.write(args.output)
+        print(f"Accepted: {trace.accepted}, {len(trace)} coduri -> {args.output}")
+    else:
+        print(f"Accepted: {trace.accepted}")
+        print(' '.join(map(str, trace.codes)))
+
+
+if __name__ == "__main__":
+    main()
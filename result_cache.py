@@ -0,0 +1,141 @@
+"""
+result_cache.py - Cache de rezultate în fața translatorului tema4
+
+Jurnalele de cereri repetă aceleași expresii, dar parse_and_evaluate parsează
+de fiecare dată de la zero. ResultCache păstrează (accept, valoare, cod
+intermediar) pentru fiecare expresie, cu cheia:
+    (secvența normalizată de tokeni, versiunea valorilor, opțiunile traducerii)
+Versiunea valorilor (bindings_version) se incrementează de apelant când se
+schimbă valorile variabilelor, iar intrările vechi nu mai sunt găsite și ies
+treptat din cache.
+
+Evicție LRU după numărul de intrări și după un buget de bytes (estimat).
+Statisticile (hits / misses / evictions) sunt în stats().
+Cache-ul este protejat de un lock, deci poate fi folosit din mai multe thread-uri.
+
+Codul intermediar este întors ca tuple (partajat între apeluri, nu se modifică).
+
+Usage:
+  python3 result_cache.py --bench 50000
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import tema4
+from latency import percentile
+
+
+def entry_size(key, entry):
+    """Estimare aproximativă a memoriei ocupate de o intrare (cheie + rezultat + cod)."""
+    tokens = key[0]
+    size = sys.getsizeof(tokens) + sum(sys.getsizeof(t) for t in tokens)
+    _, result, code = entry
+    size += sys.getsizeof(result) + sys.getsizeof(code) + sum(sys.getsizeof(line) for line in code)
+    return size + 200  # tuple-ul intrării + nodul din OrderedDict
+
+
+class ResultCache:
+    def __init__(self, max_entries=10_000, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # cheie -> (success, result, code, size)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def evaluate(self, expression, bindings_version=0, optimize=False, lexemes=False):
+        """Ca tema4.parse_and_evaluate(expression, verbose=False), dar prin cache."""
+        tokens = tuple(expression.split()) if isinstance(expression, str) else tuple(expression)
+        key = (tokens, bindings_version, optimize, lexemes)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], entry[1], entry[2]
+            self.misses += 1
+
+        scheme = tema4.OPTIMIZING_SCHEME if optimize else None
+        success, result, code = tema4.evaluate_tokens(tokens, verbose=False, scheme=scheme, lexemes=lexemes)
+        value = (success, result, tuple(code))
+        size = entry_size(key, value)
+        if size <= self.max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = value + (size,)
+                    self.bytes += size
+                    self._evict()
+        return value
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self.bytes -= entry[3]
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+def skewed_workload(requests, distinct=5000, skew=1.2, seed=0):
+    """Cereri cu distribuție Zipf peste `distinct` expresii diferite (de lungimi variate)."""
+    rnd = random.Random(seed)
+    pool = []
+    for _ in range(distinct):
+        parts = [rnd.choice(('id', 'x', 'y', '2'))]
+        for _ in range(rnd.randint(1, 30)):
+            parts += [rnd.choice('+*'), rnd.choice(('id', 'x', 'y', '2'))]
+        pool.append(' '.join(parts))
+    weights = [1 / (rank + 1) ** skew for rank in range(distinct)]
+    return rnd.choices(pool, weights, k=requests)
+
+
+def bench(requests):
+    workload = skewed_workload(requests)
+    cache = ResultCache(max_entries=1000)
+    for label, run in (("fără cache", lambda e: tema4.parse_and_evaluate(e, verbose=False, lexemes=True)),
+                       ("cu cache  ", lambda e: cache.evaluate(e, lexemes=True))):
+        latencies = []
+        t_start = time.perf_counter()
+        for expr in workload:
+            t0 = time.perf_counter()
+            run(expr)
+            latencies.append(time.perf_counter() - t0)
+        total = time.perf_counter() - t_start
+        latencies.sort()
+        print(f"  {label}: {requests / total:10,.0f} req/s, p50 {percentile(latencies, 0.5) * 1e6:7.1f} us, "
+              f"p99 {percentile(latencies, 0.99) * 1e6:7.1f} us")
+    print(f"  {cache.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pentru cache-ul de rezultate tema4.")
+    parser.add_argument("--bench", type=int, default=50000, metavar="N", help="Număr de cereri (Zipf)")
+    args = parser.parse_args()
+    bench(args.bench)
+
+
+if __name__ == "__main__":
+    main()
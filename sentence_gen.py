@@ -0,0 +1,263 @@
+"""
+sentence_gen.py - Generator de propoziții aleatoare din gramatică (pentru benchmark-uri și fuzzing)
+
+Gramatica este citită cu tema3.parse_grammar (implicit gramatica exemplu din
+tema3). Pentru fiecare neterminal și fiecare producție se calculează o dată
+(punct fix) lungimea minimă a unei derivări (în terminale) și adâncimea minimă
+a arborelui. Expandarea folosește aceste valori ca să nu depășească ținta:
+
+  - lungime: o producție este aleasă doar dacă lungimea minimă a ei plus
+    minimul simbolurilor încă neexpandate încape în `length`; cât timp mai
+    este loc, producțiile mai lungi (recursive) au pondere mai mare
+  - adâncime: o producție este aleasă doar dacă adâncimea ei minimă încape în `max_depth`
+
+Expandarea este iterativă și leneșă (generator de tokeni), deci o singură
+propoziție poate avea milioane de tokeni. Fiecare propoziție i are propriul
+generator Random, inițializat cu șirul "seed:i" (fără coliziuni între serii),
+deci orice propoziție poate fi regenerată separat cu sentence(seed, i, length).
+
+Mutațiile (ștergere, inserare, înlocuire, interschimbare de tokeni) produc
+inputuri invalide controlate; cu un validator, eticheta reflectă rezultatul real.
+
+Usage:
+  python3 sentence_gen.py --count 5 --length 15
+  python3 sentence_gen.py --count 1000000 --length 5-50 --invalid 0.2 --seed 7 -o inputs.txt
+  python3 sentence_gen.py --count 1 --length 10000000 -o mare.txt
+  python3 sentence_gen.py --grammar gramatica.txt --depth 6 --count 10 --check --action a.csv --prod p.csv
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from bisect import bisect
+from itertools import accumulate, islice
+
+import tema3
+
+MUTATIONS = ('delete', 'insert', 'replace', 'swap')
+
+
+def minimal_derivations(G, terminals):
+    """
+    Punct fix: (min_len, min_depth) pentru fiecare simbol.
+    Terminal: (1, 0); neterminal: minimul peste producții, unde o producție are
+    lungimea = suma lungimilor și adâncimea = 1 + maximul adâncimilor din RHS.
+    Neterminalele neproductive rămân cu (inf, inf).
+    """
+    min_len = {t: 1 for t in terminals}
+    min_depth = {t: 0 for t in terminals}
+    for A in G:
+        min_len[A] = math.inf
+        min_depth[A] = math.inf
+    changed = True
+    while changed:
+        changed = False
+        for A, prods in G.items():
+            for rhs in prods:
+                length = sum(min_len[s] for s in rhs)
+                depth = 1 + max((min_depth[s] for s in rhs), default=0)
+                if length < min_len[A]:
+                    min_len[A] = length
+                    changed = True
+                if depth < min_depth[A]:
+                    min_depth[A] = depth
+                    changed = True
+    return min_len, min_depth
+
+
+class SentenceGenerator:
+    def __init__(self, grammar_text=None, start=None, growth=1.0):
+        G = tema3.parse_grammar(grammar_text if grammar_text is not None else tema3.example_grammar_text())
+        terminals, _ = tema3.compute_terminals_and_nonterminals(G)
+        self.grammar = G
+        self.start = start if start is not None else next(iter(G))
+        self.terminals = sorted(terminals)
+        self.min_len, self.min_depth = minimal_derivations(G, terminals)
+        if self.min_len[self.start] == math.inf:
+            raise ValueError(f"Simbolul de start {self.start!r} nu derivă niciun șir de terminale")
+
+        # producțiile productive: (rhs inversat pentru stivă, lungime minimă, adâncime minimă, pondere)
+        self.choices = {}
+        for A, prods in G.items():
+            options = []
+            for rhs in prods:
+                length = sum(self.min_len[s] for s in rhs)
+                if length == math.inf:
+                    continue
+                depth = 1 + max((self.min_depth[s] for s in rhs), default=0)
+                options.append((tuple(reversed(rhs)), length, depth, max(length, 1) ** growth))
+            self.choices[A] = options
+        # drum rapid (fără limită de adâncime și cu loc pentru orice producție): ponderi cumulate
+        self._fast = {}
+        for A, options in self.choices.items():
+            cumulative = list(accumulate(o[3] for o in options))
+            self._fast[A] = (max((o[1] for o in options), default=0), cumulative, cumulative[-1] if cumulative else 0)
+
+    def generate(self, rnd, length=None, max_depth=None):
+        """Generator de tokeni pentru o propoziție validă (lungime ~length, adâncime <= max_depth)."""
+        if length is None and max_depth is None:
+            length = self.min_len[self.start]
+        choices, min_len, fast = self.choices, self.min_len, self._fast
+        uniform = rnd.random
+        syms = [self.start]
+        depths = [0]      # folosită doar cu max_depth
+        track = max_depth is not None
+        committed = min_len[self.start]   # minimul necesar pentru simbolurile de pe stivă
+        emitted = 0
+        limit = math.inf if length is None else length
+        while syms:
+            sym = syms.pop()
+            depth = depths.pop() if track else 0
+            options = choices.get(sym)
+            if options is None:
+                emitted += 1
+                committed -= 1
+                yield sym
+                continue
+            committed -= min_len[sym]
+            room = limit - emitted - committed
+            longest, cumulative, total = fast[sym]
+            if not track and room >= longest:
+                rhs, plen, _, _ = options[bisect(cumulative, uniform() * total)]
+                committed += plen
+                syms.extend(rhs)
+                continue
+            fits = [o for o in options
+                    if o[1] <= room and (not track or depth + o[2] <= max_depth)]
+            if not fits:
+                # ținta este sub minimul posibil: cea mai scurtă / cea mai puțin adâncă producție
+                fits = [min(options, key=lambda o: (o[2], o[1]) if track else (o[1], o[2]))]
+            if len(fits) == 1:
+                rhs, plen, _, _ = fits[0]
+            else:
+                rhs, plen, _, _ = rnd.choices(fits, [o[3] for o in fits])[0]
+            committed += plen
+            syms.extend(rhs)
+            if track:
+                depths.extend([depth + 1] * len(rhs))
+
+    def begin(self, seed, index, length=None, max_depth=None):
+        """
+        (rnd, generator de tokeni) pentru propoziția `index` din seria `seed`.
+        length poate fi un int sau un interval (min, max), tras din același rnd.
+        """
+        rnd = random.Random(f"{seed}:{index}")
+        target = rnd.randint(*length) if isinstance(length, tuple) else length
+        return rnd, self.generate(rnd, target, max_depth)
+
+    def sentence(self, seed, index, length=None, max_depth=None):
+        """Propoziția `index` din seria `seed` (aceeași ca în sentences(..., seed=seed), înainte de mutații)."""
+        return list(self.begin(seed, index, length, max_depth)[1])
+
+    def mutate(self, tokens, rnd, count=1):
+        """Copie a propoziției cu `count` mutații aleatoare (ștergere/inserare/înlocuire/interschimbare)."""
+        tokens = list(tokens)
+        for _ in range(count):
+            kind = rnd.choice(MUTATIONS) if tokens else 'insert'
+            i = rnd.randrange(len(tokens)) if tokens else 0
+            if kind == 'delete':
+                del tokens[i]
+            elif kind == 'insert':
+                tokens.insert(rnd.randint(0, len(tokens)), rnd.choice(self.terminals))
+            elif kind == 'replace':
+                tokens[i] = rnd.choice([t for t in self.terminals if t != tokens[i]] or self.terminals)
+            elif len(tokens) > 1:
+                j = i + 1 if i + 1 < len(tokens) else i - 1
+                tokens[i], tokens[j] = tokens[j], tokens[i]
+        return tokens
+
+    def sentences(self, count, length=None, max_depth=None, seed=0, invalid=0.0, mutations=1, validator=None):
+        """
+        Generator de (tokeni, valid) pentru `count` propoziții.
+        length poate fi un int sau un interval (min, max). O fracțiune `invalid`
+        este mutată; fără validator, eticheta acestora este False (o mutație
+        poate totuși produce din întâmplare un input valid, ex: '+' -> '*').
+        """
+        for index in range(count):
+            rnd, it = self.begin(seed, index, length, max_depth)
+            tokens = list(it)
+            valid = True
+            if invalid and rnd.random() < invalid:
+                tokens = self.mutate(tokens, rnd, mutations)
+                valid = False
+            if validator is not None:
+                valid = validator(tokens)
+            yield tokens, valid
+
+
+DEFAULT_LENGTH = 20   # --length implicit, doar când nu se dă nici --depth
+
+
+def parse_length(text):
+    if text is None:
+        return None
+    low, _, high = text.partition('-')
+    return (int(low), int(high)) if high else int(low)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generează propoziții aleatoare (valide sau mutate) dintr-o gramatică.")
+    parser.add_argument("--grammar", help="Fișier cu gramatica (implicit gramatica exemplu din tema3)")
+    parser.add_argument("--count", type=int, default=10, help="Număr de propoziții")
+    parser.add_argument("--length", help=f"Lungimea țintă în tokeni, sau interval: 5-50 "
+                                         f"(implicit {DEFAULT_LENGTH} dacă nu se dă nici --depth)")
+    parser.add_argument("--depth", type=int, help="Adâncimea maximă a arborelui de derivare")
+    parser.add_argument("--invalid", type=float, default=0.0, help="Fracțiunea de propoziții mutate")
+    parser.add_argument("--mutations", type=int, default=1, help="Mutații per propoziție invalidă")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", action='store_true', help="Prefixează fiecare linie cu 1/0 (valid/invalid)")
+    parser.add_argument("--check", action='store_true', help="Etichetează cu rezultatul real al parserului LR/GLR")
+    parser.add_argument("--action", default="action_table.csv")
+    parser.add_argument("--prod", default="result.csv")
+    parser.add_argument("-o", "--output", help="Fișier de ieșire (implicit stdout)")
+    args = parser.parse_args()
+
+    text = None
+    if args.grammar:
+        with open(args.grammar, encoding='utf-8') as fh:
+            text = fh.read()
+    gen = SentenceGenerator(text)
+    validator = None
+    if args.check:
+        from glr import GLRParser
+        from lr_tables import load_tables
+        glr = GLRParser(load_tables(args.action, args.prod))
+
+        def validator(tokens):
+            return glr.parse(tokens, forest=False).accepted
+
+    length = parse_length(args.length)
+    if length is None and args.depth is None:
+        length = DEFAULT_LENGTH
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    t0 = time.perf_counter()
+    tokens_total = 0
+    try:
+        if args.count == 1 and not args.invalid and not args.check and not args.label:
+            # o singură propoziție (posibil uriașă): scrisă pe măsură ce este generată
+            _, it = gen.begin(args.seed, 0, length, args.depth)
+            while True:
+                chunk = list(islice(it, 1 << 16))
+                if not chunk:
+                    break
+                tokens_total += len(chunk)
+                out.write(' '.join(chunk))
+                out.write(' ')
+            out.write('\n')
+        else:
+            for tokens, valid in gen.sentences(args.count, length, args.depth, args.seed,
+                                               args.invalid, args.mutations, validator):
+                tokens_total += len(tokens)
+                line = ' '.join(tokens)
+                out.write(f"{int(valid)}\t{line}\n" if args.label or args.check else line + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - t0
+    print(f"{args.count:,d} propoziții, {tokens_total:,d} tokeni în {elapsed:.2f} s "
+          f"({tokens_total / elapsed if elapsed else 0:,.0f} tokeni/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""
+table_profile.py - Profil al accesărilor în tabelele LR și specializarea tabelelor după profil
+
+Profilare (opt-in): LRParser2.parse_input / parse_tokens și tema4.parse_and_evaluate /
+evaluate_tokens primesc profile=TableProfile() și numără:
+  - accesările celulelor ACTION (stare, token)
+  - accesările celulelor GOTO (stare expusă, LHS)
+  - reducerile, pe producție
+Fără profile parserele nu numără nimic (un singur test `is not None` per pas).
+
+Raportul JSON (report()) este gata pentru un heatmap: matricea stări x simboluri
+(`heatmap`), lista celulelor sortată după accesări, producțiile cu regula lor
+și câte celule acoperă 50 / 90 / 99% din accesări. Conține și hash-ul
+tabelelor, deci poate fi dat direct pasului de layout din tema3:
+
+    python3 tema3.py --layout profile.json --layout-output hot_action.csv
+
+care renumerotează stările (cele fierbinți primele, starea 0 rămâne 0) și
+ordonează rândurile după accesări.
+
+SpecializedTable este o tabelă construită din profil: celulele fierbinți
+(cele care acoperă `coverage` din accesări) sunt într-un dicționar per stare
+(o singură căutare), restul se caută în tabelele complete (drum lent, numărat).
+
+--bench măsoară pe același corpus:
+  - localitatea: câte linii de cache (64 B = 8 celule) ocupă celulele care
+    acoperă 99% din accesări, în layout pe rânduri de simbol (ca lr_tables:
+    un tuple per simbol, indexat după stare) și pe rânduri de stare, înainte
+    și după layout
+  - throughput-ul: LRParser2, bucla pe lr_tables cu tabelele originale, cu
+    tabelele reordonate și cu SpecializedTable (cu verificarea rezultatelor),
+    cu intervalul raportului față de tabelele originale pe mai multe runde
+
+Layout-ul nu schimbă numărul de căutări, doar adresele lor. În CPython costul
+unui pas este dominat de interpretor, deci câștigul de localitate (mai puține
+linii de cache pe rânduri de simbol) nu se vede sigur în timp: raportul
+tabelelor reordonate variază între rulări în jurul lui 1.0x (măsurat: 0.90x - 1.08x),
+iar pe rânduri de stare numărul de linii poate chiar crește. Ce se măsoară
+stabil este SpecializedTable, care face mai puține căutări per pas.
+
+Usage:
+  python3 table_profile.py --generate 20000 -o profile.json --csv heatmap.csv
+  python3 table_profile.py --corpus expresii.txt --api parse_and_evaluate -o profile.json
+  python3 table_profile.py --generate 5000 --bench
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from lr_tables import SHIFT, REDUCE, ENDMARK, load_tables, tables_hash
+
+CACHE_LINE_CELLS = 8   # 64 bytes / pointer de 8 bytes
+
+
+class TableProfile:
+    def __init__(self):
+        self.cells = Counter()        # (stare, token) -> accesări ACTION
+        self.gotos = Counter()        # (stare, LHS) -> accesări GOTO
+        self.productions = Counter()  # nr producție -> reduceri
+        self.parses = 0
+
+    def cell(self, state, token):
+        self.cells[(state, token)] += 1
+
+    def goto(self, state, lhs):
+        self.gotos[(state, lhs)] += 1
+
+    def production(self, number):
+        self.productions[number] += 1
+
+    def merge(self, other):
+        self.cells.update(other.cells)
+        self.gotos.update(other.gotos)
+        self.productions.update(other.productions)
+        self.parses += other.parses
+
+    def report(self, tables, action_path='action_table.csv', prod_path='result.csv'):
+        """Raportul JSON (heatmap + liste sortate + acoperire) pentru tabelele date."""
+        terminals = list(tables.terminals)
+        nonterminals = list(tables.nonterminals)
+        columns = terminals + nonterminals
+        index = {sym: i for i, sym in enumerate(columns)}
+        matrix = [[0] * len(columns) for _ in range(tables.num_states)]
+        for counter in (self.cells, self.gotos):
+            for (state, sym), hits in counter.items():
+                if state < tables.num_states and sym in index:
+                    matrix[state][index[sym]] += hits
+
+        cells = sorted(([s, t, n] for (s, t), n in self.cells.items()), key=lambda c: (-c[2], c[0], c[1]))
+        gotos = sorted(([s, a, n] for (s, a), n in self.gotos.items()), key=lambda c: (-c[2], c[0], c[1]))
+        defined = sum(1 for row in tables.action.values() for c in row if c is not None)
+        defined += sum(1 for row in tables.goto.values() for c in row if c is not None)
+        # celulele goale accesate sunt erorile de sintaxă (inputuri respinse)
+        errors = sum(1 for s, t, _ in cells if tables.action_cell(s, t) is None)
+        return {
+            'tables_sha256': tables_hash(action_path, prod_path),
+            'parses': self.parses,
+            'num_states': tables.num_states,
+            'terminals': terminals,
+            'nonterminals': nonterminals,
+            'action_lookups': sum(self.cells.values()),
+            'goto_lookups': sum(self.gotos.values()),
+            'cells': cells,
+            'gotos': gotos,
+            'productions': [
+                {'number': num, 'rule': f"{lhs} -> {' '.join(rhs) or 'ε'}", 'hits': self.productions.get(num, 0)}
+                for num, (lhs, rhs) in sorted(tables.productions.items())
+            ],
+            'coverage': dict(coverage(cells + gotos), cells_used=len(cells) + len(gotos) - errors,
+                             cells_defined=defined, error_cells=errors),
+            'heatmap': {'rows': list(range(tables.num_states)), 'columns': columns, 'values': matrix},
+        }
+
+
+def coverage(entries, levels=(0.5, 0.9, 0.99)):
+    """Câte celule (cele mai accesate primele) acoperă fiecare fracțiune din accesări."""
+    hits = sorted((e[2] for e in entries), reverse=True)
+    total = sum(hits)
+    result = {}
+    seen = 0
+    k = 0
+    for level in levels:
+        while k < len(hits) and seen < level * total:
+            seen += hits[k]
+            k += 1
+        result[f"{level:.0%}"] = k
+    return result
+
+
+def hot_cells(report, fraction=0.99):
+    """Celulele (stare, simbol) care acoperă `fraction` din accesări (ACTION și GOTO)."""
+    entries = sorted(report['cells'] + report['gotos'], key=lambda c: -c[2])
+    total = sum(e[2] for e in entries)
+    hot = []
+    seen = 0
+    for state, sym, hits in entries:
+        if seen >= fraction * total:
+            break
+        hot.append((state, sym))
+        seen += hits
+    return hot
+
+
+def write_heatmap_csv(report, path):
+    heatmap = report['heatmap']
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(['state'] + heatmap['columns'])
+        for state, values in zip(heatmap['rows'], heatmap['values']):
+            writer.writerow([state] + values)
+
+
+def profile_corpus(lines, api='parse_input'):
+    """Rulează parserul ales (fără afișare) pe fiecare expresie, cu profilare."""
+    profile = TableProfile()
+    if api == 'parse_input':
+        import LRParser2
+
+        for line in lines:
+            LRParser2.parse_input(line, verbose=False, profile=profile)
+            profile.parses += 1
+    elif api == 'parse_and_evaluate':
+        import tema4
+
+        for line in lines:
+            tema4.parse_and_evaluate(line, verbose=False, profile=profile)
+            profile.parses += 1
+    else:
+        raise ValueError(f"API necunoscut: {api}")
+    return profile
+
+
+# ============================================================================
+# Localitate
+# ============================================================================
+
+def cache_lines(cells, state_order, symbol_order, num_states, layout='symbol'):
+    """
+    Numărul de linii de cache distincte ocupate de celulele date, pentru
+    stările numerotate după state_order și simbolurile în symbol_order.
+    layout='symbol': un rând (tuple) per simbol, indexat după stare (lr_tables);
+    layout='state': un rând per stare, cu câte o coloană per simbol.
+    """
+    new_state = {old: new for new, old in enumerate(state_order)}
+    row = {sym: i for i, sym in enumerate(symbol_order)}
+    lines = set()
+    for state, sym in cells:
+        if layout == 'symbol':
+            lines.add((row[sym], new_state[state] // CACHE_LINE_CELLS))
+        else:
+            lines.add((new_state[state] * len(symbol_order) + row[sym]) // CACHE_LINE_CELLS)
+    return len(lines)
+
+
+# ============================================================================
+# Tabelă specializată
+# ============================================================================
+
+class SpecializedTable:
+    """Celulele fierbinți într-un dicționar per stare; restul din tabelele complete (drum lent)."""
+
+    def __init__(self, tables, report, fraction=0.99):
+        self.tables = tables
+        self.hot_action = [dict() for _ in range(tables.num_states)]
+        self.hot_goto = [dict() for _ in range(tables.num_states)]
+        goto_symbols = set(tables.goto)
+        for state, sym in hot_cells(report, fraction):
+            if sym in goto_symbols:
+                self.hot_goto[state][sym] = tables.goto_state(state, sym)
+            else:
+                cell = tables.action_cell(state, sym)
+                if cell is not None:
+                    self.hot_action[state][sym] = cell
+        size = max(tables.productions, default=0) + 1
+        self.reduce_info = [None] * size
+        for num, (lhs, rhs) in tables.productions.items():
+            self.reduce_info[num] = (lhs, len(rhs))
+        self.hot_size = sum(map(len, self.hot_action)) + sum(map(len, self.hot_goto))
+        self.cold_lookups = 0
+
+    def parse(self, tokens):
+        hot_action, hot_goto, reduce_info = self.hot_action, self.hot_goto, self.reduce_info
+        action_cell, goto_state = self.tables.action_cell, self.tables.goto_state
+        cold = 0
+        stack = [0]
+        it = iter(tokens)
+        token = next(it, ENDMARK)
+        try:
+            while True:
+                state = stack[-1]
+                cell = hot_action[state].get(token)
+                if cell is None:
+                    cold += 1
+                    cell = action_cell(state, token)
+                    if cell is None:
+                        return False
+                kind, arg = cell
+                if kind == SHIFT:
+                    stack.append(arg)
+                    token = next(it, ENDMARK)
+                elif kind == REDUCE:
+                    lhs, length = reduce_info[arg]
+                    if length:
+                        del stack[-length:]
+                    state = stack[-1]
+                    nxt = hot_goto[state].get(lhs)
+                    if nxt is None:
+                        cold += 1
+                        nxt = goto_state(state, lhs)
+                        if nxt is None:
+                            return False
+                    stack.append(nxt)
+                else:
+                    return True
+        finally:
+            self.cold_lookups += cold
+
+
+def parse_tables(tables, tokens):
+    """Bucla LR de referință pe lr_tables (fără specializare), pentru comparație."""
+    action, goto, productions = tables.action, tables.goto, tables.productions
+    stack = [0]
+    it = iter(tokens)
+    token = next(it, ENDMARK)
+    while True:
+        state = stack[-1]
+        row = action.get(token)
+        cell = row[state] if row is not None and state < len(row) else None
+        if cell is None:
+            return False
+        kind, arg = cell
+        if kind == SHIFT:
+            stack.append(arg)
+            token = next(it, ENDMARK)
+        elif kind == REDUCE:
+            lhs, rhs = productions[arg]
+            if rhs:
+                del stack[-len(rhs):]
+            row = goto.get(lhs)
+            state = stack[-1]
+            nxt = row[state] if row is not None and state < len(row) else None
+            if nxt is None:
+                return False
+            stack.append(nxt)
+        else:
+            return True
+
+
+def bench(lines, report, action_path='action_table.csv', prod_path='result.csv', repeats=5):
+    import LRParser2
+    import tema3
+
+    tables = load_tables(action_path, prod_path)
+    terminals, nonterminals = report['terminals'], report['nonterminals']
+    hot = hot_cells(report)
+    print(f"{report['parses']:,d} parsări, {report['action_lookups']:,d} accesări ACTION, "
+          f"{report['goto_lookups']:,d} GOTO; {report['coverage']['cells_used']} / "
+          f"{report['coverage']['cells_defined']} celule definite folosite ({report['coverage']['error_cells']} goale, "
+          f"din inputurile respinse); "
+          f"acoperire 50/90/99%: {report['coverage']['50%']}/{report['coverage']['90%']}/{report['coverage']['99%']} celule")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        hot_action_path = os.path.join(tmp, 'action_table.csv')
+        state_order, symbol_order = tema3.layout_exported_tables(report, action_path, prod_path, hot_action_path)
+        laid_out = load_tables(hot_action_path, prod_path)
+
+    identity = list(range(tables.num_states))
+    print(f"\nLocalitate: linii de cache (64 B) pentru cele {len(hot)} celule care acoperă 99% din accesări")
+    for layout in ('symbol', 'state'):
+        before = cache_lines(hot, identity, terminals + nonterminals, tables.num_states, layout)
+        after = cache_lines(hot, state_order, symbol_order, tables.num_states, layout)
+        print(f"  rânduri pe {'simbol' if layout == 'symbol' else 'stare '}: {before:4d} -> {after:4d} după layout")
+
+    token_lists = [line.split() for line in lines]
+    total_tokens = sum(map(len, token_lists))
+    specialized = SpecializedTable(tables, report)
+    variants = [
+        ('LRParser2.parse_tokens', lambda t: LRParser2.parse_tokens(t, verbose=False)),
+        ('lr_tables, tabele originale', lambda t: parse_tables(tables, t)),
+        ('lr_tables, după layout', lambda t: parse_tables(laid_out, t)),
+        (f'specializat ({specialized.hot_size} celule fierbinți)', specialized.parse),
+    ]
+    # variantele rulează alternat, în runde: raportul față de tabelele originale
+    # este calculat pe fiecare rundă și se afișează intervalul, nu o singură valoare
+    times = {name: [] for name, _ in variants}
+    expected = None
+    for _ in range(repeats):
+        for name, run in variants:
+            t0 = time.perf_counter()
+            results = [run(tokens) for tokens in token_lists]
+            times[name].append(time.perf_counter() - t0)
+            if expected is None:
+                expected = results
+            elif results != expected:
+                raise AssertionError(f"{name}: rezultate diferite față de LRParser2")
+    baseline = times[variants[1][0]]
+    print(f"\nThroughput ({len(token_lists):,d} expresii, {total_tokens:,d} tokeni, cel mai bun din {repeats}; "
+          f"față de lr_tables original: min - max pe runde):")
+    for name, _ in variants:
+        rate = total_tokens / min(times[name])
+        ratios = sorted(b / t for b, t in zip(baseline, times[name]))
+        relative = "" if times[name] is baseline else f" ({ratios[0]:.2f}x - {ratios[-1]:.2f}x)"
+        print(f"  {name:<38} {rate:12,.0f} tokeni/s{relative}")
+    lookups = specialized.cold_lookups / repeats
+    print(f"  drum lent (celule reci) în varianta specializată: {lookups:,.0f} accesări per rulare "
+          f"({lookups / (report['action_lookups'] + report['goto_lookups']):.2%})")
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as fh:
+        return [line.strip() for line in fh if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profil al celulelor LR folosite și specializarea tabelelor.")
+    parser.add_argument("--corpus", help="Fișier cu câte o expresie pe linie")
+    parser.add_argument("--generate", type=int, metavar="N", help="Corpus generat: N propoziții (sentence_gen)")
+    parser.add_argument("--api", choices=['parse_input', 'parse_and_evaluate'], default='parse_input')
+    parser.add_argument("-o", "--output", help="Raportul JSON (heatmap + celule + producții)")
+    parser.add_argument("--csv", help="Heatmap-ul ca CSV (stări x simboluri)")
+    parser.add_argument("--bench", action='store_true', help="Măsoară localitatea și throughput-ul după layout")
+    parser.add_argument("--repeats", type=int, default=5, help="Runde de măsurare pentru --bench")
+    parser.add_argument("--action", default="action_table.csv")
+    parser.add_argument("--prod", default="result.csv")
+    args = parser.parse_args()
+
+    if args.corpus:
+        lines = read_lines(args.corpus)
+    elif args.generate:
+        from sentence_gen import SentenceGenerator
+
+        lines = [' '.join(tokens) for tokens, _ in SentenceGenerator().sentences(args.generate, (3, 60), invalid=0.05)]
+    else:
+        parser.error("dați --corpus sau --generate")
+
+    t0 = time.perf_counter()
+    profile = profile_corpus(lines, args.api)
+    report = profile.report(load_tables(args.action, args.prod), args.action, args.prod)
+    print(f"Profil pe {len(lines):,d} expresii în {time.perf_counter() - t0:.2f} s", file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=1)
+    if args.csv:
+        write_heatmap_csv(report, args.csv)
+    if not args.output and not args.bench:
+        print("Cele mai accesate celule ACTION:")
+        for state, token, hits in report['cells'][:15]:
+            print(f"  ({state:3d}, {token!r:>5}): {hits:,d}")
+        print("Producții:")
+        for p in report['productions']:
+            print(f"  {p['number']}: {p['rule']:<14} {p['hits']:,d}")
+    if args.bench:
+        bench(lines, report, args.action, args.prod, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
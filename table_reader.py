@@ -174,14 +174,28 @@ Usage:
   python3 table_reader.py --file action_table.csv
   python3 table_reader.py --file result.csv   # dacă result.csv este în format state-per-row
   python3 table_reader.py --wrap 40
+  python3 table_reader.py --stream --file action_table.csv      # tabele mari: afișare pe blocuri de stări
+  python3 table_reader.py --states 100-200 --symbols id,+,E     # doar o parte din tabel (implică --stream)
+
+Modul --stream nu citește și nu transpune tot fișierul înainte de afișare:
+ - action_table.csv este mapat în memorie (mmap); pentru fiecare rând de simbol se
+   ține doar poziția următoarei celule, iar celulele unui bloc de stări (--block)
+   se extrag la cerere, deci memoria este O(bloc x simboluri selectate)
+ - lățimile coloanelor se estimează din primele --sample stări selectate (sau exact,
+   cu --exact-widths, printr-o trecere rapidă peste rândurile de simbol); celulele
+   mai late decât estimarea sunt împachetate pe mai multe linii
+ - fiecare bloc este formatat într-un singur șir și scris o dată (stdout cu buffer)
+Timpul până la primul rând afișat depinde de mărimea blocului, nu de numărul de stări.
 """
 from __future__ import annotations
 import csv
 import argparse
+import io
+import mmap
 import shutil
 import textwrap
 import sys
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 
 def read_all_rows(path: str) -> List[List[str]]:
     with open(path, newline='', encoding='utf-8') as f:
@@ -305,20 +319,343 @@ def print_table(header: List[str], data: List[List[str]], col_widths: List[int],
             print(sep_col.join(out_cells))
         print("-" * total_width)
 
+# ============================================================================
+# Mod streaming (--stream)
+# ============================================================================
+
+def parse_state_range(text: Optional[str]) -> Tuple[int, Optional[int]]:
+    """'100-200' -> (100, 201) (capete incluse), '100-' -> (100, None), '7' -> (7, 8), None -> (0, None)"""
+    if not text:
+        return 0, None
+    low, dash, high = text.partition('-')
+    try:
+        start = int(low) if low.strip() else 0
+        stop = int(high) + 1 if high.strip() else None
+    except ValueError:
+        raise ValueError(f"Interval de stări invalid: {text!r} (aștept N, N-M sau N-, ex: 100-200)") from None
+    if not dash:
+        return start, start + 1
+    if stop is not None and stop <= start:
+        raise ValueError(f"Interval de stări gol: {text}")
+    return start, stop
+
+class SymbolRowSource:
+    """
+    action_table.csv (un rând per simbol, o coloană per stare) citit prin mmap.
+    Pentru fiecare rând se păstrează doar poziția (în bytes) a următoarei celule,
+    deci blocurile consecutive de stări se citesc fără a relua rândul de la început.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise RuntimeError("Fișier CSV gol")
+        m = self._map
+        self.columns: List[str] = []
+        self._starts: List[int] = []   # poziția primei celule (după simbol)
+        self._ends: List[int] = []
+        pos, size = 0, len(m)
+        while pos < size:
+            nl = m.find(b'\n', pos)
+            end = size if nl == -1 else nl
+            line_end = end - 1 if end > pos and m[end - 1] == ord('\r') else end
+            if line_end > pos:
+                symbol, first = self._split_symbol(pos, line_end)
+                self.columns.append(symbol)
+                self._starts.append(first)
+                self._ends.append(line_end)
+            pos = end + 1
+        if not self.columns:
+            self.close()
+            raise RuntimeError("Fișier CSV gol")
+        # ca în detect_and_transform: numărul de stări este dat de primul rând
+        if self._starts[0] > self._ends[0]:
+            self.num_states = 0
+        else:
+            self.num_states = m[self._starts[0]:self._ends[0]].count(b',') + 1
+        self._cursor = list(self._starts)
+        self._next_state = [0] * len(self.columns)
+
+    def field_counts(self) -> List[int]:
+        """Numărul de câmpuri (simbol + celule) al fiecărui rând, ca len(row) din csv.reader."""
+        m = self._map
+        return [1 + (m[s:e].count(b',') + 1 if s <= e else 0) for s, e in zip(self._starts, self._ends)]
+
+    def _split_symbol(self, pos: int, end: int) -> Tuple[str, int]:
+        """Simbolul de la începutul rândului și poziția primei celule (end + 1 dacă rândul nu are celule)."""
+        m = self._map
+        if m[pos] == ord('"'):
+            # simbol între ghilimele (ex: ","), cu "" pentru o ghilimea
+            q = pos + 1
+            while True:
+                q = m.find(b'"', q, end)
+                if q == -1 or m[q + 1:q + 2] != b'"':
+                    break
+                q += 2
+            comma = m.find(b',', q, end) if q != -1 else -1
+            field = next(csv.reader([m[pos:end if comma == -1 else comma].decode('utf-8')]))[0]
+        else:
+            comma = m.find(b',', pos, end)
+            field = m[pos:end if comma == -1 else comma].decode('utf-8')
+        return field, (end + 1 if comma == -1 else comma + 1)
+
+    def _take(self, line: int, count: int) -> List[str]:
+        """Următoarele `count` celule din rândul `line` (fereastra citită se dublează la nevoie)."""
+        m, pos, end = self._map, self._cursor[line], self._ends[line]
+        if pos > end:
+            return [''] * count
+        window = 8 * count + 64
+        while True:
+            stop = min(end, pos + window)
+            parts = m[pos:stop].split(b',', count)
+            if len(parts) > count or stop == end:
+                break
+            window *= 2
+        cells = parts[:count]
+        self._cursor[line] = pos + sum(map(len, cells)) + len(cells)
+        self._next_state[line] += len(cells)
+        return [c.decode('utf-8') for c in cells] + [''] * (count - len(cells))
+
+    def _seek(self, line: int, state: int):
+        if state < self._next_state[line]:
+            self._cursor[line] = self._starts[line]
+            self._next_state[line] = 0
+        while self._next_state[line] < state and self._cursor[line] <= self._ends[line]:
+            self._take(line, min(4096, state - self._next_state[line]))
+
+    def blocks(self, start: int, stop: Optional[int], block: int, columns: List[int]) -> Iterator[List[List[str]]]:
+        """Blocuri de rânduri [stare, celule...] pentru stările [start, stop) și coloanele date (indici)."""
+        stop = self.num_states if stop is None else min(stop, self.num_states)
+        for line in columns:
+            self._seek(line, start)
+        for first in range(start, stop, block):
+            count = min(block, stop - first)
+            cols = [self._take(line, count) for line in columns]
+            yield [[str(first + i)] + [col[i] for col in cols] for i in range(count)]
+
+    def exact_widths(self, start: int, stop: Optional[int], columns: List[int]) -> List[int]:
+        """Lățimea maximă per coloană: câte un split (în C) pe fiecare rând de simbol selectat."""
+        widths = []
+        for line in columns:
+            cells = self._map[self._starts[line]:self._ends[line]].split(b',')[start:stop]
+            widths.append(max(map(len, cells), default=0))
+        return widths
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+class StateRowSource:
+    """CSV deja în forma state-per-rând (cu header 'state' sau fără header): citit linie cu linie."""
+
+    def __init__(self, path: str):
+        self._file = open(path, newline='', encoding='utf-8')
+        self._reader = csv.reader(self._file)
+        first = next(self._reader, None)
+        if not first:
+            self.close()
+            raise RuntimeError("Fișier CSV gol")
+        if first[0].strip().lower() == 'state':
+            self._pending = None
+            self.columns = first[1:]
+        else:
+            self._pending = first
+            self.columns = [f"col{i}" for i in range(1, len(first))]
+        self.num_states = None   # necunoscut fără o citire completă
+
+    def _rows(self) -> Iterator[List[str]]:
+        if self._pending is not None:
+            yield self._pending
+        yield from self._reader
+
+    def blocks(self, start: int, stop: Optional[int], block: int, columns: List[int]) -> Iterator[List[List[str]]]:
+        chunk = []
+        for index, row in enumerate(self._rows()):
+            if index < start:
+                continue
+            if stop is not None and index >= stop:
+                break
+            chunk.append([row[0] if row else str(index)] +
+                         [row[c + 1] if c + 1 < len(row) else '' for c in columns])
+            if len(chunk) == block:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def exact_widths(self, start: int, stop: Optional[int], columns: List[int]) -> Optional[List[int]]:
+        # ar cere încă o citire completă a fișierului; se folosește eșantionul
+        return None
+
+    def close(self):
+        self._file.close()
+
+def open_stream_source(path: str):
+    """
+    Alege sursa în aceeași ordine ca detect_and_transform:
+      1. header 'state' urmat de alte rânduri -> StateRowSource
+      2. toate rândurile cu același număr de câmpuri (>= 2) -> SymbolRowSource
+         (și pentru un CSV state-per-rând fără header, ca în modul fără --stream)
+      3. prima coloană numerică pe toate rândurile -> StateRowSource fără header
+    Pașii 2-3 parcurg o dată toate rândurile (find / count în C pe fișierul mapat).
+    """
+    with open(path, 'rb') as f:
+        first = f.read(64).split(b'\n', 1)[0].split(b',', 1)[0]
+        has_header = first.strip().strip(b'"').strip().lower() == b'state'
+        if has_header:
+            f.seek(0)
+            f.readline()
+            if f.readline():
+                return StateRowSource(path)
+    source = SymbolRowSource(path)
+    counts = source.field_counts()
+    if counts[0] >= 2 and all(c == counts[0] for c in counts):
+        return source
+    numeric = all(symbol.strip().isdigit() for symbol in source.columns)
+    source.close()
+    if numeric:
+        return StateRowSource(path)
+    raise RuntimeError("Format CSV necunoscut. Aștept fie 'state' header, fie action_table (simbol-per-rând), fie state-per-rând fără header.")
+
+def render_rows(rows: List[List[str]], col_widths: List[int], pad: int, total_width: int) -> str:
+    """Aceleași linii ca print_table, într-un singur șir; textwrap doar pentru celulele prea late."""
+    sep_col = " | "
+    rule = "-" * total_width
+    side = ' ' * pad
+    inner = [w - 2*pad for w in col_widths]
+    lines = []
+    for r in rows:
+        if all(len(cell) <= iw for cell, iw in zip(r, inner)):
+            lines.append(sep_col.join(f"{side}{cell.ljust(iw)}{side}" for cell, iw in zip(r, inner)))
+        else:
+            cell_lines = [wrap_cell_lines(cell, w, pad) for cell, w in zip(r, col_widths)]
+            for line_idx in range(max(len(cl) for cl in cell_lines)):
+                lines.append(sep_col.join(cl[line_idx] if line_idx < len(cl) else ' ' * w
+                                          for cl, w in zip(cell_lines, col_widths)))
+        lines.append(rule)
+    lines.append('')
+    return "\n".join(lines)
+
+def stream_table(source, out, states: Optional[str] = None, symbols: Optional[List[str]] = None,
+                 block: int = 256, sample: int = 256, exact: bool = False,
+                 wrap_limit: Optional[int] = 30, pad: int = 1) -> int:
+    """Afișează tabelul bloc cu bloc în `out`; întoarce numărul de stări afișate."""
+    start, stop = parse_state_range(states)
+    if symbols:
+        missing = [s for s in symbols if s not in source.columns]
+        if missing:
+            raise RuntimeError(f"Simboluri inexistente în tabel: {', '.join(missing)}")
+        columns = [source.columns.index(s) for s in symbols]
+    else:
+        columns = list(range(len(source.columns)))
+    header = ['state'] + [source.columns[c] for c in columns]
+
+    blocks = source.blocks(start, stop, block, columns)
+    widths = source.exact_widths(start, stop, columns) if exact else None
+    pending = []
+    if widths is None:
+        # estimare din header și primele `sample` stări (blocurile citite se păstrează pentru afișare)
+        maxlens = [len(h) for h in header]
+        sampled = 0
+        while sampled < sample:
+            chunk = next(blocks, None)
+            if chunk is None:
+                break
+            pending.append(chunk)
+            for r in chunk[:sample - sampled]:
+                for i, cell in enumerate(r):
+                    if len(cell) > maxlens[i]:
+                        maxlens[i] = len(cell)
+            sampled += len(chunk)
+        if sampled >= sample:
+            # numerele de stare cresc: se rezervă loc pentru ultima stare
+            last = stop if stop is not None else source.num_states
+            if last:
+                maxlens[0] = max(maxlens[0], len(str(last - 1)))
+    else:
+        last = stop if stop is not None else source.num_states
+        maxlens = [max(len(header[0]), len(str(max(last - 1, 0))))] + \
+                  [max(len(h), w) for h, w in zip(header[1:], widths)]
+    if wrap_limit:
+        maxlens = [min(w, wrap_limit) for w in maxlens]
+    col_widths = [w + 2*pad for w in maxlens]
+    total_width = sum(col_widths) + 3 * (len(header) - 1)
+
+    side = ' ' * pad
+    out.write(" | ".join(f"{side}{h.center(w - 2*pad)}{side}" for h, w in zip(header, col_widths)) + "\n")
+    out.write("-" * total_width + "\n")
+    shown = 0
+    for chunk in pending:
+        out.write(render_rows(chunk, col_widths, pad, total_width))
+        shown += len(chunk)
+    out.flush()
+    for chunk in blocks:
+        out.write(render_rows(chunk, col_widths, pad, total_width))
+        out.flush()
+        shown += len(chunk)
+    return shown
+
 def terminal_width() -> int:
     try:
         return shutil.get_terminal_size().columns
     except Exception:
         return 80
 
+def stream_main(args):
+    do_wrap = not args.no_wrap and (args.wrap and args.wrap > 0)
+    try:
+        source = open_stream_source(args.file)
+    except FileNotFoundError:
+        print(f"Fișierul '{args.file}' nu a fost găsit.", file=sys.stderr)
+        sys.exit(2)
+    except (RuntimeError, UnicodeDecodeError) as e:
+        print(f"Eroare: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    # stdout cu buffer mare: fiecare bloc ajunge la sistem printr-un singur write
+    sys.stdout.flush()
+    raw = io.FileIO(sys.stdout.fileno(), 'w', closefd=False)
+    out = io.TextIOWrapper(io.BufferedWriter(raw, 1 << 16), encoding='utf-8')
+    # listă CSV: un simbol virgulă se scrie între ghilimele, ex: --symbols 'id,","'
+    symbols = next(csv.reader([args.symbols])) if args.symbols else None
+    try:
+        stream_table(source, out, args.states, symbols, block=max(1, args.block), sample=max(1, args.sample),
+                     exact=args.exact_widths, wrap_limit=args.wrap if do_wrap else None, pad=args.pad)
+        out.flush()
+    except (RuntimeError, ValueError) as e:
+        print(f"Eroare: {e}", file=sys.stderr)
+        sys.exit(2)
+    except BrokenPipeError:
+        # ex: ... | head; cititorul a închis pipe-ul, restul tabelului nu mai contează
+        pass
+    finally:
+        source.close()
+        try:
+            out.detach()
+        except (BrokenPipeError, ValueError):
+            pass
+
 def main():
     parser = argparse.ArgumentParser(description="Afișează frumos action_table.csv sau result.csv (state x symbols).")
     parser.add_argument("--file", "-f", help="Fișier CSV (implicit: action_table.csv)", default="action_table.csv")
     parser.add_argument("--wrap", type=int, help="Lățimea maximă (în caractere) pentru coloane înainte de wrapping. 0 = fără wrap", default=30)
     parser.add_argument("--no-wrap", dest='no_wrap', help="Dezactivează wrapping (echivalent cu --wrap 0)", action='store_true')
     parser.add_argument("--pad", type=int, help="Număr spații padding stânga/dreapta în celule", default=1)
+    parser.add_argument("--stream", action='store_true', help="Afișare pe blocuri de stări, fără a încărca tot tabelul")
+    parser.add_argument("--states", help="Doar stările din interval, ex: 100-200 sau 100- (implică --stream)")
+    parser.add_argument("--symbols", help="Doar aceste coloane, ex: id,+,E (implică --stream)")
+    parser.add_argument("--block", type=int, help="Stări per bloc în modul --stream", default=256)
+    parser.add_argument("--sample", type=int, help="Stări folosite la estimarea lățimilor în modul --stream", default=256)
+    parser.add_argument("--exact-widths", dest='exact_widths', help="Lățimi exacte printr-o trecere rapidă (--stream)", action='store_true')
     args = parser.parse_args()
 
+    if args.stream or args.states or args.symbols:
+        stream_main(args)
+        return
+
     csv_file = args.file
     try:
         rows = read_all_rows(csv_file)
@@ -6,6 +6,9 @@ import sys
 
 ENDMARK = '$'
 EPS = 'ε'  # simbol folosit intern pentru epsilon
+ERROR = 'error'  # terminal rezervat pentru producții de eroare (ex: F -> ( error ))
+GLR_ACTION_FILE = 'glr_action_table.csv'  # fișierele implicite pentru --glr (glr.py)
+GLR_PROD_FILE = 'glr_result.csv'
 
 
 # -------------------------
@@ -17,6 +20,8 @@ def parse_grammar(text):
 
     Returnează un dictionar: Nonterminal -> listă de producții (fiecare producție este o listă de simboluri).
     - Productiile vide se reprezintă ca listă vidă.
+    - 'error' este un terminal rezervat: apare doar în partea dreaptă și marchează
+      punctele de revenire după erori (vezi error_recovery.py).
     """
     G = defaultdict(list)
     for line in text.splitlines():
@@ -27,6 +32,8 @@ def parse_grammar(text):
             raise ValueError(f"Lipsea '->' pe linia: {line}")
         left, right = line.split('->', 1)
         A = left.strip()
+        if A == ERROR:
+            raise ValueError(f"'{ERROR}' este terminal rezervat și nu poate apărea în stânga: {line}")
         alts = [alt.strip() for alt in right.split('|')]
         for alt in alts:
             if alt == '' or alt in ('ε', 'eps', 'empty'):
@@ -321,7 +328,25 @@ def format_action_cell_for_print(v):
 # ---------------------------------------------------
 # Export în formatele cerute de LRParser2 și table_reader
 # ---------------------------------------------------
-def export_action_and_prod_tables(action, goto, terminals, nonterms, num_states, prods_list, S_prime, filename_action="action_table.csv", filename_prod="result.csv"):
+def format_action_cell_for_export(entry, prod_index):
+    """Celula din action_table.csv pentru o acțiune: d3 / r2 / acc (gol dacă nu există)."""
+    if not entry:
+        return ""
+    if entry[0] == "shift":
+        # prefix 'd' pentru compatibilitate cu LRParser2 (care caută 'd...' la shift)
+        return "d" + str(entry[1])
+    elif entry[0] == "reduce":
+        A, rhs = entry[1]
+        prod_num = prod_index.get((A, tuple(rhs)))
+        if prod_num:
+            return "r" + prod_num
+        return "r?"  # fallback, arată că există o reducere dar fără număr
+    elif entry[0] == "accept":
+        return "acc"
+    return str(entry)
+
+
+def export_action_and_prod_tables(action, goto, terminals, nonterms, num_states, prods_list, S_prime, filename_action="action_table.csv", filename_prod="result.csv", conflicts=None):
     """
     Scrie două fișiere:
       - action_table.csv : fiecare rând = simbol, coloane = stare 0..N-1
@@ -329,6 +354,9 @@ def export_action_and_prod_tables(action, goto, terminals, nonterms, num_states,
           - Nonterminal rows: conțin numere GOTO (starea) sau gol.
       - result.csv : lista producțiilor numerotate (prod_num, LHS, RHS)
           - Notă: numerotarea produselor exclude producția augmentată S' -> S.
+    Dacă se dă lista `conflicts` (din build_parsing_table), celulele cu conflict
+    păstrează toate acțiunile, separate prin '|' (ex: d4|r2), pentru parserul GLR
+    (glr.py). Fără ea se exportă doar prima acțiune, ca până acum.
     Returnează dicționarul prod_index (mapping (A, rhs) -> prod_num ca string).
     """
     # Construim numerotarea producțiilor (începând de la 1) - LRParser2 se așteaptă la chei ca string
@@ -347,6 +375,13 @@ def export_action_and_prod_tables(action, goto, terminals, nonterms, num_states,
             prod_rows.append((str(idx), A, rhs_s))
             idx += 1
 
+    # Toate acțiunile celulelor cu conflict (prima este cea păstrată în `action`)
+    all_actions = {}
+    for _, sid, a, kept, other in conflicts or ():
+        entries = all_actions.setdefault((sid, a), [kept])
+        if other not in entries:
+            entries.append(other)
+
     # Simboluri pentru rânduri în action_table: terminale + $ și apoi nonterminale (GOTO)
     ter_list = sorted(list(terminals) + [ENDMARK])
     non_list = sorted(list(nonterms))
@@ -358,24 +393,9 @@ def export_action_and_prod_tables(action, goto, terminals, nonterms, num_states,
         for t in ter_list:
             row = [t]
             for s in range(num_states):
-                cell = ""
                 entry = action.get((s, t), "")
-                if entry:
-                    if entry[0] == "shift":
-                        # prefix 'd' pentru compatibilitate cu LRParser2 (care caută 'd...' la shift)
-                        cell = "d" + str(entry[1])
-                    elif entry[0] == "reduce":
-                        A, rhs = entry[1]
-                        prod_num = prod_index.get((A, tuple(rhs)))
-                        if prod_num:
-                            cell = "r" + prod_num
-                        else:
-                            cell = "r?"  # fallback, arată că există o reducere dar fără număr
-                    elif entry[0] == "accept":
-                        cell = "acc"
-                    else:
-                        cell = str(entry)
-                row.append(cell)
+                entries = all_actions.get((s, t), [entry])
+                row.append("|".join(format_action_cell_for_export(e, prod_index) for e in entries))
             writer.writerow(row)
         # Neterminale -> rânduri GOTO (valoarea celulei e numărul stării sau gol)
         for N in non_list:
@@ -395,6 +415,154 @@ def export_action_and_prod_tables(action, goto, terminals, nonterms, num_states,
     return prod_index
 
 
+# -------------------------
+# Detectarea gramaticilor de operatori (pentru evaluatorul cu precedență, pratt.py)
+# -------------------------
+def operator_precedence(G, start=None):
+    """
+    Recunoaște gramaticile de expresii cu operatori binari pe niveluri:
+
+        S -> E                    (opțional)
+        E -> E + T | E - T | T    (nivel 1: operatori la stânga -> asociativi la stânga)
+        T -> F ^ T | F            (nivel 2: operatori la dreapta -> asociativi la dreapta)
+        F -> ( E ) | id           (primar: atomi și grupări ale nivelului de sus)
+
+    Fiecare nivel are exact o producție unitară spre nivelul următor; precedența
+    crește cu nivelul. Întoarce dicționarul
+      {'start', 'top', 'levels', 'operators': {op: [precedență, 'left'|'right']},
+       'atoms': [...], 'groups': [[deschidere, închidere], ...]}
+    sau None dacă gramatica nu are această formă.
+    """
+    if not G:
+        return None
+    start = start if start is not None else next(iter(G))
+    top = start
+    if len(G[start]) == 1 and len(G[start][0]) == 1 and G[start][0][0] in G:
+        top = G[start][0][0]
+    operators = {}
+    levels = []
+    seen = {start} if top != start else set()
+    current = top
+    while True:
+        if current in seen:
+            return None
+        seen.add(current)
+        prods = G[current]
+        units = [rhs[0] for rhs in prods if len(rhs) == 1 and rhs[0] in G]
+        if not units:
+            break
+        if len(units) != 1:
+            return None
+        lower = units[0]
+        assoc = None
+        for rhs in prods:
+            if len(rhs) == 1 and rhs[0] == lower:
+                continue
+            if len(rhs) != 3 or rhs[1] in G or rhs[1] in operators:
+                return None
+            if rhs[0] == current and rhs[2] == lower:
+                side = 'left'
+            elif rhs[0] == lower and rhs[2] == current:
+                side = 'right'
+            else:
+                return None
+            if assoc not in (None, side):
+                return None
+            assoc = side
+            operators[rhs[1]] = [len(levels) + 1, side]
+        levels.append(current)
+        current = lower
+
+    # nivelul primar: atomi (un terminal) și grupări ( top )
+    atoms = []
+    groups = []
+    for rhs in G[current]:
+        if len(rhs) == 1 and rhs[0] not in G:
+            atoms.append(rhs[0])
+        elif len(rhs) == 3 and rhs[1] == top and rhs[0] not in G and rhs[2] not in G:
+            groups.append([rhs[0], rhs[2]])
+        else:
+            return None
+    levels.append(current)
+    used = set(seen) | {current}
+    symbols = set(atoms) | {s for g in groups for s in g}
+    if not atoms or set(G) - used or symbols & set(operators) or ERROR in symbols | set(operators):
+        return None
+    return {'start': start, 'top': top, 'levels': levels, 'operators': operators,
+            'atoms': atoms, 'groups': groups}
+
+
+# -------------------------
+# Layout după profil (table_profile.py): stările și simbolurile fierbinți primele
+# -------------------------
+def layout_order(state_hits, symbol_hits, num_states, terminals, nonterms):
+    """
+    Ordinea nouă a stărilor și a rândurilor din action_table.csv.
+    Starea 0 rămâne prima (parserele pornesc din starea 0), apoi stările
+    descrescător după numărul de accesări; terminalele și apoi neterminalele,
+    fiecare grup descrescător după accesări. La egalitate se păstrează ordinea veche.
+    Ordinea grupează celulele fierbinți pentru rânduri pe simbol (ca lr_tables);
+    nu promite un câștig de throughput (vezi table_profile.py --bench).
+    """
+    state_order = [0] + sorted(range(1, num_states), key=lambda s: (-state_hits.get(s, 0), s))
+    symbol_order = []
+    for group in (terminals, nonterms):
+        symbol_order += sorted(group, key=lambda x: (-symbol_hits.get(x, 0), group.index(x)))
+    return state_order, symbol_order
+
+
+def apply_layout(rows, state_order, symbol_order=None):
+    """
+    Renumerotează stările unei tabele exportate (simbol -> celule, ca în action_table.csv):
+    coloana nouă i este starea veche state_order[i], iar țintele d<N> și
+    numerele GOTO sunt traduse. Producțiile (r<N>) nu se schimbă.
+    """
+    new_id = {old: new for new, old in enumerate(state_order)}
+
+    def renumber(cell):
+        parts = []
+        for part in cell.split("|"):
+            part = part.strip()
+            if part.startswith("d") and part[1:].isdigit():
+                part = "d" + str(new_id[int(part[1:])])
+            elif part.isdigit():
+                part = str(new_id[int(part)])
+            parts.append(part)
+        return "|".join(parts)
+
+    return {sym: [renumber(rows[sym][old]) if old < len(rows[sym]) else "" for old in state_order]
+            for sym in (symbol_order or rows)}
+
+
+def layout_exported_tables(profile, filename_action="action_table.csv", filename_prod="result.csv", output=None):
+    """
+    Aplică layout-ul dintr-un profil (JSON scris de table_profile.py) pe tabelele
+    exportate. Profilul trebuie să fi fost înregistrat pe exact aceste fișiere
+    (numerotarea stărilor diferă între regenerări).
+    """
+    from lr_tables import tables_hash
+
+    if profile.get("tables_sha256") != tables_hash(filename_action, filename_prod):
+        raise ValueError("Profilul a fost înregistrat pe alte tabele; reprofilați după regenerare")
+    with open(filename_action, newline='', encoding='utf-8') as f:
+        rows = {row[0]: row[1:] for row in csv.reader(f) if row}
+    num_states = max(len(cells) for cells in rows.values())
+    terminals = list(profile["terminals"])
+    nonterms = list(profile["nonterminals"])
+    state_hits = defaultdict(int)
+    symbol_hits = defaultdict(int)
+    for state, symbol, hits in profile["cells"] + profile["gotos"]:
+        state_hits[state] += hits
+        symbol_hits[symbol] += hits
+    state_order, symbol_order = layout_order(state_hits, symbol_hits, num_states, terminals, nonterms)
+    new_rows = apply_layout(rows, state_order, symbol_order)
+    with open(output or filename_action, "w", newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for sym, cells in new_rows.items():
+            writer.writerow([sym] + cells)
+    return state_order, symbol_order
+
+
 # Exemplu de gramatică folosit când nu este furnizat fișier
 def example_grammar_text():
     return """
@@ -411,9 +579,33 @@ F -> ( E ) | id
 def main():
     parser = argparse.ArgumentParser(description="Generator tabele LR(1) și export action_table.csv + result.csv.")
     parser.add_argument("--file", "-f", help="Fișier text cu gramatica", default=None)
-    parser.add_argument("--action", help="Nume fișier action table output", default="action_table.csv")
-    parser.add_argument("--prod", help="Nume fișier productions output", default="result.csv")
+    parser.add_argument("--action", help="Nume fișier action table output (implicit action_table.csv, glr_action_table.csv cu --glr)", default=None)
+    parser.add_argument("--prod", help="Nume fișier productions output (implicit result.csv, glr_result.csv cu --glr)", default=None)
+    parser.add_argument("--glr", action="store_true", help="Păstrează toate acțiunile din celulele cu conflict (d4|r2), pentru glr.py")
+    parser.add_argument("--precedence", metavar="JSON", help="Dacă gramatica este de operatori, scrie precedențele și asociativitatea (pentru pratt.py)")
+    parser.add_argument("--layout", metavar="PROFIL", help="Nu construiește tabele: renumerotează stările din --action după un profil (table_profile.py)")
+    parser.add_argument("--layout-output", help="Unde se scrie tabela reordonată (implicit peste --action)")
     args = parser.parse_args()
+    # tabelele cu celule 'd4|r2' nu sunt scrise peste cele citite de LRParser2
+    if args.action is None:
+        args.action = GLR_ACTION_FILE if args.glr else "action_table.csv"
+    if args.prod is None:
+        args.prod = GLR_PROD_FILE if args.glr else "result.csv"
+
+    if args.layout:
+        import json
+
+        with open(args.layout, encoding='utf-8') as fh:
+            profile = json.load(fh)
+        try:
+            state_order, symbol_order = layout_exported_tables(profile, args.action, args.prod, args.layout_output)
+        except ValueError as e:
+            print(f"Eroare: {e}", file=sys.stderr)
+            sys.exit(2)
+        print(f"Stări (noua ordine): {state_order}")
+        print(f"Simboluri: {symbol_order}")
+        print(f"Am scris {args.layout_output or args.action}")
+        return
 
     if args.file:
         try:
@@ -450,7 +642,19 @@ def main():
     terminals, nonterms = compute_terminals_and_nonterminals(G_aug)
 
     # Exportăm action_table.csv și result.csv (compatibil cu LRParser2)
-    prod_index = export_action_and_prod_tables(ACTION, GOTO, terminals, nonterms, len(states), prods_list, S_prime, filename_action=args.action, filename_prod=args.prod)
+    prod_index = export_action_and_prod_tables(ACTION, GOTO, terminals, nonterms, len(states), prods_list, S_prime, filename_action=args.action, filename_prod=args.prod, conflicts=conflicts if args.glr else None)
+
+    if args.precedence:
+        import json
+
+        spec = operator_precedence(G)
+        if spec is None:
+            print("Gramatica nu este o gramatică de operatori: pratt.py va folosi parserul LR.")
+        else:
+            with open(args.precedence, "w", encoding='utf-8') as fh:
+                json.dump(spec, fh, indent=2)
+            ops = ", ".join(f"{op} ({prec}, {assoc})" for op, (prec, assoc) in spec["operators"].items())
+            print(f"Gramatică de operatori: {ops}; am creat {args.precedence}")
 
     # Afișăm conflictele (dacă există) pentru debugging
     if conflicts:
@@ -1,4 +1,9 @@
 import csv
+import re
+
+from codegen import ValueNumbering, CompactCodeGen
+from lr_tables import Tables, SHIFT, REDUCE, ACCEPT
+from translation import TranslationScheme, TranslationContext, NOOP, COPY, EMPTY
 
 """
 tema4.py - Push Down Translator pentru expresii aritmetice
@@ -38,6 +43,13 @@ def read_prod():
 action_table = read_action_table()
 prod = read_prod()
 
+# Lexeme acceptate pentru terminalul 'id' pe lângă 'id' însuși, doar cu lexemes=True:
+# nume de variabile (x, total_1) și constante numerice (42, 2.5). Simbolurile
+# gramaticii (terminale și neterminale, ex: 'E') nu sunt niciodată lexeme.
+ID_LEXEME_RE = re.compile(r'(?:[A-Za-z_]\w*|\d+(?:\.\d+)?)$')
+# tabelele decodate o singură dată (imutabile, partajabile între thread-uri)
+TABLES = Tables(action_table, prod)
+
 # Optional: afișare tabelă și producții (pentru debugging)
 DEBUG_MODE = False
 if DEBUG_MODE:
@@ -51,8 +63,131 @@ if DEBUG_MODE:
 # ============================================================================
 # PUSH DOWN TRANSLATOR - Adăugiri noi față de LRParser2.py
 # ============================================================================
+# TranslationContext (stivele, contoarele și codul unei traduceri) este în
+# translation.py, împreună cu schema de traducere; îl folosește și push_parser.
+
+# ============================================================================
+# SCHEMA DE TRADUCERE pentru gramatica E/T/F
+# Acțiunile sunt legate de producții (nu de numerele din result.csv)
+# ============================================================================
+
+ARITHMETIC_SCHEME = TranslationScheme(strict=True)
+
+# Copieri: S -> E, E -> T, T -> F, F -> id devin no-op (valoarea rămâne pe stivă)
+ARITHMETIC_SCHEME.copy("S -> E", describe="S.val = E.val")
+ARITHMETIC_SCHEME.copy("E -> T", describe="E.val = T.val")
+ARITHMETIC_SCHEME.copy("T -> F", describe="T.val = F.val")
+ARITHMETIC_SCHEME.copy("F -> id", describe="F.val = id.val")
+ARITHMETIC_SCHEME.copy("F -> ( E )", index=1, describe="F.val = E.val")
+
+
+@ARITHMETIC_SCHEME.action("E -> E + T")
+def add_action(ctx, v):
+    e_val, t_val = v[0], v[2]
+    result_value = e_val + t_val
+    if ctx.verbose:
+        print(f"  Semantic action: E.val = E.val + T.val = {e_val} + {t_val} = {result_value}")
+    ctx.emit(f"{ctx.new_temp()} = {e_val} + {t_val}")
+    return result_value
+
+
+@ARITHMETIC_SCHEME.action("T -> T * F")
+def mul_action(ctx, v):
+    t_val, f_val = v[0], v[2]
+    result_value = t_val * f_val
+    if ctx.verbose:
+        print(f"  Semantic action: T.val = T.val * F.val = {t_val} * {f_val} = {result_value}")
+    ctx.emit(f"{ctx.new_temp()} = {t_val} * {f_val}")
+    return result_value
+
+
+# ============================================================================
+# SCHEMA OPTIMIZATĂ: atributele sunt noduri din DAG (codegen.Operand), codul
+# se generează prin value numbering (CSE + constant folding)
+# ============================================================================
+
+OPTIMIZING_SCHEME = TranslationScheme(strict=True)
+OPTIMIZING_SCHEME.copy("S -> E", describe="S.val = E.val")
+OPTIMIZING_SCHEME.copy("E -> T", describe="E.val = T.val")
+OPTIMIZING_SCHEME.copy("T -> F", describe="T.val = F.val")
+OPTIMIZING_SCHEME.copy("F -> id", describe="F.val = id.val")
+OPTIMIZING_SCHEME.copy("F -> ( E )", index=1, describe="F.val = E.val")
+
+
+@OPTIMIZING_SCHEME.on_start
+def start_value_numbering(ctx):
+    ctx.codegen = ValueNumbering(lambda dst, op, a, b: ctx.emit(f"{dst} = {a} {op} {b}"), ctx.new_temp)
+
+
+@OPTIMIZING_SCHEME.on_leaf
+def leaf_operand(ctx, lexeme, value):
+    return ctx.codegen.leaf(lexeme, value)
+
+
+@OPTIMIZING_SCHEME.on_result
+def operand_value(ctx, operand):
+    return operand.value if operand is not None else None
+
+
+@OPTIMIZING_SCHEME.action("E -> E + T")
+def add_optimized(ctx, v):
+    result = ctx.codegen.binop('+', v[0], v[2])
+    if ctx.verbose:
+        print(f"  Semantic action: E.val = {v[0].ref} + {v[2].ref} -> {result.ref} = {result.value}")
+    return result
+
+
+@OPTIMIZING_SCHEME.action("T -> T * F")
+def mul_optimized(ctx, v):
+    result = ctx.codegen.binop('*', v[0], v[2])
+    if ctx.verbose:
+        print(f"  Semantic action: T.val = {v[0].ref} * {v[2].ref} -> {result.ref} = {result.value}")
+    return result
+
+
+# ============================================================================
+# SCHEMA COMPACTĂ: instrucțiuni codificate ca întregi, temporare refolosite
+# ============================================================================
+
+COMPACT_SCHEME = TranslationScheme(strict=True)
+COMPACT_SCHEME.copy("S -> E")
+COMPACT_SCHEME.copy("E -> T")
+COMPACT_SCHEME.copy("T -> F")
+COMPACT_SCHEME.copy("F -> id")
+COMPACT_SCHEME.copy("F -> ( E )", index=1)
+
+
+@COMPACT_SCHEME.on_start
+def start_compact(ctx):
+    if ctx.sink is not None:
+        raise ValueError("schema compactă păstrează codul în InstructionBuffer, nu poate fi folosită cu sink")
+    ctx.codegen = CompactCodeGen()
+    ctx.intermediate_code = ctx.codegen.code
+
+
+@COMPACT_SCHEME.on_leaf
+def leaf_compact(ctx, lexeme, value):
+    return ctx.codegen.leaf(lexeme, value)
+
+
+COMPACT_SCHEME.on_result(operand_value)
 
-def parse_and_evaluate(input_string):
+
+def compact_binop(op):
+    def action(ctx, v):
+        result = ctx.codegen.binop(op, v[0], v[2])
+        if ctx.verbose:
+            print(f"  Intermediate code: {ctx.intermediate_code[-1]}")
+        return result
+    return action
+
+
+COMPACT_SCHEME.action("E -> E + T")(compact_binop('+'))
+COMPACT_SCHEME.action("T -> T * F")(compact_binop('*'))
+
+
+def parse_and_evaluate(input_string, verbose=True, optimize=False, compact=False, sink=None, profile=None,
+                       lexemes=False):
     """
     Parser LR cu stivă de atribute pentru evaluarea expresiilor aritmetice.
     
@@ -63,188 +198,190 @@ def parse_and_evaluate(input_string):
     
     Args:
         input_string: expresie aritmetică (ex: "id + id * id")
+        verbose: dacă False, nu se afișează pașii parsării
+        optimize: generează codul cu value numbering / CSE / constant folding
+                  (OPTIMIZING_SCHEME, vezi codegen.py)
+        compact: codul este un codegen.InstructionBuffer (instrucțiuni codificate
+                 ca întregi, temporare refolosite); liniile text se generează la cerere
+        sink: funcție apelată cu fiecare instrucțiune imediat ce este generată
+              (vezi code_sink.py); codul nu mai este păstrat în listă
+        profile: opțional, table_profile.TableProfile (numără celulele și producțiile folosite)
+        lexemes: acceptă și nume de variabile / constante numerice pentru 'id'
+                 (ex: "( a + 2 ) * a"); implicit doar terminalele gramaticii, ca LRParser2
     
     Returns:
         Tuple (success: bool, result: int/None, intermediate_code: list)
     """
-    state_stack = [0]  # stiva de stari cu 0
-    token_stack = ['$']  # stiva de tokeni cu simbolul de start
-    
-    # ===== NOUĂ STIVĂ DE ATRIBUTE =====
-    # Păstrează valori semantice (numere) pentru fiecare simbol din token_stack
-    attribute_stack = [None]  # corespunde cu '$'
-    
-    # Pentru generarea de cod intermediar
-    intermediate_code = []
-    temp_counter = 0  # counter pentru variabile temporare
-    
-    # Procesăm input-ul
-    input_tokens = input_string.split() + ['$']
-    pointer = 0
-    
-    # Pentru a simula valori pentru 'id', le înlocuim cu numere
-    # În practică, valorile ar veni dintr-o tabelă de simboluri
-    id_counter = 1
-    
-    def get_id_value(token):
-        """Returnează o valoare pentru un identificator"""
-        nonlocal id_counter
-        if token == 'id':
-            # Simulăm că fiecare 'id' are valoarea 1, 2, 3, etc.
-            val = id_counter
-            id_counter += 1
-            return val
-        return None
+    if optimize and compact:
+        raise ValueError("optimize și compact nu pot fi folosite împreună")
+    scheme = OPTIMIZING_SCHEME if optimize else COMPACT_SCHEME if compact else None
+    return evaluate_tokens(input_string.split(), verbose=verbose, scheme=scheme, sink=sink, profile=profile,
+                           lexemes=lexemes)
+
+
+def evaluate_tokens(tokens, verbose=True, tables=None, scheme=None, sink=None, profile=None, lexemes=False):
+    """
+    Același translator ca parse_and_evaluate, dar primește orice iterabil de
+    terminale (listă, generator, scanner peste un fișier mmap - vezi mmap_input.py).
+
+    Tokenii sunt consumați unul câte unul și nu sunt păstrați într-o listă,
+    deci memoria depinde doar de adâncimea stivei (plus codul intermediar).
+
+    tables: un lr_tables.Tables (implicit cel încărcat la import). Tabelele sunt
+    imutabile și toată starea parsării stă într-un TranslationContext nou la
+    fiecare apel, deci funcția poate fi apelată simultan din mai multe thread-uri.
+
+    scheme: un translation.TranslationScheme (implicit ARITHMETIC_SCHEME, pentru
+    gramatica E/T/F); acțiunile sunt legate de producții, nu de numerele lor.
+
+    sink: funcție line -> None care primește codul intermediar pe măsură ce este
+    generat; lista întoarsă rămâne goală, deci memoria nu crește cu inputul.
+
+    profile: opțional, un table_profile.TableProfile care numără accesările
+    celulelor ACTION / GOTO și reducerile (fără profile nu se numără nimic).
+
+    lexemes: dacă True, un token care nu este simbol al gramaticii și arată ca
+    un nume sau un număr (ID_LEXEME_RE) este citit ca terminalul 'id', cu
+    lexemul păstrat (același nume, aceeași valoare; numerele își dau valoarea).
+    Implicit (False) sunt acceptate aceleași inputuri ca la LRParser2.
+    """
+    if tables is None:
+        tables = TABLES
+    if scheme is None:
+        scheme = ARITHMETIC_SCHEME
+    actions = scheme.compile(tables)
+    leaf = scheme.leaf
+    ctx = TranslationContext(verbose, sink)
+    if scheme.start is not None:
+        scheme.start(ctx)
+    state_stack = ctx.state_stack
+    token_stack = ctx.token_stack
+    attribute_stack = ctx.attribute_stack
+    intermediate_code = ctx.intermediate_code
+    get_id_value = ctx.get_id_value
     
-    def new_temp():
-        """Generează o nouă variabilă temporară"""
-        nonlocal temp_counter
-        temp_counter += 1
-        return f"t{temp_counter}"
+    # Procesăm input-ul (token cu token, '$' la sfârșit)
+    input_tokens = iter(tokens)
+    current_token = next(input_tokens, '$')
     
     while True:
         current_state = state_stack[-1]
-        current_token = input_tokens[pointer]
         
-        try:
-            action = action_table.get(current_token, [])[current_state]
-        except IndexError:
-            print("Input rejected: Invalid state or token.")
+        row = tables.action.get(current_token)
+        lexeme = None
+        if row is None and lexemes and current_token not in tables.goto and ID_LEXEME_RE.match(current_token):
+            # nume de variabilă sau constantă -> terminalul 'id' (păstrăm lexemul)
+            lexeme, current_token = current_token, 'id'
+            row = tables.action.get(current_token)
+        if profile is not None:
+            profile.cell(current_state, current_token)
+        if row is None or current_state >= len(row):
+            if verbose:
+                print("Input rejected: Invalid state or token.")
+            return False, None, intermediate_code
+        action = row[current_state]
+        if action is None:
+            if verbose:
+                print("Input rejected.")
             return False, None, intermediate_code
+        kind, arg = action
         
         # ===== ACȚIUNE DE DEPLASARE (SHIFT) =====
-        if action.startswith('d'):
-            next_state = int(action[1:])
+        if kind == SHIFT:
+            next_state = arg
             state_stack.append(next_state)
             token_stack.append(current_token)
             
             # ===== PUSH LA STIVA DE ATRIBUTE =====
             # Dacă e 'id', punem valoarea lui; altfel, punem operatorul
             if current_token == 'id':
-                value = get_id_value(current_token)
-                attribute_stack.append(value)
-                print(f"Shift: Move to state {next_state}, consume '{current_token}' with value {value}")
+                value = get_id_value(current_token, lexeme)
+                attribute_stack.append(value if leaf is None else leaf(ctx, lexeme, value))
+                if verbose:
+                    print(f"Shift: Move to state {next_state}, consume '{lexeme or current_token}' with value {value}")
             else:
                 attribute_stack.append(current_token)
-                print(f"Shift: Move to state {next_state}, consume '{current_token}'")
+                if verbose:
+                    print(f"Shift: Move to state {next_state}, consume '{current_token}'")
             
-            pointer += 1
+            if current_token != '$':
+                current_token = next(input_tokens, '$')
             
         # ===== ACȚIUNE DE REDUCERE (REDUCE) =====
-        elif action.startswith('r'):
-            prod_number = action[1:]
-            entry = prod.get(prod_number)
+        elif kind == REDUCE:
+            prod_number = arg
+            entry = actions[prod_number] if prod_number < len(actions) else None
             if not entry:
-                print(f"Input rejected: Unknown production {prod_number}.")
+                if verbose:
+                    print(f"Input rejected: Unknown production {prod_number}.")
                 return False, None, intermediate_code
             
-            lhs = entry[0]  # partea stanga
-            rhs = entry[1].strip() if len(entry) > 1 else ''  # partea dreapta
-            rhs_tokens = rhs.split() if rhs else []
-            rhs_length = len(rhs_tokens)
-            
-            # Colectăm atributele pentru evaluare
-            reduced_attributes = []
-            for i in range(rhs_length):
-                state_stack.pop()
-                token = token_stack.pop()
-                attr = attribute_stack.pop()
-                reduced_attributes.append((token, attr))
-            
-            # Inversăm pentru a obține ordinea corectă (left-to-right)
-            reduced_attributes.reverse()
+            lhs, rhs_tokens, rhs_length, op, op_arg, describe = entry
+            if verbose:
+                print(f"Reduce: Using production {prod_number}: {lhs} -> {' '.join(rhs_tokens)}")
             
             # ===== ACȚIUNI SEMANTICE (EVALUARE) =====
-            result_value = None
-            
-            # Producție 1: S -> E
-            if prod_number == '1':
-                # S moștenește valoarea lui E
-                result_value = reduced_attributes[0][1] if reduced_attributes else None
-                print(f"Reduce: Using production {prod_number}: {lhs} -> {rhs}")
-                print(f"  Semantic action: S.val = E.val = {result_value}")
-            
-            # Producție 2: E -> E + T
-            elif prod_number == '2':
-                e_val = reduced_attributes[0][1]
-                t_val = reduced_attributes[2][1]
-                result_value = e_val + t_val
-                temp = new_temp()
-                intermediate_code.append(f"{temp} = {e_val} + {t_val}")
-                print(f"Reduce: Using production {prod_number}: {lhs} -> {rhs}")
-                print(f"  Semantic action: E.val = E.val + T.val = {e_val} + {t_val} = {result_value}")
-                print(f"  Intermediate code: {temp} = {e_val} + {t_val}")
-            
-            # Producție 3: E -> T
-            elif prod_number == '3':
-                result_value = reduced_attributes[0][1]
-                print(f"Reduce: Using production {prod_number}: {lhs} -> {rhs}")
-                print(f"  Semantic action: E.val = T.val = {result_value}")
-            
-            # Producție 4: T -> T * F
-            elif prod_number == '4':
-                t_val = reduced_attributes[0][1]
-                f_val = reduced_attributes[2][1]
-                result_value = t_val * f_val
-                temp = new_temp()
-                intermediate_code.append(f"{temp} = {t_val} * {f_val}")
-                print(f"Reduce: Using production {prod_number}: {lhs} -> {rhs}")
-                print(f"  Semantic action: T.val = T.val * F.val = {t_val} * {f_val} = {result_value}")
-                print(f"  Intermediate code: {temp} = {t_val} * {f_val}")
-            
-            # Producție 5: T -> F
-            elif prod_number == '5':
-                result_value = reduced_attributes[0][1]
-                print(f"Reduce: Using production {prod_number}: {lhs} -> {rhs}")
-                print(f"  Semantic action: T.val = F.val = {result_value}")
-            
-            # Producție 6: F -> ( E )
-            elif prod_number == '6':
-                e_val = reduced_attributes[1][1]
-                result_value = e_val
-                print(f"Reduce: Using production {prod_number}: {lhs} -> {rhs}")
-                print(f"  Semantic action: F.val = E.val = {result_value}")
-            
-            # Producție 7: F -> id
-            elif prod_number == '7':
-                result_value = reduced_attributes[0][1]
-                print(f"Reduce: Using production {prod_number}: {lhs} -> {rhs}")
-                print(f"  Semantic action: F.val = id.val = {result_value}")
-            
+            # Acțiunea vine din lista compilată (indexată după numărul producției)
+            if op == NOOP:
+                # A -> X: valoarea lui X rămâne pe stiva de atribute
+                state_stack.pop()
+                token_stack[-1] = lhs
+                if verbose and describe:
+                    print(f"  Semantic action: {describe} = {attribute_stack[-1]}")
             else:
-                print(f"Reduce: Using production {prod_number}: {lhs} -> {rhs}")
-                result_value = None
-            
-            # Adăugăm simbolul redus pe stiva
-            token_stack.append(lhs)
-            attribute_stack.append(result_value)
+                if op == EMPTY:
+                    result_value = None
+                else:
+                    # Colectăm atributele pentru evaluare (ordinea left-to-right)
+                    values = attribute_stack[-rhs_length:]
+                    del state_stack[-rhs_length:]
+                    del token_stack[-rhs_length:]
+                    del attribute_stack[-rhs_length:]
+                    if op == COPY:
+                        result_value = values[op_arg]
+                        if verbose and describe:
+                            print(f"  Semantic action: {describe} = {result_value}")
+                    else:
+                        result_value = op_arg(ctx, values)
+                
+                # Adăugăm simbolul redus pe stiva
+                token_stack.append(lhs)
+                attribute_stack.append(result_value)
             
             # GOTO
-            try:
-                goto_cell = action_table.get(lhs, [])[state_stack[-1]]
-                goto_state = int(goto_cell)
-            except (IndexError, ValueError):
-                print("Input rejected: Invalid goto for reduction.")
+            if profile is not None:
+                profile.goto(state_stack[-1], lhs)
+                profile.production(prod_number)
+            goto_state = tables.goto_state(state_stack[-1], lhs)
+            if goto_state is None:
+                if verbose:
+                    print("Input rejected: Invalid goto for reduction.")
                 return False, None, intermediate_code
             
             state_stack.append(goto_state)
-            print(f"  Goto state {goto_state}")
+            if verbose:
+                print(f"  Goto state {goto_state}")
         
         # ===== ACCEPTARE =====
-        elif action in ('acc', 'accept'):
-            print("\n" + "="*60)
-            print("Input accepted!")
+        elif kind == ACCEPT:
+            if verbose:
+                print("\n" + "="*60)
+                print("Input accepted!")
             # Rezultatul final este pe stiva de atribute
             # După ultima reducere la S, avem: token_stack = ['$', 'S']
             # și attribute_stack = [None (pentru $), result (pentru S)]
             # Deci rezultatul este pe ultima poziție: attribute_stack[-1]
             final_result = attribute_stack[-1] if len(attribute_stack) >= 1 else None
-            print(f"Final result: {final_result}")
-            print("="*60)
+            if scheme.result is not None:
+                final_result = scheme.result(ctx, final_result)
+            if verbose:
+                print(f"Final result: {final_result}")
+                print("="*60)
             return True, final_result, intermediate_code
         
         else:
-            print("Input rejected.")
+            if verbose:
+                print("Input rejected.")
             return False, None, intermediate_code
 
 
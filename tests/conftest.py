@@ -0,0 +1,7 @@
+import os
+import sys
+
+# modulele citesc action_table.csv / result.csv din directorul curent la import
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
@@ -0,0 +1,42 @@
+import sys
+
+import pytest
+
+import bench_suite
+
+
+def _case(name, p50):
+    return {'case': name, 'p50_s': p50}
+
+
+def test_compare_reports_regressions_and_missing_cases():
+    baseline = {'results': [_case('a', 1.0), _case('b', 1.0)]}
+    results = [_case('a', 2.0), _case('b', 1.1), _case('c', 1.0)]
+    assert bench_suite.compare(results, baseline, 0.25) == ([('a', 2.0)], ['c'])
+
+
+def test_disjoint_baseline_fails(tmp_path, monkeypatch):
+    path = tmp_path / 'baseline.json'
+    path.write_text('{"results": [{"case": "other", "p50_s": 1.0}]}')
+    monkeypatch.setattr(sys, 'argv', ['bench_suite.py', '--sizes', '10', '--shapes', 'sum', '--apis', 'parse_input',
+                                      '--repeats', '1', '--no-alloc', '--baseline', str(path)])
+    with pytest.raises(SystemExit) as exc:
+        bench_suite.main()
+    assert exc.value.code == 2
+
+
+@pytest.mark.parametrize("size", [1, 3, 10, 20, 32, 33, 34, 101])
+def test_nested_shape_fits_every_size(size):
+    tokens = bench_suite.make_expression('nested', size).split()
+    depth = min(bench_suite.NESTING, (size - 1) // 2)
+    assert tokens[:depth] == ['('] * depth and tokens[len(tokens) - depth:] == [')'] * depth
+    assert size - 1 <= len(tokens) <= size
+    assert bench_suite.LRParser2.parse_input(' '.join(tokens), verbose=False)
+
+
+def test_small_nested_sizes_are_not_skipped():
+    import io
+
+    results = bench_suite.run_suite([10, 20], ['nested'], ['parse_input'], repeats=1, allocations=False,
+                                    out=io.StringIO())
+    assert [r['case'] for r in results] == ['parse_input/nested/n=10', 'parse_input/nested/n=20']
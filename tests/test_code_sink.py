@@ -0,0 +1,35 @@
+import threading
+
+import pytest
+
+from code_sink import CodeStream
+from mmap_input import iter_tokens, open_buffer, write_sample
+
+
+def test_full_stream():
+    stream = CodeStream('id + id * id'.split())
+    assert list(stream) == ['t1 = 2 * 3', 't2 = 1 + 6']
+    assert (stream.success, stream.result) == (True, 7)
+
+
+def test_early_stop_releases_thread_and_mapping(tmp_path):
+    path = tmp_path / 'expr.txt'
+    write_sample(str(path), 50_000)
+    before = threading.active_count()
+    with open_buffer(str(path)) as buf:
+        with CodeStream(iter_tokens(buf), maxsize=4) as stream:
+            for i, _ in enumerate(stream):
+                if i == 3:
+                    break
+        assert not stream._thread.is_alive()
+    assert threading.active_count() == before
+
+
+def test_open_buffer_reports_live_token_generator(tmp_path):
+    path = tmp_path / 'expr.txt'
+    path.write_text('id + id\n')
+    with pytest.raises(BufferError):
+        with open_buffer(str(path)) as buf:
+            tokens = iter_tokens(buf)
+            next(tokens)
+    tokens.close()
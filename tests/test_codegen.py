@@ -0,0 +1,48 @@
+import tema4
+from codegen import CompactCodeGen, InstructionBuffer
+
+
+def optimized(text):
+    return tema4.parse_and_evaluate(text, verbose=False, optimize=True, lexemes=True)
+
+
+def test_int_and_float_constants_stay_distinct():
+    assert optimized("a + 2.0 + 2") == (True, 5.0, ['t1 = a + 2.0', 't2 = t1 + 2'])
+
+
+def test_identity_folding_keeps_result_type():
+    assert optimized("a + 0") == (True, 1, [])
+    assert optimized("a + 0.0") == (True, 1.0, ['t1 = a + 0.0'])
+    assert optimized("a * 0.0 + 1")[1] == 1.0
+
+
+def test_common_subexpressions_are_shared():
+    ok, value, code = optimized("( a + b ) * c + ( b + a ) * c")
+    assert code == ['t1 = a + b', 't2 = t1 * c', 't3 = t2 + t2']
+
+
+def test_instruction_buffer_behaves_like_a_list():
+    ok, value, code = tema4.parse_and_evaluate("a + 2.0 + 2 * b", verbose=False, compact=True, lexemes=True)
+    assert isinstance(code, InstructionBuffer)
+    lines = list(code)
+    assert lines == ['t1 = a + 2.0', 't2 = 2 * b', 't2 = t1 + t2']
+    assert code[:] == lines
+    assert code[1:] == lines[1:]
+    assert code[::-1] == lines[::-1]
+    assert code[-1] == lines[-1]
+    assert code == lines
+
+
+def test_constant_pool_keeps_types():
+    gen = CompactCodeGen()
+    assert gen.code.const(2) != gen.code.const(2.0)
+    assert gen.code.consts == [2, 2.0]
+
+
+def test_compact_encoding_size():
+    ok, value, code = tema4.parse_and_evaluate("( a + b ) * ( c + 1 ) + a * 2.5", verbose=False, compact=True,
+                                               lexemes=True)
+    assert len(code) == 5
+    assert code.nbytes() == 13 * len(code)
+    assert code.registers() == 2
+    assert list(code) == ['t1 = a + b', 't2 = c + 1', 't2 = t1 * t2', 't1 = a * 2.5', 't1 = t2 + t1']
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from column_eval import ColumnPlan, evaluate_columns
+from compiled_expr import compile_expression
+
+EXPR = "( x + y ) * z + x * ( y + 2 ) * z"
+
+
+def test_matches_row_by_row_evaluation():
+    rng = np.random.default_rng(1)
+    columns = {name: rng.integers(-50, 50, 200) for name in ('x', 'y', 'z')}
+    f = compile_expression(EXPR)
+    expected = [f(x=int(a), y=int(b), z=int(c)) for a, b, c in zip(columns['x'], columns['y'], columns['z'])]
+    assert evaluate_columns(EXPR, columns).tolist() == expected
+
+
+def test_mismatched_lengths_are_rejected():
+    with pytest.raises(ValueError, match="lungimi diferite: x=3, y=5"):
+        evaluate_columns("x + y", {'x': np.arange(3), 'y': np.arange(5)})
+
+
+def test_two_dimensional_column_is_rejected():
+    with pytest.raises(ValueError, match="1-D"):
+        evaluate_columns("x + 1", {'x': np.ones((2, 2))})
+
+
+def test_missing_column():
+    with pytest.raises(KeyError, match="Lipsește coloana 'y'"):
+        evaluate_columns("x + y", {'x': np.arange(3)})
+
+
+def test_small_integer_dtypes_do_not_overflow():
+    x = np.array([100, 120, -128], dtype=np.int8)
+    result = evaluate_columns("x * x + 300", {'x': x})
+    assert result.dtype == np.int64
+    assert result.tolist() == [10300, 14700, 16684]
+
+
+def test_bool_columns_are_counted_not_or_ed():
+    flags = np.array([True, True, False])
+    assert evaluate_columns("a + b", {'a': flags, 'b': flags}).tolist() == [2, 2, 0]
+
+
+def test_float32_is_computed_in_float64():
+    x = np.array([1e30], dtype=np.float32)
+    result = evaluate_columns("x * x", {'x': x})
+    assert result.dtype == np.float64
+    assert np.isfinite(result).all()
+
+
+def test_chunks_reuse_buffers_and_give_same_result():
+    plan = ColumnPlan(EXPR)
+    columns = {name: np.arange(10) + i for i, name in enumerate(('x', 'y', 'z'))}
+    whole = plan.evaluate(columns)
+    chunks = ({n: c[i:i + 4] for n, c in columns.items()} for i in range(0, 10, 4))
+    parts = list(plan.evaluate_chunks(chunks))
+    assert np.concatenate(parts).tolist() == whole.tolist()
+
+
+def test_constant_expression_fills_rows():
+    assert evaluate_columns("2 * 3", {}).tolist() == [6]
+
+
+def test_single_column_result_is_widened_too():
+    result = evaluate_columns("x", {'x': np.array([1, 2], dtype=np.int16)})
+    assert result.dtype == np.int64
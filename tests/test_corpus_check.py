@@ -0,0 +1,75 @@
+import shutil
+
+import pytest
+
+import batch
+from corpus_check import validate_corpus
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / 'corpus'
+    root.mkdir()
+    (root / 'a.txt').write_text("id + id\n")
+    (root / 'b.txt').write_text("id *\n+ id\n")         # respins la tokenul 2
+    (root / 'c.txt').write_text("id + id\n")           # același conținut ca a.txt
+    (root / 'd.txt').write_text("( id + id ) * id\n")
+    return root
+
+
+@pytest.fixture
+def tables(tmp_path):
+    action, prod = tmp_path / 'action_table.csv', tmp_path / 'result.csv'
+    shutil.copy('action_table.csv', action)
+    shutil.copy('result.csv', prod)
+    return str(action), str(prod)
+
+
+def check(root, tables, **kwargs):
+    return validate_corpus(str(root), workers=0, action_path=tables[0], prod_path=tables[1], **kwargs)
+
+
+def test_results_and_duplicate_content_parsed_once(corpus, tables):
+    report = check(corpus, tables)
+    assert (report['files'], report['parsed'], report['cached']) == (4, 3, 0)
+    by_path = {r['path']: r for r in report['results']}
+    assert by_path['b.txt']['accepted'] is False and by_path['b.txt']['error_offset'] == 2
+    assert report['accepted'] == 3 and report['rejected'] == 1
+
+
+def test_unchanged_files_come_from_cache(corpus, tables):
+    check(corpus, tables)
+    report = check(corpus, tables)
+    assert (report['parsed'], report['cached']) == (0, 4)
+    (corpus / 'd.txt').write_text("id * id\n")
+    report = check(corpus, tables)
+    assert report['parsed'] == 1
+    assert [r['path'] for r in report['results'] if not r['cached']] == ['d.txt']
+
+
+def test_new_tables_invalidate_the_cache(corpus, tables):
+    first = check(corpus, tables)
+    with open(tables[1], 'a') as fh:
+        fh.write('\n')     # conținut (hash) nou, aceleași producții
+    report = check(corpus, tables)
+    assert report['tables_sha256'] != first['tables_sha256']
+    assert (report['parsed'], report['cached']) == (3, 0)
+
+
+def test_no_cache_neither_reads_nor_writes(corpus, tables):
+    check(corpus, tables, use_cache=False)
+    assert not (corpus / '.corpus_cache.json').exists()
+
+
+def test_inline_run_leaves_batch_worker_state_alone(corpus, tables, monkeypatch):
+    monkeypatch.setattr(batch, '_tables', None)
+    check(corpus, tables)
+    assert batch._tables is None
+
+
+def test_process_pool_matches_inline(corpus, tables):
+    inline = check(corpus, tables, use_cache=False)
+    pooled = validate_corpus(str(corpus), workers=2, use_cache=False, action_path=tables[0],
+                             prod_path=tables[1], chunk_size=1)
+    strip = lambda report: [(r['path'], r['accepted'], r['error_offset']) for r in report['results']]
+    assert strip(pooled) == strip(inline)
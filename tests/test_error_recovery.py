@@ -0,0 +1,34 @@
+import pytest
+
+from error_recovery import recover_parse
+from lr_tables import load_tables
+
+TABLES = load_tables()
+
+
+def offsets(text, **kwargs):
+    accepted, errors = recover_parse(text.split(), TABLES, **kwargs)
+    return accepted, [err.offset for err in errors]
+
+
+def test_valid_input():
+    assert offsets("( id + id ) * id") == (True, [])
+
+
+def test_errors_after_sync_token_are_reported():
+    assert offsets("id * * + id ) id") == (False, [2, 5, 6])
+
+
+def test_max_errors():
+    assert offsets("id * * + id ) id", max_errors=2) == (False, [2, 5])
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("id +", [2]),
+    ("( ( id", [3]),
+    (")", [0]),
+    (") ) id id + * )", [0, 1, 2, 6]),
+    ("( id ) ) ( id", [3, 4]),
+])
+def test_terminates_on_bad_input(text, expected):
+    assert offsets(text) == (False, expected)
@@ -0,0 +1,58 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+import LRParser2
+from glr import AMBIGUOUS_GRAMMAR, GLRParser, build_tables, count_trees
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_conflict_free_tables_stay_linear():
+    result = GLRParser().parse("( id + id ) * id".split())
+    assert result.accepted and result.stats['glr_from'] is None
+    assert count_trees(result.forest) == 1
+
+
+@pytest.mark.parametrize("text, trees", [
+    ("id", 1),
+    ("id + id * id", 2),
+    ("id + id + id + id", 5),
+])
+def test_ambiguous_grammar_counts_all_trees(text, trees):
+    tables = build_tables(AMBIGUOUS_GRAMMAR)
+    assert tables.conflicts
+    result = GLRParser(tables).parse(text.split())
+    assert result.accepted
+    assert count_trees(result.forest) == trees
+
+
+def test_rejected_offset():
+    result = GLRParser(build_tables(AMBIGUOUS_GRAMMAR)).parse("id + * id".split())
+    assert not result.accepted and result.error_offset == 2
+
+
+def test_glr_export_does_not_overwrite_lrparser2_tables(tmp_path):
+    grammar = tmp_path / 'amb.txt'
+    grammar.write_text(AMBIGUOUS_GRAMMAR + "\n")
+    shutil.copy(os.path.join(ROOT, 'action_table.csv'), tmp_path)
+    before = (tmp_path / 'action_table.csv').read_text()
+    subprocess.run([sys.executable, os.path.join(ROOT, 'tema3.py'), '-f', str(grammar), '--glr'],
+                   cwd=tmp_path, check=True, capture_output=True)
+    assert (tmp_path / 'action_table.csv').read_text() == before
+    assert '|' in (tmp_path / 'glr_action_table.csv').read_text()
+
+
+def test_lrparser2_rejects_conflict_cells(tmp_path, monkeypatch):
+    grammar = tmp_path / 'amb.txt'
+    grammar.write_text(AMBIGUOUS_GRAMMAR + "\n")
+    # exportul GLR scris explicit peste fișierele lui LRParser2
+    subprocess.run([sys.executable, os.path.join(ROOT, 'tema3.py'), '-f', str(grammar), '--glr',
+                    '--action', 'action_table.csv', '--prod', 'result.csv'],
+                   cwd=tmp_path, check=True, capture_output=True)
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="conflict"):
+        LRParser2.read_action_table()
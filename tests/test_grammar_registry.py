@@ -0,0 +1,76 @@
+import pytest
+
+from grammar_registry import DIALECTS, GrammarRegistry, default_registry
+
+
+@pytest.fixture(scope='module')
+def registry():
+    return default_registry()
+
+
+@pytest.mark.parametrize("grammar_id, text, value", [
+    ('expr', "id + id * id", 7),
+    ('minus', "id - id", 1 - 2),
+    ('minus', "id - id - id", 1 - 2 - 3),
+    ('minus', "id / id * id", 1 / 2 * 3),
+    ('power', "id + id ^ id ^ id", 1 + 2 ** 3 ** 4),
+    ('power', "( id + id ) ^ id", (1 + 2) ** 3),
+])
+def test_each_dialect_evaluates_with_its_own_semantics(registry, grammar_id, text, value):
+    result = registry.parse(grammar_id, text, evaluate=True)
+    assert result.accepted and result.value == value
+
+
+def test_rejected_evaluation_keeps_offset(registry):
+    result = registry.parse('minus', "id - - id", evaluate=True)
+    assert (result.accepted, result.error_offset) == (False, 2)
+
+
+def test_conflict_tables_use_glr(registry):
+    assert registry.tables('ambiguous').conflicts
+    assert registry._entry('ambiguous')[2] is not None
+    assert registry._entry('minus')[2] is None
+    assert registry.parse('ambiguous', "id * id + id").accepted
+    assert registry.parse('ambiguous', "id + id * id + id").accepted
+    assert registry.parse('ambiguous', "id + * id").error_offset == 2
+    with pytest.raises(ValueError):
+        registry.parse('ambiguous', "id + id", evaluate=True)
+
+
+def test_grammar_without_semantics_refuses_to_evaluate():
+    registry = GrammarRegistry()
+    registry.register('list', grammar_text="S -> L\nL -> L , id | id")
+    assert registry.parse('list', "id , id").accepted
+    with pytest.raises(ValueError):
+        registry.parse('list', "id , id", evaluate=True)
+
+
+def test_lru_eviction():
+    registry = GrammarRegistry(max_resident=1)
+    for grammar_id, text in DIALECTS.items():
+        registry.register(grammar_id, grammar_text=text)
+    registry.parse('minus', "id - id")
+    registry.parse('power', "id ^ id")
+    stats = registry.stats()
+    assert stats['minus']['evictions'] == 1 and not stats['minus']['resident']
+    assert stats['power']['resident']
+
+
+def test_derived_scheme_is_shared_across_threads_and_reset_on_register():
+    from concurrent.futures import ThreadPoolExecutor
+
+    registry = GrammarRegistry()
+    registry.register('minus', grammar_text=DIALECTS['minus'])
+    with ThreadPoolExecutor(8) as pool:
+        schemes = list(pool.map(lambda _: registry.scheme('minus'), range(32)))
+    assert schemes[0] is not None and all(s is schemes[0] for s in schemes)
+    registry.register('minus', grammar_text=DIALECTS['minus'])
+    assert registry.scheme('minus') is not schemes[0]
+    assert registry.parse('minus', "id - id", evaluate=True).value == -1
+
+
+def test_grammar_without_semantics_caches_none():
+    registry = GrammarRegistry()
+    registry.register('list', grammar_text="S -> L\nL -> L , id | id")
+    assert registry.scheme('list') is None
+    assert registry._schemes == {'list': None}
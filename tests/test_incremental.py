@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from incremental import IncrementalParser, sample_tokens
+
+
+def fresh(tokens):
+    parser = IncrementalParser()
+    parser.parse(tokens)
+    return parser.accepted, parser.error_offset
+
+
+def test_parse():
+    parser = IncrementalParser()
+    assert parser.parse("( id + id ) * id".split())
+    assert not parser.parse("id * * + id".split())
+    assert parser.error_offset == 2
+
+
+def test_small_edit_converges_quickly():
+    parser = IncrementalParser()
+    assert parser.parse(sample_tokens(20_000))
+    i = parser.tokens.index('+', len(parser.tokens) // 2)
+    assert parser.edit(i, 1, ['*'])
+    assert parser.reparsed < 20
+
+
+def test_random_edits_match_full_parse():
+    rnd = random.Random(0)
+    parser = IncrementalParser()
+    parser.parse(sample_tokens(400))
+    alphabet = ['id', '+', '*', '(', ')']
+    for _ in range(500):
+        start = rnd.randrange(len(parser.tokens) + 1)
+        old_len = rnd.randint(0, min(2, len(parser.tokens) - start))
+        new = [rnd.choice(alphabet) for _ in range(rnd.randint(0, 2))]
+        parser.edit(start, old_len, new)
+        assert (parser.accepted, parser.error_offset) == fresh(parser.tokens)
+
+
+def test_edit_out_of_range():
+    parser = IncrementalParser()
+    parser.parse(['id'])
+    with pytest.raises(IndexError):
+        parser.edit(1, 1, ['id'])
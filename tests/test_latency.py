@@ -0,0 +1,20 @@
+import pytest
+
+from latency import percentile
+
+
+def test_nearest_rank_without_interpolation():
+    values = list(range(1, 11))
+    assert percentile(values, 0.5) == 6
+    assert percentile(values, 0.0) == 1
+    assert percentile(values, 0.99) == 10
+
+
+def test_p100_is_clamped_to_the_last_element():
+    assert percentile([3, 7], 1.0) == 7
+    assert percentile([4], 0.5) == 4
+
+
+def test_empty_list_is_an_error():
+    with pytest.raises(IndexError):
+        percentile([], 0.5)
@@ -0,0 +1,36 @@
+import pytest
+
+import LRParser2
+import pratt
+import tema4
+
+
+@pytest.mark.parametrize("text", ["E + T", "x + y", "acc + id", "id + 2"])
+def test_default_accepts_same_inputs_as_lrparser2(text):
+    assert LRParser2.parse_input(text, verbose=False) is False
+    assert tema4.parse_and_evaluate(text, verbose=False)[0] is False
+    assert pratt.parse_and_evaluate(text, verbose=False)[0] is False
+
+
+def test_plain_ids_unchanged():
+    assert tema4.parse_and_evaluate("id + id * id", verbose=False)[:2] == (True, 7)
+    assert pratt.parse_and_evaluate("id + id * id", verbose=False)[:2] == (True, 7)
+
+
+def test_lexemes_names_and_numbers():
+    ok, value, code = tema4.parse_and_evaluate("x + 2 * x", verbose=False, lexemes=True)
+    assert (ok, value) == (True, 1 + 2 * 1)
+    assert code == ['t1 = 2 * 1', 't2 = 1 + 2']
+    assert pratt.parse_and_evaluate("x + 2 * x", verbose=False, lexemes=True) == (ok, value, code)
+
+
+@pytest.mark.parametrize("text", ["E + T", "id * F", "( S )"])
+def test_lexemes_never_map_grammar_symbols(text):
+    assert tema4.parse_and_evaluate(text, verbose=False, lexemes=True)[0] is False
+    assert pratt.parse_and_evaluate(text, verbose=False, lexemes=True)[0] is False
+
+
+def test_optimize_with_lexemes():
+    ok, value, code = tema4.parse_and_evaluate("( a + b ) * c + ( b + a ) * c", verbose=False,
+                                               optimize=True, lexemes=True)
+    assert (ok, value, code) == (True, 18, ['t1 = a + b', 't2 = t1 * c', 't3 = t2 + t2'])
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+import mmap_input
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+SCRIPT = """
+import sys
+import mmap_input
+mmap_input.RELEASE_BYTES = 1 << 16
+if sys.argv[2] == 'parse':
+    ok = mmap_input.parse_file(sys.argv[1])
+else:
+    ok = mmap_input.evaluate_file(sys.argv[1], sink=lambda line: None)[0]
+assert ok
+print(mmap_input.peak_rss_kb())
+"""
+
+
+def _peak_rss_kb(path, mode):
+    out = subprocess.run([sys.executable, '-c', SCRIPT, str(path), mode],
+                         cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return int(out)
+
+
+def test_peak_rss_stays_flat(tmp_path):
+    small, large = tmp_path / 'small.txt', tmp_path / 'large.txt'
+    mmap_input.write_sample(str(small), 20_000)         # ~100 KB
+    mmap_input.write_sample(str(large), 400_000)        # ~2 MB
+    for mode in ('parse', 'evaluate'):
+        growth = _peak_rss_kb(large, mode) - _peak_rss_kb(small, mode)
+        assert growth < 768, (mode, growth)
+
+
+def test_evaluate_file_with_lexemes(tmp_path):
+    path = tmp_path / 'names.txt'
+    path.write_text("x + 2\n* y\n")
+    lines = []
+    assert mmap_input.evaluate_file(str(path), sink=lines.append, lexemes=True)[:2] == (True, 1 + 2 * 2)
+    assert lines == ['t1 = 2 * 2', 't2 = 1 + 4']
+    assert mmap_input.evaluate_file(str(path))[0] is False
+
+
+def test_token_offsets_match_split(tmp_path):
+    path = tmp_path / 'expr.txt'
+    mmap_input.write_sample(str(path), 200_000)
+    old = mmap_input.RELEASE_BYTES
+    mmap_input.RELEASE_BYTES = 1 << 14                   # multe eliberări pe parcurs
+    try:
+        with open(path, 'rb') as fh:
+            expected = fh.read().split()
+        with mmap_input.open_buffer(str(path)) as buf:
+            tokens = mmap_input.iter_tokens(buf)
+            assert [t.encode() for t in tokens] == expected
+    finally:
+        mmap_input.RELEASE_BYTES = old
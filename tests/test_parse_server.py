@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+
+import batch
+import parse_server
+from parse_server import LineFramer, ParseServer
+
+
+async def _exchange(server, payload):
+    listener = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(payload)
+        writer.write_eof()
+        data = await reader.read()
+        writer.close()
+    return [json.loads(m) for m in LineFramer().feed(data)]
+
+
+def test_failed_batch_answers_every_request(monkeypatch):
+    original = batch.run_one
+
+    def run_one(tables, line, evaluate=False, scheme=None, index=0):
+        if line == 'boom':
+            raise RuntimeError("worker mort")
+        return original(tables, line, evaluate, scheme, index)
+
+    monkeypatch.setattr(batch, 'run_one', run_one)
+    server = ParseServer(workers=0, max_batch=2)
+    replies = asyncio.run(_exchange(server, b"id + id\nboom\nid *\n!stats\n"))
+    assert replies[:2] == [{'accepted': False, 'error': 'RuntimeError: worker mort'}] * 2
+    assert replies[2] == {'accepted': False, 'error_offset': 2}
+    assert replies[3]['failed'] == 2 and replies[3]['requests'] == 1
+
+
+def test_load_client_raises_when_server_closes_before_stats():
+    async def scenario():
+        async def handle(reader, writer):
+            await reader.readline()
+            writer.write(b'{"accepted": true}\n')
+            await writer.drain()
+            writer.close()
+
+        listener = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            await parse_server._load_connection(lambda: asyncio.open_connection('127.0.0.1', port),
+                                                LineFramer(), ['id'], 1, [])
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(asyncio.wait_for(scenario(), 5))
+
+
+def test_default_uses_a_process_per_cpu(monkeypatch):
+    monkeypatch.setattr(parse_server.os, 'cpu_count', lambda: 3)
+    server = ParseServer()
+    try:
+        assert server.pool._max_workers == 3
+        replies = asyncio.run(_exchange(server, b"id + id\nid *\n"))
+    finally:
+        server.close()
+    assert replies == [{'accepted': True}, {'accepted': False, 'error_offset': 2}]
+
+
+def test_inline_mode_does_not_parse_on_the_event_loop(monkeypatch):
+    import threading
+    threads = []
+    original = batch.run_one
+
+    def run_one(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(batch, 'run_one', run_one)
+    server = ParseServer(workers=0, evaluate=True)
+    replies = asyncio.run(_exchange(server, b"id + id * id\n"))
+    assert replies == [{'accepted': True, 'value': 7}]
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,61 @@
+import pytest
+
+from lr_tables import Tables, read_csv_table, load_tables
+from parse_tree import build_tree
+
+
+def test_collapsed_tree_shape_and_offsets():
+    tree = build_tree("( id + id ) * id".split())
+    # 7 frunze + E -> E + T, F -> ( E ), T -> T * F
+    assert len(tree) == 10
+    root = tree.node(tree.root)
+    assert root.label() == "T -> T * F"
+    assert [c.label() for c in root.children] == ["F -> ( E )", "* @5", "id @6"]
+    paren = root.children[0]
+    assert [c.label() for c in paren.children] == ["( @0", "E -> E + T", ") @4"]
+    inner = paren.children[1]
+    assert [(c.symbol, c.token_offset) for c in inner.children] == [('id', 1), ('+', 2), ('id', 3)]
+    assert inner.token_offset == 1 and paren.token_offset == 0 and root.token_offset == 0
+
+
+def test_full_tree_keeps_unit_reductions():
+    tree = build_tree("id * id".split(), collapse_units=False)
+    # 3 frunze + S->E, E->T, T->T*F, T->F, F->id, F->id
+    assert len(tree) == 9
+    assert tree.pretty() == [
+        "S -> E",
+        "  E -> T",
+        "    T -> T * F",
+        "      T -> F",
+        "        F -> id",
+        "          id @0",
+        "      * @1",
+        "      F -> id",
+        "        id @2",
+    ]
+
+
+def test_single_token_collapses_to_a_leaf():
+    tree = build_tree(['id'])
+    assert len(tree) == 1
+    node = tree.node(tree.root)
+    assert node.is_leaf and node.production is None and node.label() == "id @0"
+
+
+def test_rejected_input_reports_token_offset():
+    with pytest.raises(ValueError, match=r"tokenul 2 \('\)'\)"):
+        build_tree("id + )".split())
+
+
+def test_unknown_production_is_a_value_error():
+    prod = read_csv_table('result.csv')
+    del prod['7']   # F -> id
+    tables = Tables(read_csv_table('action_table.csv'), prod)
+    with pytest.raises(ValueError, match="Producția 7"):
+        build_tree(['id'], tables)
+
+
+def test_accepts_a_lazy_token_iterator():
+    tables = load_tables()
+    tree = build_tree(iter("id + id".split()), tables)
+    assert tree.node(tree.root).label() == "E -> E + T"
@@ -0,0 +1,70 @@
+import gc
+import random
+import weakref
+
+import pytest
+
+import pratt
+import tema4
+from lr_tables import load_tables
+from translation import TranslationScheme
+
+
+def _same(a, b):
+    return (a[0], a[1], list(a[2])) == (b[0], b[1], list(b[2]))
+
+
+@pytest.mark.parametrize("mode", [{}, {'optimize': True}, {'compact': True}])
+def test_matches_tema4_on_generated_sentences(mode):
+    from sentence_gen import SentenceGenerator
+
+    rnd = random.Random(1)
+    for tokens, _ in SentenceGenerator().sentences(300, (1, 40), seed=3, invalid=0.3, mutations=2):
+        text = ' '.join(pratt._with_lexemes(tokens, rnd))
+        for lexemes in (False, True):
+            expected = tema4.parse_and_evaluate(text, verbose=False, lexemes=lexemes, **mode)
+            got = pratt.parse_and_evaluate(text, verbose=False, lexemes=lexemes, **mode)
+            assert _same(expected, got), text
+
+
+@pytest.mark.parametrize("text, value", [
+    ("id + id * id", 7),
+    ("( id + id ) * id", 9),
+    ("( ( ( id ) ) )", 1),
+])
+def test_fast_path_values(text, value):
+    evaluator = pratt.evaluator_for(tema4.TABLES, tema4.ARITHMETIC_SCHEME)
+    assert evaluator is not None
+    assert evaluator.evaluate(text.split())[1] == value
+
+
+@pytest.mark.parametrize("text", ["id +", "( id", "id )", "id id", ""])
+def test_fast_path_rejects_fall_back_to_lr(text):
+    evaluator = pratt.evaluator_for(tema4.TABLES, tema4.ARITHMETIC_SCHEME)
+    assert evaluator.evaluate(text.split()) is None
+    assert pratt.parse_and_evaluate(text, verbose=False)[0] is False
+
+
+def test_right_associative_dialect():
+    from glr import build_tables
+    from grammar_registry import DIALECTS
+
+    tables = build_tables(DIALECTS['power'])
+    scheme = TranslationScheme()
+    scheme.action("P -> F ^ P")(lambda ctx, v: v[0] ** v[2])
+    evaluator = pratt.evaluator_for(tables, scheme)
+    assert evaluator.binary['^'][1] is True
+    # 2 ^ (3 ^ 2), nu (2 ^ 3) ^ 2
+    assert pratt.evaluate_tokens("2 ^ 3 ^ 2".split(), verbose=False, tables=tables, scheme=scheme,
+                                 lexemes=True)[1] == 512
+
+
+def test_caches_do_not_keep_tables_alive():
+    tables = load_tables()
+    scheme = TranslationScheme()
+    assert pratt.evaluator_for(tables, scheme) is not None
+    tema4.ARITHMETIC_SCHEME.compile(tables)
+    ref = weakref.ref(tables)
+    del tables
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from push_parser import ACCEPTED, REJECTED, PushParser
+from tema4 import ARITHMETIC_SCHEME
+
+
+def test_docstring_example_mixed_chunks():
+    p = PushParser()
+    p.feed("id + i")
+    p.feed("d * id")
+    p.feed(['+', 'id'])
+    assert p.finish() == ACCEPTED
+    assert p.offset == 7
+
+
+def test_pending_text_flushed_before_token_list():
+    p = PushParser(scheme=ARITHMETIC_SCHEME)
+    p.feed("id")
+    p.feed(['*', 'id'])
+    assert p.finish() == ACCEPTED
+    assert p.result == 1 * 2
+
+
+def test_split_tokens_and_evaluation():
+    p = PushParser(scheme=ARITHMETIC_SCHEME)
+    for chunk in (b"id ", b"+ i", b"d * ", b"id"):
+        p.feed(chunk)
+    assert p.finish() == ACCEPTED
+    assert p.result == 1 + 2 * 3
+    assert p.code == ['t1 = 2 * 3', 't2 = 1 + 6']
+
+
+def test_multibyte_character_split_across_chunks():
+    data = "id + ț".encode('utf-8')
+    p = PushParser()
+    p.feed(data[:-1])
+    p.feed(data[-1:])
+    assert p.finish() == REJECTED
+    assert p.error == (2, 'ț')
+
+
+def test_truncated_utf8_at_end_raises():
+    p = PushParser()
+    p.feed("id ț".encode('utf-8')[:-1])
+    with pytest.raises(UnicodeDecodeError):
+        p.finish()
+
+
+def test_snapshot_restore_keeps_pending_text_and_bytes():
+    p = PushParser(scheme=ARITHMETIC_SCHEME)
+    p.feed("id + i")
+    p.feed("d * ".encode('utf-8') + "ț".encode('utf-8')[:1])
+    snapshot = json.loads(json.dumps(p.snapshot()))
+    q = PushParser.restore(snapshot, scheme=ARITHMETIC_SCHEME)
+    q.feed("ț".encode('utf-8')[1:])
+    assert q.finish() == REJECTED
+    assert q.error == (4, 'ț')
+
+
+def test_rejected_offset():
+    p = PushParser()
+    p.feed("id * * + id")
+    assert p.finish() == REJECTED
+    assert p.error == (2, '*')
+
+
+def test_scheme_that_does_not_cover_the_grammar_is_refused():
+    from glr import build_tables
+    from grammar_registry import DIALECTS
+
+    with pytest.raises(ValueError, match="E -> E - T"):
+        PushParser(build_tables(DIALECTS['minus']), ARITHMETIC_SCHEME)
+
+
+def test_matches_tema4_with_every_scheme():
+    import tema4
+    from sentence_gen import SentenceGenerator
+
+    for tokens, _ in SentenceGenerator().sentences(200, (1, 30), seed=4, invalid=0.3):
+        for scheme in (tema4.ARITHMETIC_SCHEME, tema4.OPTIMIZING_SCHEME):
+            ok, value, code = tema4.evaluate_tokens(tokens, verbose=False, scheme=scheme)
+            p = PushParser(scheme=scheme)
+            p.feed(tokens)
+            assert (p.finish() == ACCEPTED, p.result if ok else None, list(p.code)) == (ok, value, list(code))
+
+
+def test_scheme_with_empty_productions_and_hooks():
+    from glr import build_tables
+    from translation import TranslationScheme
+
+    tables = build_tables("S -> L\nL -> L id | ε")
+    scheme = TranslationScheme()
+    scheme.action("L -> L id")(lambda ctx, v: (v[0] or 0) + v[1])
+    scheme.on_result(lambda ctx, value: -value)
+    p = PushParser(tables, scheme)
+    p.feed("id id id")
+    assert p.finish() == ACCEPTED and p.result == -(1 + 2 + 3)
@@ -0,0 +1,62 @@
+import io
+from array import array
+
+import pytest
+
+from reduction_trace import HEADER, ReductionTrace, first_difference, record
+
+
+def test_records_reductions_in_order():
+    trace = record("id * id".split())
+    assert trace.accepted is True
+    assert trace.codes.tolist() == [7, 5, 7, 4, 3, 1]
+
+
+def test_interleaved_shifts_rebuild_token_offsets():
+    trace = record("id * id".split(), with_shifts=True)
+    assert list(trace.events()) == [
+        ('shift', 0), ('reduce', 7), ('reduce', 5), ('shift', 1), ('shift', 2),
+        ('reduce', 7), ('reduce', 4), ('reduce', 3), ('reduce', 1)]
+    assert trace.reductions() == record("id * id".split()).codes
+
+
+def test_rightmost_derivation_reverses_reductions():
+    assert list(record(['id']).rightmost_derivation()) == [
+        (1, 'S', 'E'), (3, 'E', 'T'), (5, 'T', 'F'), (7, 'F', 'id')]
+
+
+def test_rejected_input_keeps_partial_trace():
+    trace = record("id +".split())
+    assert trace.accepted is False
+    assert trace.codes.tolist() == [7, 5, 3]
+
+
+@pytest.mark.parametrize("shifts", [False, True])
+def test_file_round_trip(tmp_path, shifts):
+    trace = record("( id + id ) * id".split(), with_shifts=shifts)
+    path = str(tmp_path / "out.lrrs")
+    trace.write(path)
+    loaded = ReductionTrace.read(path)
+    assert loaded == trace
+    assert loaded.accepted is True and loaded.with_shifts is shifts
+    with open(path, 'rb') as f:
+        assert len(f.read()) == HEADER.size + 2 * len(trace)
+
+
+def test_truncated_and_foreign_files_are_rejected():
+    buf = io.BytesIO()
+    record("id * id".split()).write(buf)
+    data = buf.getvalue()
+    with pytest.raises(ValueError, match="antet incomplet"):
+        ReductionTrace.read(io.BytesIO(data[:5]))
+    with pytest.raises(ValueError, match="5 din 6 coduri"):
+        ReductionTrace.read(io.BytesIO(data[:-2]))
+    with pytest.raises(ValueError, match="LRRS"):
+        ReductionTrace.read(io.BytesIO(b'XXXX' + data[4:]))
+
+
+def test_first_difference():
+    a = ReductionTrace(codes=array('H', [7, 5, 3]))
+    assert first_difference(a, ReductionTrace(codes=array('H', [7, 5, 3]))) is None
+    assert first_difference(a, ReductionTrace(codes=array('H', [7, 4, 3]))) == 1
+    assert first_difference(a, ReductionTrace(codes=array('H', [7, 5]))) == 2
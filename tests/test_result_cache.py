@@ -0,0 +1,53 @@
+import tema4
+from result_cache import ResultCache
+
+
+def test_repeated_expression_is_a_hit():
+    cache = ResultCache()
+    first = cache.evaluate("id + id * id")
+    assert cache.evaluate("id  +  id * id") == first
+    assert first == tema4.parse_and_evaluate("id + id * id", verbose=False)[:2] + (tuple(first[2]),)
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+
+def test_new_bindings_version_invalidates():
+    cache = ResultCache()
+    cache.evaluate("x + y", bindings_version=1, lexemes=True)
+    cache.evaluate("x + y", bindings_version=2, lexemes=True)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 2, 2)
+    cache.evaluate("x + y", bindings_version=2, lexemes=True)
+    assert cache.hits == 1
+
+
+def test_old_versions_age_out_by_lru():
+    cache = ResultCache(max_entries=2)
+    for version in range(5):
+        cache.evaluate("x * 2", bindings_version=version, lexemes=True)
+    assert len(cache) == 2 and cache.evictions == 3
+    cache.evaluate("x * 2", bindings_version=0, lexemes=True)
+    assert cache.misses == 6
+    cache.evaluate("x * 2", bindings_version=4, lexemes=True)
+    assert cache.hits == 1
+
+
+def test_translation_options_are_part_of_the_key():
+    cache = ResultCache()
+    plain = cache.evaluate("a + 0", lexemes=True)
+    optimized = cache.evaluate("a + 0", optimize=True, lexemes=True)
+    assert cache.misses == 2
+    assert plain[2] != optimized[2]
+
+
+def test_byte_budget_is_enforced():
+    cache = ResultCache(max_bytes=1500)
+    for i in range(20):
+        cache.evaluate(f"x + {i}", lexemes=True)
+    assert cache.bytes <= 1500
+    assert cache.evictions > 0
+
+
+def test_rejected_input_is_cached_too():
+    cache = ResultCache()
+    assert cache.evaluate("id +")[0] is False
+    assert cache.evaluate("id +")[0] is False
+    assert cache.hits == 1
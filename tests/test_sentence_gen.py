@@ -0,0 +1,38 @@
+import sys
+
+import pytest
+
+import sentence_gen
+from sentence_gen import SentenceGenerator
+
+GEN = SentenceGenerator()
+
+
+def test_series_do_not_collide():
+    assert GEN.sentence(1, 0, 30) != GEN.sentence(0, 1_000_003, 30)
+
+
+def test_sentence_reproduces_sentences():
+    for length in (12, (3, 40)):
+        series = [tokens for tokens, _ in GEN.sentences(20, length, seed=5)]
+        assert series == [GEN.sentence(5, i, length) for i in range(20)]
+
+
+def test_valid_sentences_parse():
+    import LRParser2
+
+    for tokens, valid in GEN.sentences(50, (1, 30), seed=2):
+        assert valid and LRParser2.parse_tokens(tokens, verbose=False)
+
+
+@pytest.mark.parametrize("argv, length, depth", [
+    ([], 20, None),
+    (['--depth', '10'], None, 10),
+    (['--length', '20', '--depth', '10'], 20, 10),   # 20 explicit nu mai este ignorat
+    (['--length', '3-9'], (3, 9), None),
+])
+def test_cli_length_and_depth(monkeypatch, capsys, argv, length, depth):
+    monkeypatch.setattr(sys, 'argv', ['sentence_gen.py', '--count', '3', '--seed', '4'] + argv)
+    sentence_gen.main()
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == [' '.join(GEN.sentence(4, i, length, depth)) for i in range(3)]
@@ -0,0 +1,51 @@
+import pratt
+import tema4
+from lr_tables import load_tables
+from table_profile import TableProfile, coverage, profile_corpus
+
+LINES = ['id * id', 'id +']
+
+
+def test_report_counts_on_a_known_corpus():
+    report = profile_corpus(LINES).report(load_tables())
+    assert report['parses'] == 2
+    # 'id * id': 3 deplasări + 6 reduceri + accept; 'id +': 2 deplasări + 3 reduceri + eroarea la '$'
+    assert report['action_lookups'] == 16
+    # o căutare GOTO per reducere
+    assert report['goto_lookups'] == 9
+    hits = {p['rule']: p['hits'] for p in report['productions']}
+    assert hits == {'S -> E': 1, 'E -> E + T': 0, 'E -> T': 2, 'T -> T * F': 1,
+                    'T -> F': 2, 'F -> ( E )': 0, 'F -> id': 3}
+    assert report['coverage']['error_cells'] == 1
+    assert report['coverage']['cells_used'] == len(report['cells']) + len(report['gotos']) - 1
+    heatmap = report['heatmap']
+    assert len(heatmap['values']) == report['num_states']
+    assert sum(map(sum, heatmap['values'])) == 16 + 9
+
+
+def test_cells_are_sorted_by_hits():
+    report = profile_corpus(LINES * 3).report(load_tables())
+    counts = [n for _, _, n in report['cells']]
+    assert counts == sorted(counts, reverse=True)
+    assert report['cells'][0][1] == 'id'
+
+
+def test_merge_adds_counters():
+    a, b = profile_corpus(LINES[:1]), profile_corpus(LINES[1:])
+    a.merge(b)
+    whole = profile_corpus(LINES)
+    assert (a.cells, a.gotos, a.productions, a.parses) == (whole.cells, whole.gotos, whole.productions, whole.parses)
+
+
+def test_coverage_levels():
+    entries = [[0, 'x', 50], [1, 'x', 40], [2, 'x', 9], [3, 'x', 1]]
+    assert coverage(entries) == {'50%': 1, '90%': 2, '99%': 3}
+
+
+def test_pratt_with_profile_counts_like_tema4():
+    expected, got = TableProfile(), TableProfile()
+    for line in ['id + id * id', '( id + id ) * id']:
+        assert tema4.parse_and_evaluate(line, verbose=False, profile=expected)[:2] == \
+            pratt.parse_and_evaluate(line, verbose=False, profile=got)[:2]
+    assert got.cells and (got.cells, got.gotos, got.productions) == \
+        (expected.cells, expected.gotos, expected.productions)
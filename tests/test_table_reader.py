@@ -0,0 +1,67 @@
+import pytest
+
+from table_reader import (StateRowSource, SymbolRowSource, detect_and_transform, open_stream_source,
+                          parse_state_range, read_all_rows)
+
+
+def _stream(path):
+    source = open_stream_source(str(path))
+    try:
+        rows = [row for block in source.blocks(0, None, 2, list(range(len(source.columns)))) for row in block]
+        return type(source), ['state'] + source.columns, rows
+    finally:
+        source.close()
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+@pytest.mark.parametrize("name, text, kind", [
+    ('action.csv', "id,d5,,,\n+,,d6,r2,\nE,1,,,\n", SymbolRowSource),
+    # producțiile (result.csv) au aceeași lungime pe rânduri: simbol-per-rând, ca fără --stream
+    ('result.csv', "1,S,E\n2,E,E + T\n3,E,T\n", SymbolRowSource),
+    ('header.csv', "state,id,+\n0,d5,\n1,,d6\n", StateRowSource),
+    ('no_header.csv', "0,d5\n1,,d6\n2\n", StateRowSource),
+])
+def test_stream_mode_picks_the_same_layout_as_full_mode(tmp_path, name, text, kind):
+    path = _write(tmp_path, name, text)
+    header, data = detect_and_transform(read_all_rows(str(path)))
+    source_kind, stream_header, stream_rows = _stream(path)
+    assert source_kind is kind
+    assert stream_header == header
+    width = len(header)
+    assert stream_rows == [(row + [''] * width)[:width] for row in data]
+
+
+def test_unknown_layout_is_rejected_in_both_modes(tmp_path):
+    path = _write(tmp_path, 'odd.csv', "a,b\nc\n")
+    with pytest.raises(RuntimeError, match="necunoscut"):
+        detect_and_transform(read_all_rows(str(path)))
+    with pytest.raises(RuntimeError, match="necunoscut"):
+        open_stream_source(str(path))
+
+
+def test_real_production_table_renders_the_same_way(tmp_path):
+    header, data = detect_and_transform(read_all_rows('result.csv'))
+    assert _stream('result.csv')[1:] == (header, data)
+
+
+@pytest.mark.parametrize("text, expected", [
+    (None, (0, None)), ('7', (7, 8)), ('100-200', (100, 201)), ('100-', (100, None)), ('-5', (0, 6)),
+])
+def test_parse_state_range(text, expected):
+    assert parse_state_range(text) == expected
+
+
+@pytest.mark.parametrize("text", ['abc', '1-x', '1.5'])
+def test_parse_state_range_reports_bad_input_readably(text):
+    with pytest.raises(ValueError, match=r"Interval de stări invalid: .* N-M"):
+        parse_state_range(text)
+
+
+def test_parse_state_range_rejects_empty_interval():
+    with pytest.raises(ValueError, match="gol"):
+        parse_state_range('5-3')
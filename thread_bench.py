@@ -0,0 +1,74 @@
+"""
+thread_bench.py - Throughput pentru tema4.parse_and_evaluate apelat din mai multe thread-uri
+
+Toate thread-urile folosesc aceeași instanță tema4.TABLES (imutabilă); fiecare
+apel își creează propriul TranslationContext. Scriptul verifică și că
+rezultatele din thread-uri sunt identice cu cele secvențiale.
+
+Pe CPython standard GIL-ul serializează execuția, deci throughput-ul rămâne
+aproximativ constant; pe build-ul free-threaded (python3.13t) ar trebui să
+crească cu numărul de thread-uri (până la numărul de nuclee).
+
+Usage:
+  python3 thread_bench.py
+  python3.13t thread_bench.py --threads 1,2,4,8 --count 50000
+"""
+import argparse
+import os
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import tema4
+
+WORKLOAD = [
+    "id + id * id",
+    "id * id + id",
+    "( id + id ) * id",
+    "( id + id * ( id + id ) ) * id + id",
+    "id * * + id",
+]
+
+
+def run_slice(exprs):
+    return [tema4.parse_and_evaluate(e, verbose=False) for e in exprs]
+
+
+def bench(exprs, threads):
+    """Împarte lista în `threads` felii egale; întoarce (expr/s, rezultate în ordine)."""
+    size = (len(exprs) + threads - 1) // threads
+    slices = [exprs[i:i + size] for i in range(0, len(exprs), size)]
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = [r for part in pool.map(run_slice, slices) for r in part]
+    elapsed = time.perf_counter() - t0
+    return len(exprs) / elapsed, results
+
+
+def gil_enabled():
+    check = getattr(sys, '_is_gil_enabled', None)
+    return check() if check is not None else True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tema4 cu ThreadPoolExecutor.")
+    parser.add_argument("--threads", default="1,2,4,8", help="Listă de numere de thread-uri")
+    parser.add_argument("--count", type=int, default=20000, help="Număr de expresii per rulare")
+    args = parser.parse_args()
+
+    exprs = [WORKLOAD[i % len(WORKLOAD)] for i in range(args.count)]
+    expected = run_slice(exprs)
+    free_threaded = bool(sysconfig.get_config_var('Py_GIL_DISABLED'))
+    print(f"Python {sys.version.split()[0]} free-threaded build: {free_threaded}, "
+          f"GIL enabled: {gil_enabled()}, CPUs: {os.cpu_count()}")
+    base = None
+    for threads in (int(x) for x in args.threads.split(',')):
+        rate, results = bench(exprs, threads)
+        assert results == expected, "rezultate diferite între rularea secvențială și cea paralelă"
+        base = base or rate
+        print(f"threads={threads:3d}: {rate:12,.0f} expr/s  (x{rate / base:.2f})")
+
+
+if __name__ == "__main__":
+    main()
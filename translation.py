@@ -0,0 +1,183 @@
+"""
+translation.py - Scheme de traducere: acțiuni semantice înregistrate pe producții
+
+tema4 alegea acțiunea semantică printr-un lanț if/elif pe numărul producției
+('1', '2', ...), deci renumerotarea producțiilor în result.csv strica totul.
+Aici acțiunile se înregistrează pe producție (LHS + RHS, ca text):
+
+    scheme = TranslationScheme()
+
+    @scheme.action("E -> E + T")
+    def add(ctx, v):
+        return v[0] + v[2]
+
+    scheme.copy("F -> ( E )", index=1)
+
+La încărcare (compile(tables)) producțiile sunt rezolvate la numerele din
+tabele și se construiește o listă indexată după numărul producției, deci la
+fiecare reducere alegerea acțiunii este O(1).
+
+Lista compilată este păstrată cât timp obiectul Tables există (referință
+slabă), deci registrele care încarcă și evictează tabele nu o țin în viață.
+
+Producțiile fără acțiune primesc regula implicită (ca în yacc): valoarea
+primului simbol din dreapta, sau None pentru producții vide. Copierile unui
+singur simbol (A -> B cu valoarea lui B) sunt detectate și devin no-op: valoarea
+rămâne pe stiva de atribute, se schimbă doar starea. O schemă strictă
+(TranslationScheme(strict=True)) refuză la compile() tabelele în care o
+producție cu mai multe simboluri nu are acțiune (ex: E -> E - T pentru schema
+aritmetică din tema4), în loc să dea în tăcere o valoare greșită.
+
+Lista compilată este executată de tema4.evaluate_tokens și de
+push_parser.PushParser, cu starea traducerii într-un TranslationContext.
+"""
+import weakref
+
+# tipuri de intrări în lista compilată
+NOOP = 0   # A -> X, valoarea lui X rămâne pe loc
+COPY = 1   # valoarea unui simbol din dreapta (ex: F -> ( E ))
+CALL = 2   # funcție ctx, values -> valoare
+EMPTY = 3  # producție vidă, valoare None
+
+
+def parse_production(text):
+    """'E -> E + T' -> ('E', ('E', '+', 'T')); 'A -> ε' -> ('A', ())"""
+    if '->' not in text:
+        raise ValueError(f"Lipsește '->' în producția: {text}")
+    left, right = text.split('->', 1)
+    rhs = right.split()
+    if rhs in (['ε'], ['eps'], ['empty']):
+        rhs = []
+    return left.strip(), tuple(rhs)
+
+
+class TranslationScheme:
+    def __init__(self, strict=False):
+        self.strict = strict
+        self._rules = {}     # (lhs, rhs) -> (tip, argument, descriere)
+        self._compiled = weakref.WeakKeyDictionary()  # Tables -> lista compilată (cache)
+        # hook-uri opționale: start(ctx), leaf(ctx, lexeme, value) -> atribut, result(ctx, atribut) -> valoare
+        self.start = None
+        self.leaf = None
+        self.result = None
+
+    def on_start(self, fn):
+        """Decorator: fn(ctx) apelat la începutul fiecărei traduceri (ex: pregătește generatorul de cod)."""
+        self.start = fn
+        return fn
+
+    def on_leaf(self, fn):
+        """Decorator: fn(ctx, lexeme, value) dă atributul pus pe stivă la shift pentru 'id'."""
+        self.leaf = fn
+        return fn
+
+    def on_result(self, fn):
+        """Decorator: fn(ctx, atribut) transformă atributul final în rezultatul întors."""
+        self.result = fn
+        return fn
+
+    def action(self, production):
+        """Decorator: înregistrează fn(ctx, values) ca acțiune pentru producție."""
+        key = parse_production(production)
+
+        def register(fn):
+            self._rules[key] = (CALL, fn, None)
+            self._compiled.clear()
+            return fn
+        return register
+
+    def copy(self, production, index=0, describe=None):
+        """
+        Acțiune care doar copiază valoarea simbolului `index` din dreapta.
+        describe (ex: "E.val = T.val") este folosit doar la afișarea pașilor.
+        """
+        key = parse_production(production)
+        if not 0 <= index < len(key[1]):
+            raise ValueError(f"Index {index} invalid pentru producția: {production}")
+        self._rules[key] = (COPY, index, describe)
+        self._compiled.clear()
+
+    def compile(self, tables):
+        """
+        Întoarce lista indexată după numărul producției; fiecare element este
+        (lhs, rhs, lungime_rhs, tip, argument, descriere) sau None (număr nefolosit).
+        Ridică ValueError dacă o producție înregistrată nu există în tabele, sau
+        (strict) dacă o producție cu mai multe simboluri nu are acțiune.
+        """
+        compiled = self._compiled.get(tables)
+        if compiled is not None:
+            return compiled
+
+        by_production = {entry: num for num, entry in tables.productions.items()}
+        for key in self._rules:
+            if key not in by_production:
+                lhs, rhs = key
+                raise ValueError(f"Producția {lhs} -> {' '.join(rhs) or 'ε'} nu există în tabele")
+
+        compiled = [None] * (max(tables.productions, default=0) + 1)
+        for num, (lhs, rhs) in tables.productions.items():
+            rule = self._rules.get((lhs, rhs))
+            if rule is None and self.strict and len(rhs) > 1:
+                raise ValueError(f"Producția {num} ({lhs} -> {' '.join(rhs)}) nu are acțiune semantică în schemă")
+            kind, arg, describe = rule or (COPY, 0, None)
+            if not rhs:
+                kind, arg = EMPTY, None
+            elif kind == COPY and len(rhs) == 1:
+                kind = NOOP
+            compiled[num] = (lhs, rhs, len(rhs), kind, arg, describe)
+        self._compiled[tables] = compiled
+        return compiled
+
+
+class TranslationContext:
+    """
+    Starea unei singure traduceri: cele trei stive, contoarele pentru 'id' și
+    temporare, codul intermediar. Se creează una nouă la fiecare apel, deci
+    nimic mutabil nu este partajat între apeluri (sau thread-uri).
+    """
+
+    def __init__(self, verbose=False, sink=None):
+        self.verbose = verbose
+        self.sink = sink  # dacă e dat, instrucțiunile sunt trimise aici, nu păstrate
+        self.state_stack = [0]  # stiva de stari cu 0
+        self.token_stack = ['$']  # stiva de tokeni cu simbolul de start
+        # ===== NOUĂ STIVĂ DE ATRIBUTE =====
+        # Păstrează valori semantice (numere) pentru fiecare simbol din token_stack
+        self.attribute_stack = [None]  # corespunde cu '$'
+        # Pentru generarea de cod intermediar
+        self.intermediate_code = []
+        self.temp_counter = 0  # counter pentru variabile temporare
+        # Pentru a simula valori pentru 'id', le înlocuim cu numere
+        # În practică, valorile ar veni dintr-o tabelă de simboluri
+        self.id_counter = 1
+        self.names = {}  # nume variabilă -> valoare simulată (același nume, aceeași valoare)
+
+    def get_id_value(self, token, lexeme=None):
+        """Returnează o valoare pentru un identificator"""
+        if token == 'id':
+            if lexeme is not None and lexeme != 'id':
+                if lexeme[0].isdigit():
+                    return float(lexeme) if '.' in lexeme else int(lexeme)
+                if lexeme in self.names:
+                    return self.names[lexeme]
+            # Simulăm că fiecare 'id' are valoarea 1, 2, 3, etc.
+            val = self.id_counter
+            self.id_counter += 1
+            if lexeme is not None and lexeme != 'id':
+                self.names[lexeme] = val
+            return val
+        return None
+
+    def new_temp(self):
+        """Generează o nouă variabilă temporară"""
+        self.temp_counter += 1
+        return f"t{self.temp_counter}"
+
+    def emit(self, line):
+        """Adaugă o instrucțiune de cod intermediar (sau o trimite la sink)"""
+        if self.sink is not None:
+            self.sink(line)
+        else:
+            self.intermediate_code.append(line)
+        if self.verbose:
+            print(f"  Intermediate code: {line}")